@@ -1,67 +1,42 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import yfinance as yf
 import plotly.graph_objects as go
 import plotly.express as px
-import requests
-from bs4 import BeautifulSoup
+from services.analysis_services import latest_indicators
+from utils.data_fetcher import DataFetcher
+from utils.fundamentals_cache import FundamentalsCache
+from utils import key_statistics
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
 st.set_page_config(layout="wide", page_title="Portofolio Saham Analyzer")
 
 # === Fungsi Backend ===
-def get_stock_data(ticker, period='1y'):
-    try:
-        stock = yf.Ticker(ticker + ".JK")
-        hist = stock.history(period=period)
-        if hist.empty:
-            raise ValueError("Data historis kosong.")
-        return stock, hist
-    except Exception as e:
-        st.error(f"Gagal mengambil data historis untuk {ticker}: {e}")
-        return None, pd.DataFrame()
-
-def calculate_technical_indicators(df):
-    df['MA50'] = df['Close'].rolling(window=50).mean()
-    df['MA200'] = df['Close'].rolling(window=200).mean()
-    delta = df['Close'].diff()
-    gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-    loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
-    rs = gain / loss
-    df['RSI'] = 100 - (100 / (1 + rs))
-    exp12 = df['Close'].ewm(span=12, adjust=False).mean()
-    exp26 = df['Close'].ewm(span=26, adjust=False).mean()
-    df['MACD'] = exp12 - exp26
-    df['Signal'] = df['MACD'].ewm(span=9, adjust=False).mean()
-    return df
-
-def get_fundamental_data(ticker):
-    try:
-        url = f"https://finance.yahoo.com/quote/{ticker}.JK/key-statistics"
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        def extract_value(data_test_id):
-            element = soup.find("td", {"data-test": data_test_id})
-            if element and element.text != 'N/A':
-                return element.text.strip()
-            return None
-
-        pe_text = extract_value("PE_RATIO-value")
-        pb_text = extract_value("PB_RATIO-value")
-        dy_text = extract_value("DIVIDEND_AND_YIELD-value")
-
-        pe = float(pe_text) if pe_text else np.nan
-        pb = float(pb_text) if pb_text else np.nan
-        dy = float(dy_text.split('(')[1].split('%')[0]) / 100 if dy_text and '(' in dy_text else np.nan
-
-        return {'PER': pe, 'PBV': pb, 'Dividend Yield': dy}
-    except Exception as e:
-        st.warning(f"Gagal mengambil data fundamental untuk {ticker}: {e}")
-        return {'PER': np.nan, 'PBV': np.nan, 'Dividend Yield': np.nan}
+def get_portfolio_prices(tickers):
+    """Ambil histori seluruh saham portofolio sekaligus (tanpa akhiran .JK)"""
+    frames, errors = DataFetcher.get_many([f"{t}.JK" for t in tickers])
+    for ticker, error in errors.items():
+        st.error(f"Gagal mengambil data historis untuk {ticker.removesuffix('.JK')}: {error}")
+    return {ticker.removesuffix('.JK'): hist for ticker, hist in frames.items()}
+
+def get_fundamental_data_many(tickers, pending=None):
+    """
+    PER, PBV dan Dividend Yield seluruh saham portofolio (tanpa akhiran .JK)
+
+    pending: Future dari key_statistics.fetch_many yang sudah dijalankan lebih dulu
+    """
+    if pending is not None:
+        results, errors = pending.result()
+    else:
+        results, errors = key_statistics.fetch_many([f"{t}.JK" for t in tickers])
+    for ticker, error in errors.items():
+        st.warning(f"Gagal mengambil data fundamental untuk {ticker.removesuffix('.JK')}: {error}")
+    return {
+        t: results.get(f"{t}.JK", key_statistics.empty_statistics())
+        for t in tickers
+    }
 
 def evaluate_valuation(pe, pb, industry_pe=15, industry_pb=2):
     if pd.isna(pe) or pd.isna(pb):
@@ -78,8 +53,7 @@ def evaluate_valuation(pe, pb, industry_pe=15, industry_pb=2):
 
 def calculate_dividend_projection(ticker, shares, current_price):
     try:
-        stock = yf.Ticker(ticker + ".JK")
-        dividends = stock.dividends
+        dividends = FundamentalsCache.get_dividends(ticker + ".JK")
         if not dividends.empty:
             avg_dividend = dividends[-4:].mean()
             dividend_per_share = avg_dividend / current_price if current_price else 0
@@ -137,23 +111,31 @@ else:
     total_nilai = 0
     ringkasan = []
 
+    portfolio_tickers = st.session_state.portfolio['Ticker'].tolist()
+    # Scraping fundamental berjalan bersamaan dengan pengambilan harga
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(key_statistics.fetch_many, [f"{t}.JK" for t in portfolio_tickers])
+        price_data = get_portfolio_prices(portfolio_tickers)
+        fundamental_data = get_fundamental_data_many(portfolio_tickers, pending)
+    # Indikator seluruh portofolio dihitung dalam satu batch
+    technical_data = latest_indicators(price_data)
+
     for idx, row in st.session_state.portfolio.iterrows():
         ticker = row['Ticker']
         shares = row['Shares']
         buy_price = row['Buy Price']
-        stock, hist = get_stock_data(ticker)
-        if hist.empty:
+        hist = price_data.get(ticker)
+        if hist is None:
             continue
         current_price = hist['Close'].iloc[-1]
         nilai_saham = shares * current_price
         total_nilai += nilai_saham
 
-        fundamental = get_fundamental_data(ticker)
+        fundamental = fundamental_data[ticker]
         valuasi = evaluate_valuation(fundamental['PER'], fundamental['PBV'])
-        hist = calculate_technical_indicators(hist)
-        rsi = hist['RSI'].iloc[-1]
-        ma50 = hist['MA50'].iloc[-1]
-        ma200 = hist['MA200'].iloc[-1]
+        rsi = technical_data.at[ticker, 'RSI']
+        ma50 = technical_data.at[ticker, 'MA50']
+        ma200 = technical_data.at[ticker, 'MA200']
         rekomendasi = get_recommendation(valuasi, ma50, ma200, rsi)
 
         ringkasan.append({
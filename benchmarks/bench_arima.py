@@ -0,0 +1,59 @@
+# benchmarks/bench_arima.py
+"""
+Benchmark ARIMA: backtest (fit ulang per langkah vs parameter tetap) dan pencarian order.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_arima --days 250 --order 2 1 1 --workers 1 4
+"""
+import argparse
+import time
+import warnings
+from benchmarks.bench_cache_backend import make_history
+from models.arima_model import ARIMAModel
+from models.arima_search import search_order
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--days', type=int, default=250)
+    parser.add_argument('--order', type=int, nargs=3, default=[2, 1, 1])
+    parser.add_argument('--refit-every', type=int, nargs='*', default=[0, 10])
+    parser.add_argument('--workers', type=int, nargs='*', default=[1, 4])
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    data = make_history(args.days)[['Close']]
+    split_point = int(len(data) * 0.8)
+    train, test = data.iloc[:split_point], data.iloc[split_point:]
+
+    arima = ARIMAModel()
+    arima.best_order = tuple(args.order)
+    arima.train(train)
+
+    cases = [("fit ulang per langkah", dict(fast=False))]
+    cases += [(f"cepat, refit_every={n}", dict(fast=True, refit_every=n)) for n in args.refit_every]
+    baseline = None
+    for label, kwargs in cases:
+        start = time.perf_counter()
+        metrics = arima.evaluate(test, **kwargs)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or metrics
+        diff = abs(metrics['RMSE'] - baseline['RMSE']) / baseline['RMSE'] * 100
+        print(
+            f"{label:<28} {elapsed:7.3f}s  MAE {metrics['MAE']:.3f}  RMSE {metrics['RMSE']:.3f}  "
+            f"MAPE {metrics['MAPE']:.3f}%  (selisih RMSE {diff:.2f}%)"
+        )
+
+    for method in ('grid', 'stepwise'):
+        for workers in args.workers:
+            report = search_order(train['Close'], method=method, workers=workers)
+            fit_seconds = sum(fit['seconds'] or 0 for fit in report['fits'])
+            print(
+                f"cari order {method:<8} workers={workers}: {report['elapsed']:.2f}s "
+                f"({len(report['fits'])} fit, total fit {fit_seconds:.2f}s) -> {report['best_order']} "
+                f"AIC {report['best_aic']:.2f}, gagal {report['failed']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
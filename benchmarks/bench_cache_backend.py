@@ -0,0 +1,76 @@
+# benchmarks/bench_cache_backend.py
+"""
+Benchmark baca/tulis cache harga: CSV lama vs Parquet vs Arrow IPC.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_cache_backend --tickers 300 --days 250
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from utils.cache_backend import get_cache_backend
+
+
+def make_history(days, seed=0):
+    """Data OHLCV sintetis dengan bentuk yang sama seperti yfinance"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=days, name='Date')
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.005, days)),
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1e5, 1e8, days),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }, index=index)
+
+
+def bench_backend(name, compression, frames, cache_dir):
+    backend = get_cache_backend(name, compression)
+    paths = [backend.path_for(f"T{i:04d}", cache_dir) for i in range(len(frames))]
+
+    start = time.perf_counter()
+    for df, path in zip(frames, paths):
+        backend.write(df, path)
+    write_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for path in paths:
+        backend.read(path)
+    read_time = time.perf_counter() - start
+
+    size = sum(os.path.getsize(p) for p in paths)
+    return write_time, read_time, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickers', type=int, default=300)
+    parser.add_argument('--days', type=int, default=250)
+    args = parser.parse_args()
+
+    frames = [make_history(args.days, seed=i) for i in range(args.tickers)]
+    cases = [
+        ('csv', None),
+        ('parquet', 'snappy'),
+        ('parquet', 'zstd'),
+        ('arrow', None),
+        ('arrow', 'lz4'),
+    ]
+
+    print(f"{args.tickers} ticker x {args.days} hari")
+    print(f"{'backend':<18}{'tulis (s)':>12}{'baca (s)':>12}{'ukuran (KB)':>14}")
+    for name, compression in cases:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            write_time, read_time, size = bench_backend(name, compression, frames, cache_dir)
+        label = f"{name}/{compression or '-'}"
+        print(f"{label:<18}{write_time:>12.3f}{read_time:>12.3f}{size / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
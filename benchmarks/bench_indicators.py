@@ -0,0 +1,68 @@
+# benchmarks/bench_indicators.py
+"""
+Benchmark mesin indikator panel vs pipeline pandas per saham.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_indicators --tickers 900 --days 250
+"""
+import argparse
+import time
+import numpy as np
+from benchmarks.bench_cache_backend import make_history
+from services.analysis_services import PricePanel, compute_indicators
+
+COMPARED = ('SMA_20', 'SMA_50', 'RSI', 'MACD', 'Signal')
+
+
+def pandas_indicators(df):
+    """Pipeline per DataFrame yang dipakai view sebelum ada mesin panel"""
+    data = df.copy()
+    data['SMA_20'] = data['Close'].rolling(window=20).mean()
+    data['SMA_50'] = data['Close'].rolling(window=50).mean()
+    delta = data['Close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
+    rs = gain / loss
+    data['RSI'] = 100 - (100 / (1 + rs))
+    exp12 = data['Close'].ewm(span=12, adjust=False).mean()
+    exp26 = data['Close'].ewm(span=26, adjust=False).mean()
+    data['MACD'] = exp12 - exp26
+    data['Signal'] = data['MACD'].ewm(span=9, adjust=False).mean()
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickers', type=int, default=900)
+    parser.add_argument('--days', type=int, default=250)
+    args = parser.parse_args()
+
+    frames = {f"T{i:04d}.JK": make_history(args.days, seed=i) for i in range(args.tickers)}
+
+    start = time.perf_counter()
+    panel = PricePanel.from_frames(frames)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    results = compute_indicators(panel, COMPARED)
+    compute = time.perf_counter() - start
+    print(f"panel: bangun {build:.3f}s + hitung {compute:.3f}s ({args.tickers} ticker x {args.days} hari)")
+
+    start = time.perf_counter()
+    expected = {ticker: pandas_indicators(df) for ticker, df in frames.items()}
+    print(f"pandas per saham: {time.perf_counter() - start:.3f}s")
+
+    worst = 0.0
+    for ticker, df in expected.items():
+        for name in COMPARED:
+            actual, reference = panel.row(ticker, results[name]), df[name].to_numpy()
+            if not np.array_equal(np.isnan(actual), np.isnan(reference)):
+                raise AssertionError(f"Posisi NaN berbeda: {ticker} {name}")
+            valid = ~np.isnan(reference)
+            if valid.any():
+                diff = np.abs(actual[valid] - reference[valid]) / np.maximum(1, np.abs(reference[valid]))
+                worst = max(worst, float(diff.max()))
+    print(f"selisih relatif maksimum vs pandas: {worst:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# benchmarks/bench_screener.py
+"""
+Benchmark screener: bangun index sinyal, query seluruh universe, sync inkremental.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_screener --tickers 900 --days 250
+"""
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+from benchmarks.bench_cache_backend import make_history
+from services.screener_service import SignalIndex, parse_query
+from utils.universe_store import UniverseStore
+
+QUERIES = [
+    "RSI(14) < 30 and SMA_20 crossed above SMA_50 in the last 3 days",
+    "Close > MA200 and (MACD crossed above Signal within 5 or RSI > 70)",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickers', type=int, default=900)
+    parser.add_argument('--days', type=int, default=250)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UniverseStore(os.path.join(tmp, "universe.sqlite"))
+        frames = {f"T{i:04d}.JK": make_history(args.days, seed=i) for i in range(args.tickers)}
+        for ticker, df in frames.items():
+            store.upsert(ticker, df)
+
+        index = SignalIndex(store, os.path.join(tmp, "screener_index.pkl"))
+        start = time.perf_counter()
+        index.sync(force=True)
+        print(f"bangun index {args.tickers} ticker: {time.perf_counter() - start:.3f}s")
+
+        for text in QUERIES:
+            query = parse_query(text)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                result = index.screen(query, sync=False)
+            elapsed = (time.perf_counter() - start) / args.repeat * 1000
+            print(f"{elapsed:.2f} ms, {len(result)} lolos: {text}")
+
+        # Satu bar baru untuk 5% ticker, seperti setelah prefetch sore
+        updated = list(frames)[:max(1, args.tickers // 20)]
+        for ticker in updated:
+            bar = frames[ticker].iloc[[-1]].copy()
+            bar.index = bar.index + pd.tseries.offsets.BDay(1)
+            store.upsert(ticker, bar)
+        start = time.perf_counter()
+        changed = index.sync(force=True)
+        print(f"sync inkremental {len(changed)} ticker: {time.perf_counter() - start:.3f}s")
+
+        start = time.perf_counter()
+        SignalIndex(store, index.path).sync(force=True)
+        print(f"muat index tersimpan + sync: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
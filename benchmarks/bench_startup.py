@@ -0,0 +1,111 @@
+# benchmarks/bench_startup.py
+"""
+Benchmark cold start: profil waktu impor dan waktu muat tiap view.
+
+Setiap pengukuran dijalankan di proses Python baru agar cache modul kosong.
+Jalankan dari root repo:
+    python -m benchmarks.bench_startup --top 15
+    STOCK_DATA_PROVIDER=replay python -m benchmarks.bench_startup --render
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VIEW_PROBE = """
+import json, time
+start = time.perf_counter()
+import main
+main_ms = (time.perf_counter() - start) * 1000
+from views import get_view
+start = time.perf_counter()
+error = None
+try:
+    get_view({name!r})
+except Exception as e:
+    error = f"{{type(e).__name__}}: {{e}}"
+print(json.dumps({{'main_ms': main_ms, 'view_ms': (time.perf_counter() - start) * 1000, 'error': error}}))
+"""
+
+RENDER_PROBE = """
+import json, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+app = AppTest.from_file("main.py", default_timeout={timeout})
+app.run()
+print(json.dumps({{'render_s': time.perf_counter() - start, 'exceptions': [str(e.value) for e in app.exception]}}))
+"""
+
+
+def _run(code, *flags):
+    result = subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    return result
+
+
+def import_profile(module="main"):
+    """
+    Jalankan `python -X importtime` untuk satu modul
+
+    Returns:
+        List[Tuple]: (modul, kedalaman, self_us, cumulative_us) per modul yang diimpor
+    """
+    result = _run(f"import {module}", "-X", "importtime")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Indentasi nama menunjukkan kedalaman; tanpa indentasi = diimpor langsung
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return rows
+
+
+def report_profile(rows, top):
+    total_ms = sum(row[3] for row in rows if row[1] == 0) / 1000
+    print(f"Total impor `main`: {total_ms:.1f} ms ({len(rows)} modul)")
+    # Paket tingkat atas (mis. 'pandas', bukan 'pandas.core.frame') paling berguna untuk dibandingkan
+    packages = [row for row in rows if '.' not in row[0]]
+    print(f"{'kumulatif (ms)':>15} {'self (ms)':>10}  paket")
+    for name, _, self_us, cumulative_us in sorted(packages, key=lambda r: -r[3])[:top]:
+        print(f"{cumulative_us / 1000:15.1f} {self_us / 1000:10.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--top', type=int, default=15, help="Jumlah paket terberat yang ditampilkan")
+    parser.add_argument('--render', action='store_true', help="Ukur juga render pertama main.py via AppTest")
+    parser.add_argument('--timeout', type=float, default=120)
+    args = parser.parse_args()
+
+    report_profile(import_profile("main"), args.top)
+
+    from views import VIEW_REGISTRY
+    print("\nImpor pertama per view (proses baru):")
+    for name in VIEW_REGISTRY:
+        result = _run(VIEW_PROBE.format(name=name))
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        status = probe['error'] or "ok"
+        print(f"{name:25s} main {probe['main_ms']:8.1f} ms  view {probe['view_ms']:8.1f} ms  {status}")
+
+    if args.render:
+        result = _run(RENDER_PROBE.format(timeout=args.timeout))
+        if result.returncode != 0:
+            print(f"\nRender gagal: {result.stderr.strip().splitlines()[-1]}")
+            return
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"\nRender pertama (Dashboard Utama): {probe['render_s']:.2f}s")
+        for message in probe['exceptions']:
+            print(f"  exception: {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_universe_store.py
+"""
+Benchmark store harga gabungan: tulis seluruh universe lalu query jendela tanggal.
+
+Jalankan dari root repo:
+    python -m benchmarks.bench_universe_store --tickers 900 --days 250 --window 60
+"""
+import argparse
+import os
+import tempfile
+import time
+import pandas as pd
+from benchmarks.bench_cache_backend import make_history
+from utils.universe_store import UniverseStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tickers', type=int, default=900)
+    parser.add_argument('--days', type=int, default=250)
+    parser.add_argument('--window', type=int, default=60)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UniverseStore(os.path.join(tmp, "universe.sqlite"))
+        frames = {f"T{i:04d}.JK": make_history(args.days, seed=i) for i in range(args.tickers)}
+
+        start = time.perf_counter()
+        for ticker, df in frames.items():
+            store.upsert(ticker, df)
+        print(f"upsert {args.tickers} ticker x {args.days} hari: {time.perf_counter() - start:.3f}s")
+
+        last_date = next(iter(frames.values())).index[-1]
+        window_start = last_date - pd.tseries.offsets.BDay(args.window - 1)
+
+        start = time.perf_counter()
+        panel = store.read_window(window_start, last_date)
+        print(f"read_window {panel.shape}: {time.perf_counter() - start:.3f}s")
+
+        start = time.perf_counter()
+        section = store.cross_section(last_date)
+        print(f"cross_section {section.shape}: {time.perf_counter() - start:.3f}s")
+
+        start = time.perf_counter()
+        history = store.read_ticker("T0000.JK", window_start, last_date)
+        print(f"read_ticker {history.shape}: {time.perf_counter() - start:.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,75 @@ import os
 class Config:
     CACHE_DIR = "cache"
     CACHE_TTL_HOURS = 1
+    CACHE_FORMAT = "arrow"  # "csv", "parquet" atau "arrow"
+    CACHE_COMPRESSION = None  # mis. "zstd"; tanpa kompresi Arrow dibaca zero-copy
+    CACHE_LOCK_TIMEOUT_SECONDS = 30  # Tunggu proses lain yang sedang memperbarui cache
+    INCREMENTAL_REFRESH = True  # Ambil hanya bar baru saat cache kedaluwarsa
+    REFRESH_OVERLAP_BARS = 3  # Bar terakhir yang diambil ulang untuk menangkap revisi
+    MEMORY_CACHE_MAX_MB = 256  # Anggaran cache harga di memori per proses
+    MEMORY_CACHE_TTL_SECONDS = 300
+    FUNDAMENTALS_CACHE_MAX_MB = 64
+    INDICATOR_CACHE_MAX_MB = 64  # Memo indikator per fingerprint harga
+    FUNDAMENTALS_TTL_HOURS = {
+        'info': 0.25,  # Harga dan rasio kuotasi berubah intraday
+        'dividends': 24,
+        'financials': 24 * 7,  # Laporan keuangan berubah per kuartal
+        'balance_sheet': 24 * 7,
+        'cashflow': 24 * 7,
+    }
+    UNIVERSE_STORE_ENABLED = True  # Salin setiap histori ke store gabungan seluruh saham
+    UNIVERSE_STORE_FILE = "universe.sqlite"
+    INTRADAY_TTL_SECONDS = 60  # Bar intraday hanya di-cache di memori
+    INTRADAY_SOURCE = os.getenv("STOCK_INTRADAY_SOURCE", "poll")  # "poll" atau "replay"
+    INTRADAY_BUFFER_BARS = 2000  # Kapasitas ring buffer per ticker
+    INTRADAY_POLL_SECONDS = 15
+    FETCH_MAX_WORKERS = 8  # Batas fetch paralel untuk DataFetcher.get_many
+    DATA_PROVIDER = os.getenv("STOCK_DATA_PROVIDER", "yfinance")  # "yfinance", "record" atau "replay"
+    REPLAY_DIR = os.getenv("STOCK_REPLAY_DIR", "replay")
+    REPLAY_LATENCY_MS = int(os.getenv("STOCK_REPLAY_LATENCY_MS", "0"))  # Latensi buatan untuk replay
+    SCRAPE_MAX_WORKERS = 8  # Batas scraping key-statistics paralel
+    SCRAPE_TIMEOUT_SECONDS = 10
+    ADMIN_PAGE_ENABLED = os.getenv("STOCK_ADMIN", "0") == "1"  # Halaman metrik cache/fetch di menu
+    METRICS_PORT = int(os.getenv("STOCK_METRICS_PORT", "0"))  # Endpoint /metrics Prometheus, 0 = nonaktif
+    METRICS_HOST = os.getenv("STOCK_METRICS_HOST", "127.0.0.1")  # "0.0.0.0" hanya bila Prometheus di host lain
     DEFAULT_TICKERS = ["UNVR.JK", "BBCA.JK", "TLKM.JK"]
+    MARKET_UTC_OFFSET_HOURS = 7  # Jam bursa IDX dalam WIB
+    MARKET_OPEN = "09:00"
+    MARKET_CLOSE = "16:15"  # Termasuk pre-closing dan post-trading
+    PREFETCH_ENABLED = os.getenv("STOCK_PREFETCH", "1") == "1"  # Scheduler prewarm cache di proses Streamlit
+    PREFETCH_TIMES = ["16:45", "08:30"]  # Setelah bursa tutup dan sebelum buka (WIB)
+    PREFETCH_SESSION_INTERVAL_MINUTES = 45  # Selama sesi; < CACHE_TTL_HOURS agar cache tetap hangat, 0 = nonaktif
+    PREFETCH_MAX_WORKERS = 4
+    PREFETCH_PERIOD = "1y"
+    WATCHLISTS = {}  # Nama -> daftar ticker, ikut di-prefetch bersama DEFAULT_TICKERS
+    WATCHLIST_FILE = os.getenv("STOCK_WATCHLIST_FILE", "watchlists.json")  # JSON {nama: [ticker, ...]}, opsional
+    CHART_MAX_POINTS = 2000  # Anggaran titik per garis chart (LTTB), 0 = kirim semua titik
+    CHART_MAX_CANDLES = 500  # Anggaran candlestick; bar berurutan digabung bila lebih
+    CHART_WEBGL_THRESHOLD = 1000  # Garis dengan titik lebih banyak dari ini memakai Scattergl
+    FIGURE_CACHE_MAX_MB = 64  # Figure Plotly siap kirim per (view, ticker, fingerprint data, parameter)
+    MODEL_CACHE_DIR = os.path.join(CACHE_DIR, "models")  # Artefak ARIMA/Prophet terlatih
+    MODEL_CACHE_MAX_MB = 256  # Batas total di disk; artefak yang paling lama tidak dipakai dihapus
+    MODEL_MEMORY_CACHE_MB = 128
+    PROPHET_FAST_MODE = True  # Musiman otomatis, sampel ketidakpastian lebih sedikit, prediksi dibatasi waktu
+    PROPHET_UNCERTAINTY_SAMPLES = 200  # Sampel interval prediksi pada mode cepat (default Prophet 1000)
+    PROPHET_MIN_UNCERTAINTY_SAMPLES = 50  # Di bawah ini interval dilewati saat batas waktu tidak cukup
+    PROPHET_BUDGET_SECONDS = 10  # Batas waktu training + prediksi per forecast pada mode cepat
+    PREDICTION_PRECOMPUTE_ENABLED = True  # Hitung forecast DEFAULT_TICKERS + watchlist setelah setiap refresh data
+    PREDICTION_MODELS = ["arima", "prophet"]
+    PREDICTION_WORKERS = 4  # Proses fit paralel (dibatasi jumlah core)
+    PREDICTION_HORIZON_DAYS = 90  # Horizon yang dihitung; view memotong sesuai slider
+    PREDICTION_STORE_FILE = "predictions.sqlite"
+    ARIMA_FAST_BACKTEST = True  # Walk-forward dengan parameter tetap (filter update) alih-alih fit ulang per langkah
+    ARIMA_REFIT_EVERY = 0  # Fit ulang setiap N observasi test pada mode cepat, 0 = fit sekali
+    ARIMA_SEARCH_METHOD = "stepwise"  # "grid" (semua kombinasi, paralel) atau "stepwise" (KPSS + pencarian lokal)
+    ARIMA_MAX_P = 2
+    ARIMA_MAX_D = 1
+    ARIMA_MAX_Q = 2
+    ARIMA_SEARCH_WORKERS = 4  # Proses fit paralel; 1 = serial di proses Streamlit
+    ARIMA_SEARCH_BUDGET_SECONDS = 30  # Batas waktu pencarian order; order terbaik sejauh ini yang dipakai
+    SCREENER_LOOKBACK_BARS = 20  # Bar terakhir per ticker di index screener (batas jendela "crossed ... in last N days")
+    SCREENER_SYNC_SECONDS = 60  # Jeda minimum pengecekan perubahan universe store saat query
+    SCREENER_INDEX_FILE = "screener_index.pkl"
     
     @staticmethod
     def setup():
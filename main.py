@@ -1,32 +1,39 @@
 # main.py
 import streamlit as st
 from config import Config
-from views import (
-    show_dashboard,
-    show_fundamental_analysis,
-    show_technical_analysis,
-    show_price_prediction,
-    portfolio_simulation,
-    compare_stocks
-)
+from views import TICKERLESS_VIEWS, VIEW_REGISTRY, get_view
+
+@st.cache_resource
+def start_prefetch_scheduler():
+    """Satu scheduler prefetch per proses Streamlit, bukan per sesi"""
+    from services.prefetch_service import PrefetchScheduler
+    return PrefetchScheduler().start(run_now=True)
+
+@st.cache_resource
+def start_metrics_exporter(port):
+    """Endpoint /metrics untuk Prometheus, satu per proses"""
+    from utils.metrics import start_http_server
+    try:
+        return start_http_server(port, Config.METRICS_HOST)
+    except OSError as e:
+        # Mis. port sudah dipakai proses Streamlit lain di host yang sama
+        print(f"Peringatan: exporter metrics tidak aktif di {Config.METRICS_HOST}:{port}: {e}")
+        return None
 
 def main():
     Config.setup()
     
+    scheduler = start_prefetch_scheduler() if Config.PREFETCH_ENABLED else None
+    if Config.METRICS_PORT:
+        start_metrics_exporter(Config.METRICS_PORT)
+    
     st.title("📊 Analisis Saham Lengkap + AI Prediksi")
     
     # Sidebar navigation
     st.sidebar.title("Menu")
     app_mode = st.sidebar.radio(
         "Pilih Analisis", 
-        [
-            "Dashboard Utama", 
-            "Analisis Fundamental", 
-            "Analisis Teknikal", 
-            "Prediksi Harga", 
-            "Simulasi Portofolio", 
-            "Perbandingan Saham"
-        ]
+        list(VIEW_REGISTRY)
     )
     
     # Input ticker
@@ -36,29 +43,30 @@ def main():
     )
     tickers = [t.strip().upper() for t in tickers_input.split(",") if t.strip()]
     
+    if scheduler is not None:
+        status = scheduler.status
+        if status['running']:
+            st.sidebar.caption(f"Prefetch cache: {status['done']}/{status['total']} saham")
+        elif status['next_run'] is not None:
+            st.sidebar.caption(f"Prefetch berikutnya: {status['next_run']:%a %H:%M} WIB")
+    
+    # Routing berdasarkan mode; modul view (dan dependensinya) baru diimpor di sini
+    if app_mode in TICKERLESS_VIEWS:
+        get_view(app_mode)()
+        return
+    
     if not tickers:
         st.warning("Silakan masukkan minimal satu kode saham")
         return
     
-    # Routing berdasarkan mode
     if app_mode == "Perbandingan Saham":
-        compare_stocks(tickers)
+        get_view(app_mode)(tickers)
     elif len(tickers) > 1:
         st.warning(f"Mode '{app_mode}' hanya tersedia untuk analisis satu saham")
         st.info("Sedang menampilkan mode Perbandingan Saham sebagai gantinya")
-        compare_stocks(tickers)
+        get_view("Perbandingan Saham")(tickers)
     else:
-        ticker = tickers[0]
-        if app_mode == "Dashboard Utama":
-            show_dashboard(ticker)  # Panggil dengan parameter ticker
-        elif app_mode == "Analisis Fundamental":
-            show_fundamental_analysis(ticker)
-        elif app_mode == "Analisis Teknikal":
-            show_technical_analysis(ticker)
-        elif app_mode == "Prediksi Harga":
-            show_price_prediction(ticker)
-        elif app_mode == "Simulasi Portofolio":
-            portfolio_simulation(ticker)
+        get_view(app_mode)(tickers[0])
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,20 @@
 # models/__init__.py
-from .prophet_model import ProphetModel
-from .arima_model import ARIMAModel
+# Model diimpor saat pertama kali diakses agar Prophet/statsmodels tidak dimuat saat startup
+from importlib import import_module
+
+_EXPORTS = {
+    'ProphetModel': 'prophet_model',
+    'ARIMAModel': 'arima_model',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        model = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = model
+        return model
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'ProphetModel',
@@ -1,50 +1,74 @@
+import hashlib
 import numpy as np
 import pandas as pd
 from statsmodels.tsa.arima.model import ARIMA
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Optional
+from config import Config
+from models.arima_search import search_order
+from utils.memory_cache import LRUCache
 from utils.validator import StockValidator
 
+# Hasil pencarian order per isi data, dibagi semua sesi dalam satu proses
+_order_cache = LRUCache(max_bytes=4 * 1024 * 1024, max_entries=256, name="arima_order")
+
 class ARIMAModel:
     def __init__(self):
         self.best_order = None
         self.model = None
         self.last_training_date = None
+        self.search_report = None
 
-    def find_best_arima(self, data: pd.DataFrame) -> Tuple[tuple, float]:
+    def find_best_arima(self, data: pd.DataFrame, method: Optional[str] = None) -> Tuple[tuple, float]:
         """
         Mencari parameter ARIMA terbaik menggunakan AIC
         
+        Hasil pencarian di-cache per isi data dan pengaturan pencarian, sehingga
+        ARIMAModel baru untuk data yang sama tidak mengulang pencarian.
+        Laporan lengkap (durasi tiap fit, order yang gagal) ada di search_report.
+        
         Args:
             data: DataFrame dengan kolom 'Close'
+            method: 'grid' atau 'stepwise' (default Config.ARIMA_SEARCH_METHOD)
             
         Returns:
             Tuple: (best_order, best_aic)
         """
-        best_aic = float("inf")
-        best_order = None
-        
-        # Grid search sederhana
-        for p in range(0, 3):  # AR order
-            for d in range(0, 2):  # Differencing
-                for q in range(0, 3):  # MA order
-                    try:
-                        model = ARIMA(data, order=(p,d,q))
-                        results = model.fit()
-                        if results.aic < best_aic:
-                            best_aic = results.aic
-                            best_order = (p,d,q)
-                    except:
-                        continue
+        values = np.asarray(data, dtype=float).ravel()
+        method = method or Config.ARIMA_SEARCH_METHOD
+        key = (
+            hashlib.blake2b(values.tobytes(), digest_size=16).hexdigest(),
+            method,
+            (Config.ARIMA_MAX_P, Config.ARIMA_MAX_D, Config.ARIMA_MAX_Q),
+        )
+        report = _order_cache.get(key)
+        if report is None:
+            report = search_order(values, method=method)
+            # Pencarian yang terpotong batas waktu tidak di-cache agar bisa dilengkapi nanti
+            if not report['timed_out']:
+                _order_cache.put(key, report)
+        if report['failed']:
+            print(f"ARIMA: {len(report['failed'])} order gagal di-fit: {report['failed']}")
         
-        self.best_order = best_order
-        return best_order, best_aic
+        self.search_report = report
+        self.best_order = report['best_order']
+        return report['best_order'], report['best_aic']
 
-    def train(self, data: pd.DataFrame) -> None:
+    def hyperparameters(self) -> Dict:
+        """Pengaturan yang memengaruhi hasil training (bagian dari key cache model)"""
+        return {
+            'order': self.best_order,
+            'search': Config.ARIMA_SEARCH_METHOD,
+            'max_order': (Config.ARIMA_MAX_P, Config.ARIMA_MAX_D, Config.ARIMA_MAX_Q),
+        }
+
+    def train(self, data: pd.DataFrame, warm_start: Optional['ARIMAModel'] = None) -> None:
         """
         Melatih model ARIMA dengan parameter terbaik
         
         Args:
             data: DataFrame dengan kolom 'Close'
+            warm_start: Model terlatih sebelumnya (mis. dari models.model_cache);
+                bila order-nya sama, parameternya menjadi titik awal optimasi
         """
         # Validasi data
         is_valid, msg = StockValidator.validate_dataframe_for_analysis(data)
@@ -54,38 +78,44 @@ class ARIMAModel:
         # Cari parameter terbaik jika belum ada
         if self.best_order is None:
             self.find_best_arima(data)
+            if self.best_order is None:
+                raise ValueError("Tidak ada order ARIMA yang berhasil di-fit")
             
         # Latih model
-        self.model = ARIMA(data, order=self.best_order).fit()
+        start_params = None
+        if warm_start is not None and warm_start.model is not None and warm_start.best_order == self.best_order:
+            start_params = warm_start.model.params
+        self.model = ARIMA(data, order=self.best_order).fit(start_params=start_params)
         self.last_training_date = data.index[-1]
 
-    def evaluate(self, test_data: pd.DataFrame) -> Dict[str, float]:
+    def evaluate(self, test_data: pd.DataFrame, fast: Optional[bool] = None,
+                 refit_every: Optional[int] = None) -> Dict[str, float]:
         """
-        Evaluasi model pada data testing
+        Evaluasi model pada data testing (walk-forward satu langkah ke depan)
         
         Args:
             test_data: DataFrame dengan kolom 'Close' untuk testing
+            fast: Parameter hasil training dipakai tetap dan state model hanya
+                di-update dengan observasi baru (default Config.ARIMA_FAST_BACKTEST).
+                False = fit ulang penuh di setiap langkah (perilaku lama, lambat)
+            refit_every: Mode cepat saja; fit ulang setiap N observasi
+                (default Config.ARIMA_REFIT_EVERY, 0 = tidak pernah)
             
         Returns:
             Dict: Dictionary berisi metrik evaluasi
         """
         if self.model is None:
             raise ValueError("Model belum dilatih")
-            
-        history = list(self.model.data.endog)  # Data training
-        predictions = []
         
-        for t in range(len(test_data)):
-            model = ARIMA(history, order=self.best_order)
-            model_fit = model.fit()
-            output = model_fit.forecast()
-            yhat = output[0]
-            predictions.append(yhat)
-            obs = test_data['Close'].iloc[t]
-            history.append(obs)
+        fast = Config.ARIMA_FAST_BACKTEST if fast is None else fast
+        refit_every = Config.ARIMA_REFIT_EVERY if refit_every is None else refit_every
+        actual = test_data['Close'].to_numpy(dtype=float)
+        if fast:
+            predictions = self._walk_forward_fast(actual, refit_every)
+        else:
+            predictions = self._walk_forward_refit(actual)
         
         # Hitung metrik evaluasi
-        actual = test_data['Close'].values
         metrics = {
             'MAE': np.mean(np.abs(predictions - actual)),
             'MSE': np.mean((predictions - actual)**2),
@@ -94,6 +124,45 @@ class ARIMAModel:
         }
         return metrics
 
+    def _walk_forward_refit(self, actual: np.ndarray) -> np.ndarray:
+        """Fit ARIMA baru untuk setiap titik test (satu MLE per langkah)"""
+        history = list(self.model.data.endog)  # Data training
+        predictions = []
+        
+        for obs in actual:
+            model = ARIMA(history, order=self.best_order)
+            model_fit = model.fit()
+            output = model_fit.forecast()
+            yhat = output[0]
+            predictions.append(yhat)
+            history.append(obs)
+        return np.array(predictions)
+
+    def _walk_forward_fast(self, actual: np.ndarray, refit_every: int = 0) -> np.ndarray:
+        """
+        Prediksi satu langkah dengan parameter tetap
+
+        Model state-space yang sudah di-fit diterapkan ke histori + blok test
+        (apply tanpa refit = satu kali Kalman filter); prediksi in-sample
+        one-step-ahead pada blok itu sama dengan forecast() setelah setiap
+        observasi. Bila refit_every > 0, parameter di-fit ulang setiap blok
+        dengan parameter sebelumnya sebagai titik awal optimasi.
+        """
+        history = np.asarray(self.model.data.endog, dtype=float).ravel()
+        results = self.model
+        block = refit_every if refit_every and refit_every > 0 else len(actual)
+        predictions = np.empty(len(actual))
+        
+        for start in range(0, len(actual), block):
+            if start:
+                results = ARIMA(history, order=self.best_order).fit(start_params=results.params)
+            chunk = actual[start:start + block]
+            combined = np.concatenate([history, chunk])
+            filtered = results.apply(combined)
+            predictions[start:start + len(chunk)] = filtered.predict(start=len(history), end=len(combined) - 1)
+            history = combined
+        return predictions
+
     def predict(self, steps: int = 30, return_ci: bool = True) -> pd.DataFrame:
         """
         Membuat prediksi ke depan
@@ -0,0 +1,235 @@
+# models/arima_search.py
+"""
+Pencarian order ARIMA (p, d, q) berdasarkan AIC
+
+Dua mode:
+- grid: semua kombinasi dalam batas di-fit paralel di process pool
+- stepwise: d ditentukan uji KPSS, lalu pencarian lokal ala Hyndman-Khandakar
+  dari beberapa model awal ke tetangga (p±1, q±1) selama AIC membaik
+
+Keduanya dibatasi waktu (wall clock); fit yang gagal atau tidak sempat
+dijalankan dicatat di laporan beserta durasi setiap fit. Fit paralel memakai
+satu process pool (spawn) yang dipakai ulang oleh semua pencarian di proses ini.
+"""
+import multiprocessing
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, TimeoutError, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+from config import Config
+
+SEARCH_METHODS = ('grid', 'stepwise')
+
+
+def _fit_order(values, order):
+    """Fit satu order; dijalankan di worker sehingga harus bisa di-pickle"""
+    from statsmodels.tsa.arima.model import ARIMA
+
+    start = time.perf_counter()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            aic = float(ARIMA(values, order=order).fit().aic)
+        error = None if np.isfinite(aic) else "AIC tidak terhingga"
+    except Exception as e:
+        aic, error = None, f"{type(e).__name__}: {e}"
+    return {'order': order, 'aic': aic, 'seconds': time.perf_counter() - start, 'error': error}
+
+
+def _timed_out(order):
+    return {'order': order, 'aic': None, 'seconds': None, 'error': "Melewati batas waktu pencarian"}
+
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _shared_pool(workers):
+    """
+    Process pool bersama; dibuat ulang hanya bila jumlah worker berubah atau rusak
+
+    Memakai spawn agar worker tidak mewarisi thread, koneksi dan lock proses
+    Streamlit (fork dari proses multi-thread bisa deadlock).
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _discard_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _Fitter:
+    """
+    Menjalankan sekumpulan fit secara paralel (atau serial bila workers <= 1) dengan tenggat
+
+    Saat tenggat lewat, fit yang belum mulai dibatalkan; fit yang sedang berjalan
+    di worker tidak diinterupsi dan tetap memakai CPU sampai selesai (hasilnya
+    diabaikan), sehingga satu fit bisa melewati batas waktu sebanyak durasinya.
+    """
+
+    def __init__(self, values, workers, deadline):
+        self.values = values
+        self.deadline = deadline
+        self.pool = None
+        self.futures = []
+        if workers > 1:
+            try:
+                self.pool = _shared_pool(workers)
+            except (OSError, NotImplementedError) as e:
+                print(f"Process pool tidak tersedia, fit ARIMA dijalankan serial: {e}")
+
+    def remaining(self):
+        return self.deadline - time.perf_counter()
+
+    def fit(self, orders):
+        if not orders:
+            return []
+        if self.pool is None:
+            results = []
+            for order in orders:
+                results.append(_fit_order(self.values, order) if self.remaining() > 0 else _timed_out(order))
+            return results
+
+        results = {}
+        try:
+            futures = {self.pool.submit(_fit_order, self.values, order): order for order in orders}
+            self.futures.extend(futures)
+            for future in as_completed(futures, timeout=max(self.remaining(), 0)):
+                results[futures[future]] = future.result()
+        except TimeoutError:
+            for future in futures:
+                future.cancel()
+        except BrokenProcessPool as e:
+            # Worker mati (mis. kehabisan memori); sisa pencarian dijalankan serial
+            print(f"Process pool ARIMA rusak, dilanjutkan serial: {e}")
+            _discard_pool(self.pool)
+            self.pool = None
+            for fit in self.fit([order for order in orders if order not in results]):
+                results[fit['order']] = fit
+        return [results.get(order) or _timed_out(order) for order in orders]
+
+    def close(self):
+        # Pool dipakai ulang; cukup batalkan fit milik pencarian ini yang belum mulai
+        for future in self.futures:
+            future.cancel()
+
+
+def kpss_differencing(values, max_d, alpha=0.05):
+    """Jumlah differencing minimum hingga uji KPSS tidak menolak stasioneritas"""
+    from statsmodels.tsa.stattools import kpss
+
+    series = np.asarray(values, dtype=float)
+    for d in range(max_d + 1):
+        if d == max_d or len(series) < 10:
+            return d
+        with warnings.catch_warnings():
+            # p-value KPSS dibatasi tabel (0.01-0.1) dan memicu InterpolationWarning
+            warnings.simplefilter("ignore")
+            p_value = kpss(series, regression='c', nlags='auto')[1]
+        if p_value >= alpha:
+            return d
+        series = np.diff(series)
+    return max_d
+
+
+def search_order(values, method=None, max_p=None, max_d=None, max_q=None,
+                 workers=None, budget_seconds=None):
+    """
+    Cari order ARIMA dengan AIC terkecil
+
+    Args:
+        values: Deret harga (array-like)
+        method: 'grid' atau 'stepwise' (default Config.ARIMA_SEARCH_METHOD)
+        max_p, max_d, max_q: Batas atas order (default Config.ARIMA_MAX_P/D/Q)
+        workers: Jumlah proses fit paralel (default Config.ARIMA_SEARCH_WORKERS)
+        budget_seconds: Batas waktu total (default Config.ARIMA_SEARCH_BUDGET_SECONDS)
+
+    Returns:
+        Dict laporan: method, best_order, best_aic, fits (order, aic, seconds,
+        error untuk setiap kandidat yang dicoba), failed, timed_out, elapsed
+    """
+    method = method or Config.ARIMA_SEARCH_METHOD
+    if method not in SEARCH_METHODS:
+        raise ValueError(f"Metode pencarian ARIMA tidak dikenal: {method}")
+    max_p = Config.ARIMA_MAX_P if max_p is None else max_p
+    max_d = Config.ARIMA_MAX_D if max_d is None else max_d
+    max_q = Config.ARIMA_MAX_Q if max_q is None else max_q
+    workers = Config.ARIMA_SEARCH_WORKERS if workers is None else workers
+    # Proses lebih banyak dari core hanya menambah overhead
+    workers = min(workers, os.cpu_count() or 1)
+    budget = Config.ARIMA_SEARCH_BUDGET_SECONDS if budget_seconds is None else budget_seconds
+
+    values = np.asarray(values, dtype=float).ravel()
+    started = time.perf_counter()
+    fitter = _Fitter(values, workers, started + budget)
+    try:
+        if method == 'grid':
+            orders = [(p, d, q) for p in range(max_p + 1) for d in range(max_d + 1) for q in range(max_q + 1)]
+            fits = fitter.fit(orders)
+        else:
+            fits = _stepwise(fitter, values, max_p, max_d, max_q)
+    finally:
+        fitter.close()
+
+    valid = [fit for fit in fits if fit['error'] is None]
+    best = min(valid, key=lambda fit: fit['aic']) if valid else None
+    return {
+        'method': method,
+        'best_order': best['order'] if best else None,
+        'best_aic': best['aic'] if best else float("inf"),
+        'fits': fits,
+        # Order yang tidak sempat di-fit karena batas waktu tidak dihitung gagal
+        'failed': [fit['order'] for fit in fits if fit['error'] is not None and fit['seconds'] is not None],
+        'timed_out': any(fit['seconds'] is None for fit in fits),
+        'elapsed': time.perf_counter() - started,
+    }
+
+
+def _stepwise(fitter, values, max_p, max_d, max_q):
+    d = kpss_differencing(values, max_d)
+
+    def clip(p, q):
+        return (min(max(p, 0), max_p), d, min(max(q, 0), max_q))
+
+    fits = {}
+
+    def visit(orders):
+        new = [order for order in dict.fromkeys(orders) if order not in fits]
+        for fit in fitter.fit(new):
+            fits[fit['order']] = fit
+
+    def best():
+        valid = [fit for fit in fits.values() if fit['error'] is None]
+        return min(valid, key=lambda fit: fit['aic']) if valid else None
+
+    # Model awal Hyndman-Khandakar
+    visit([clip(2, 2), clip(0, 0), clip(1, 0), clip(0, 1)])
+    current = best()
+    while current is not None and fitter.remaining() > 0:
+        p, _, q = current['order']
+        neighbours = [
+            (p + dp, d, q + dq)
+            for dp in (-1, 0, 1) for dq in (-1, 0, 1)
+            if (dp or dq) and 0 <= p + dp <= max_p and 0 <= q + dq <= max_q
+        ]
+        visit(neighbours)
+        candidate = best()
+        if candidate is current or candidate['aic'] >= current['aic']:
+            break
+        current = candidate
+    return list(fits.values())
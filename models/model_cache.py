@@ -0,0 +1,157 @@
+# models/model_cache.py
+"""
+Cache model terlatih (ARIMAModel, ProphetModel) di memori dan disk
+
+Key artefak: jenis model, ticker, tanggal training terakhir, fingerprint data
+training dan hyperparameter model. Artefak disimpan sebagai pickle di
+Config.MODEL_CACHE_DIR dengan total ukuran dibatasi Config.MODEL_CACHE_MAX_MB
+(file yang paling lama tidak dipakai dihapus lebih dulu), ditambah lapisan
+LRU di memori agar klik berulang tidak membaca disk.
+
+Saat ada bar baru (tanggal training berubah), artefak terbaru dengan
+hyperparameter yang sama diberikan ke train(warm_start=...) sehingga model
+bisa mulai dari parameter fit sebelumnya.
+"""
+import glob
+import hashlib
+import os
+import pickle
+import threading
+import pandas as pd
+from config import Config
+from utils.file_lock import atomic_path
+from utils.memory_cache import LRUCache
+
+_memory = LRUCache(
+    max_bytes=Config.MODEL_MEMORY_CACHE_MB * 1024 * 1024,
+    sizeof=lambda entry: entry[1],
+    name="model_memory"
+)
+
+
+def data_fingerprint(data):
+    """Hash indeks dan nilai data training"""
+    digest = hashlib.blake2b(digest_size=12)
+    index = pd.DatetimeIndex(data.index)
+    digest.update(index.asi8.tobytes())
+    digest.update(data.to_numpy(dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def _digest(value):
+    return hashlib.blake2b(repr(value).encode(), digest_size=8).hexdigest()
+
+
+class ModelCache:
+    """Penyimpanan artefak model per ticker di satu direktori"""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or Config.MODEL_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else Config.MODEL_CACHE_MAX_MB * 1024 * 1024
+
+    @classmethod
+    def shared(cls):
+        """Instance bersama untuk seluruh proses"""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def path(self, kind, ticker, params, last_date, fingerprint):
+        """
+        {ticker}_{kind}_{hash hyperparameter}_{tanggal}_{fingerprint}.pkl
+
+        Bagian prefiks (ticker, jenis, hyperparameter) dipakai untuk mencari
+        artefak sebelumnya sebagai warm start.
+        """
+        name = f"{ticker}_{kind}_{_digest(params)}_{pd.Timestamp(last_date):%Y%m%d}_{fingerprint}.pkl"
+        return os.path.join(self.directory, name)
+
+    def load(self, path):
+        try:
+            with open(path, 'rb') as f:
+                payload = f.read()
+            model = pickle.loads(payload)
+        except FileNotFoundError:
+            return None, 0
+        except Exception as e:
+            print(f"Gagal membaca model {os.path.basename(path)}: {e}")
+            return None, 0
+        # Waktu akses untuk eviksi LRU
+        os.utime(path)
+        return model, len(payload)
+
+    def save(self, path, model):
+        try:
+            payload = pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+            os.makedirs(self.directory, exist_ok=True)
+            with atomic_path(path) as tmp_path:
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+        except Exception as e:
+            print(f"Gagal menyimpan model {os.path.basename(path)}: {e}")
+            return 0
+        self._evict()
+        return len(payload)
+
+    def previous(self, path):
+        """Artefak terbaru lain dengan ticker, jenis dan hyperparameter yang sama"""
+        prefix = os.path.basename(path).rsplit('_', 2)[0]
+        candidates = [
+            p for p in glob.glob(os.path.join(self.directory, glob.escape(prefix) + "_*.pkl"))
+            if p != path
+        ]
+        # Nama memuat tanggal training, jadi urutan nama = urutan tanggal
+        for candidate in sorted(candidates, reverse=True):
+            model, _ = self.load(candidate)
+            if model is not None:
+                return model
+        return None
+
+    def _evict(self):
+        files = []
+        for p in glob.glob(os.path.join(self.directory, "*.pkl")):
+            try:
+                stat = os.stat(p)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, p))
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(p)
+                total -= size
+            except OSError:
+                pass
+
+
+def train_cached(model, ticker, data):
+    """
+    Model terlatih dari cache atau hasil model.train(data) yang lalu disimpan
+
+    Args:
+        model: Instance ARIMAModel/ProphetModel baru (membawa hyperparameter)
+        ticker: Kode saham
+        data: DataFrame training (kolom Close, DatetimeIndex)
+
+    Returns:
+        Instance model terlatih; instance dari cache dibagi antar sesi,
+        jadi hanya dipakai untuk evaluate/predict dan tidak dilatih ulang
+    """
+    cache = ModelCache.shared()
+    path = cache.path(type(model).__name__, ticker, model.hyperparameters(), data.index[-1], data_fingerprint(data))
+
+    def load_or_train():
+        cached, size = cache.load(path)
+        if cached is not None:
+            return cached, size
+        model.train(data, warm_start=cache.previous(path))
+        return model, cache.save(path, model)
+
+    return _memory.get_or_load(path, load_or_train)[0]
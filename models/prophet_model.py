@@ -1,21 +1,169 @@
+import threading
+import time
 import pandas as pd
 import numpy as np
 from prophet import Prophet
+from prophet.serialize import model_from_json, model_to_json
+from config import Config
+
+# Default Prophet; dipakai di luar mode cepat
+FULL_UNCERTAINTY_SAMPLES = 1000
+
+def stan_init(model):
+    """Parameter fit sebelumnya sebagai inisialisasi Stan (warm start)"""
+    res = {}
+    for pname in ['k', 'm', 'sigma_obs']:
+        res[pname] = model.params[pname][0][0]
+    for pname in ['delta', 'beta']:
+        res[pname] = model.params[pname][0]
+    return res
+
+def _naive_dates(dates):
+    dates = pd.DatetimeIndex(dates)
+    return dates.tz_localize(None) if dates.tz is not None else dates
 
 class ProphetModel:
-    def __init__(self):
+    # Perkiraan detik per (sampel ketidakpastian x baris), diperbarui setiap prediksi
+    _sample_cost = None
+    _sample_cost_lock = threading.Lock()
+
+    def __init__(self, fast=None, uncertainty_samples=None):
+        """
+        Args:
+            fast: Mode cepat (default Config.PROPHET_FAST_MODE): musiman dipilih
+                otomatis dari frekuensi data, sampel ketidakpastian lebih sedikit
+                dan forecast() dibatasi Config.PROPHET_BUDGET_SECONDS
+            uncertainty_samples: Jumlah sampel untuk interval prediksi
+                (default Config.PROPHET_UNCERTAINTY_SAMPLES pada mode cepat)
+        """
         self.model = None
+        self.fast = Config.PROPHET_FAST_MODE if fast is None else fast
+        if uncertainty_samples is None:
+            uncertainty_samples = Config.PROPHET_UNCERTAINTY_SAMPLES if self.fast else FULL_UNCERTAINTY_SAMPLES
+        self.uncertainty_samples = uncertainty_samples
+        self._lock = threading.Lock()
+
+    def hyperparameters(self):
+        """Pengaturan yang memengaruhi hasil training (bagian dari key cache model)"""
+        if self.fast:
+            # 'auto': tahunan bila data >= 2 tahun, mingguan bila jarak bar < 1 minggu,
+            # harian hanya untuk data intraday (bar harian tidak butuh suku Fourier harian)
+            return {'yearly_seasonality': 'auto', 'weekly_seasonality': 'auto', 'daily_seasonality': 'auto'}
+        return {'daily_seasonality': True}
 
-    def train(self, data):
-        """Melatih model Prophet"""
+    def seasonalities(self):
+        """Komponen musiman yang aktif pada model terlatih"""
+        return list(self.model.seasonalities) if self.model is not None else []
+
+    def train(self, data, warm_start=None):
+        """
+        Melatih model Prophet
+        
+        Args:
+            data: DataFrame dengan kolom 'Close'
+            warm_start: ProphetModel terlatih sebelumnya dengan hyperparameter
+                yang sama; optimasi dimulai dari parameternya
+        """
         df = data[['Close']].reset_index()
         df.columns = ['ds', 'y']
         df['ds'] = pd.to_datetime(df['ds']).dt.tz_localize(None)
         
-        self.model = Prophet(daily_seasonality=True)
-        self.model.fit(df)
+        init = None
+        if warm_start is not None and warm_start.model is not None:
+            init = stan_init(warm_start.model)
+        
+        self.model = Prophet(**self.hyperparameters())
+        try:
+            self.model.fit(df, init=init)
+        except Exception as e:
+            if init is None:
+                raise
+            # Dimensi parameter bisa berbeda (mis. jumlah changepoint); fit dari awal
+            print(f"Warm start Prophet gagal, fit ulang dari awal: {e}")
+            self.model = Prophet(**self.hyperparameters())
+            self.model.fit(df)
         return self.model
 
+    def __getstate__(self):
+        # Prophet sebaiknya diserialisasi lewat JSON, bukan pickle objek langsung
+        state = self.__dict__.copy()
+        state['model'] = model_to_json(self.model) if self.model is not None else None
+        state.pop('_lock', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        # Artefak dari versi sebelum mode cepat
+        self.__dict__.setdefault('fast', False)
+        self.__dict__.setdefault('uncertainty_samples', FULL_UNCERTAINTY_SAMPLES)
+        if self.model is not None:
+            self.model = model_from_json(self.model)
+
+    def forecast(self, dates, budget_seconds=None, elapsed=0.0):
+        """
+        Prediksi hanya untuk tanggal yang diminta dalam satu panggilan predict
+        
+        Args:
+            dates: Tanggal yang diprediksi (mis. tanggal test + horizon ke depan)
+            budget_seconds: Batas waktu (default Config.PROPHET_BUDGET_SECONDS
+                pada mode cepat, None = tanpa batas di luar mode cepat)
+            elapsed: Waktu yang sudah terpakai untuk forecast ini (mis. training)
+            
+        Returns:
+            Tuple: (DataFrame berindeks tanggal dengan kolom yhat, yhat_lower,
+            yhat_upper; dict latensi). Bila sisa waktu tidak cukup untuk
+            sampling, jumlah sampel dikurangi (atau interval dilewati dan
+            batasnya sama dengan yhat); rinciannya ada di dict latensi.
+            Latensi dikembalikan, bukan disimpan, karena instance dari cache
+            model dibagi antar sesi
+        """
+        if not self.model:
+            raise ValueError("Model belum dilatih")
+        if budget_seconds is None and self.fast:
+            budget_seconds = Config.PROPHET_BUDGET_SECONDS
+        
+        future = pd.DataFrame({'ds': _naive_dates(dates)})
+        samples = self._affordable_samples(len(future), budget_seconds, elapsed)
+        
+        start = time.perf_counter()
+        # Model dari cache dibagi antar sesi; jumlah sampel diatur per panggilan
+        with self._lock:
+            self.model.uncertainty_samples = samples
+            forecast = self.model.predict(future)
+        seconds = time.perf_counter() - start
+        if samples:
+            cost = seconds / (samples * len(future))
+            with ProphetModel._sample_cost_lock:
+                previous = ProphetModel._sample_cost
+                ProphetModel._sample_cost = cost if previous is None else 0.5 * previous + 0.5 * cost
+        else:
+            forecast['yhat_lower'] = forecast['yhat']
+            forecast['yhat_upper'] = forecast['yhat']
+        
+        latency = {
+            'fit': elapsed,
+            'predict': seconds,
+            'total': elapsed + seconds,
+            'rows': len(future),
+            'uncertainty_samples': samples,
+            'budget': budget_seconds,
+            'within_budget': budget_seconds is None or elapsed + seconds <= budget_seconds,
+        }
+        return forecast.set_index('ds')[['yhat', 'yhat_lower', 'yhat_upper']], latency
+
+    def _affordable_samples(self, rows, budget_seconds, elapsed):
+        """Sampel ketidakpastian yang muat dalam sisa batas waktu"""
+        samples = self.uncertainty_samples
+        cost = ProphetModel._sample_cost
+        if budget_seconds is None or cost is None or not samples:
+            return samples
+        remaining = budget_seconds - elapsed
+        affordable = int(remaining / (cost * rows)) if remaining > 0 else 0
+        if affordable >= samples:
+            return samples
+        return affordable if affordable >= Config.PROPHET_MIN_UNCERTAINTY_SAMPLES else 0
+
     def predict(self, periods):
         """Membuat prediksi"""
         if not self.model:
@@ -1 +1,414 @@
+# services/analysis_services.py
+"""
+Mesin indikator teknikal tervektorisasi untuk banyak saham sekaligus
 
+Harga disusun menjadi panel NumPy (ticker x bar) lalu setiap indikator
+dihitung sekali untuk seluruh panel. Hasilnya setara secara numerik dengan
+pipeline pandas per DataFrame yang dipakai sebelumnya (rolling dengan
+min_periods=window, ewm(adjust=False), RSI rata-rata sederhana).
+
+Baris panel rata kanan: kolom terakhir selalu bar terbaru tiap ticker dan
+ticker dengan histori lebih pendek diberi padding NaN di kiri. Dengan begitu
+setiap baris persis sama dengan deret ticker itu sendiri, termasuk saham yang
+melewatkan tanggal tertentu (suspensi).
+"""
+import hashlib
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from config import Config
+from utils.memory_cache import LRUCache
+
+PRICE_FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+# Batas elemen per blok untuk reduksi sliding window (max/min/std) agar memori tetap kecil
+_BLOCK_ELEMENTS = 8_000_000
+
+# Deret turunan (indikator) per fingerprint input, dibagi semua sesi dalam satu proses
+_derived_cache = LRUCache(
+    max_bytes=Config.INDICATOR_CACHE_MAX_MB * 1024 * 1024,
+    name="indicator_memory"
+)
+
+
+def frame_fingerprint(df, columns=None):
+    """
+    Sidik jari murah untuk isi DataFrame harga
+
+    Menghash byte indeks dan kolom yang dipakai (bukan seluruh objek), jadi
+    biayanya mikrodetik dan berubah bila ada satu nilai pun yang berbeda.
+    """
+    columns = [c for c in (columns or df.columns) if c in df.columns]
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((df.shape, columns)).encode())
+    index = df.index
+    if isinstance(index, pd.DatetimeIndex):
+        digest.update(index.asi8.tobytes())
+    else:
+        digest.update(pd.util.hash_pandas_object(index.to_series(), index=False).to_numpy().tobytes())
+    for col in columns:
+        digest.update(np.ascontiguousarray(df[col].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+def memoize_derived(kind, df, params, compute, columns=None):
+    """
+    Hasil turunan df yang di-cache per (kind, params, fingerprint df)
+
+    Args:
+        kind: Nama jenis turunan, mis. 'indicators'
+        df: DataFrame input
+        params: Parameter hashable yang memengaruhi hasil
+        compute: Fungsi tanpa argumen yang menghasilkan DataFrame turunan
+        columns: Kolom df yang memengaruhi hasil (default semua)
+
+    Returns:
+        DataFrame: Salinan hasil; objek di cache tidak pernah diberikan langsung
+    """
+    key = (kind, params, frame_fingerprint(df, columns))
+    return _derived_cache.get_or_load(key, compute).copy()
+
+
+class PricePanel:
+    """
+    Panel harga rata kanan: satu array (n_ticker, n_bar) per kolom OHLCV
+
+    Attributes:
+        tickers: Daftar ticker (urutan baris)
+        fields: Dict kolom -> ndarray float64
+        indexes: Dict ticker -> DatetimeIndex asli ticker tersebut
+        lengths: ndarray jumlah bar per ticker
+    """
+
+    def __init__(self, tickers, fields, indexes):
+        self.tickers = list(tickers)
+        self.fields = fields
+        self.indexes = indexes
+        self.lengths = np.array([len(indexes[t]) for t in self.tickers], dtype=np.int64)
+        self.n_bars = next(iter(fields.values())).shape[1] if fields else 0
+
+    @classmethod
+    def from_frames(cls, frames, fields=PRICE_FIELDS):
+        """
+        Bangun panel dari dict ticker -> DataFrame OHLCV
+
+        Args:
+            frames: Dict ticker -> DataFrame (DatetimeIndex urut naik)
+            fields: Kolom yang diambil; kolom yang tidak ada diisi NaN
+        """
+        tickers = [t for t, df in frames.items() if df is not None and not df.empty]
+        n_bars = max((len(frames[t]) for t in tickers), default=0)
+        arrays = {field: np.full((len(tickers), n_bars), np.nan) for field in fields}
+        indexes = {}
+        for row, ticker in enumerate(tickers):
+            df = frames[ticker]
+            indexes[ticker] = df.index
+            for field in fields:
+                if field in df.columns:
+                    arrays[field][row, n_bars - len(df):] = df[field].to_numpy(dtype=float)
+        return cls(tickers, arrays, indexes)
+
+    @classmethod
+    def from_window(cls, window_panels):
+        """
+        Bangun panel dari panel per tanggal (mis. DataFetcher.get_universe_window)
+
+        Args:
+            window_panels: Dict kolom -> DataFrame (tanggal x ticker); baris
+                dengan Close NaN dianggap tidak ada bar untuk ticker itu
+        """
+        close = window_panels['Close']
+        frames = {}
+        for ticker in close.columns:
+            present = close[ticker].notna().to_numpy()
+            frames[ticker] = pd.DataFrame(
+                {field: panel[ticker].to_numpy()[present] for field, panel in window_panels.items()},
+                index=close.index[present]
+            )
+        return cls.from_frames(frames, fields=tuple(window_panels))
+
+    def field(self, name):
+        return self.fields[name]
+
+    def exists(self):
+        """Mask (n_ticker, n_bar): True pada posisi yang berisi bar asli (bukan padding)"""
+        return np.arange(self.n_bars)[None, :] >= (self.n_bars - self.lengths)[:, None]
+
+    def row(self, ticker, values):
+        """Potong satu baris hasil ke panjang histori ticker"""
+        i = self.tickers.index(ticker)
+        return values[i, self.n_bars - self.lengths[i]:]
+
+    def to_frame(self, ticker, results):
+        """DataFrame indikator satu ticker berindeks tanggal aslinya"""
+        return pd.DataFrame(
+            {name: self.row(ticker, values) for name, values in results.items()},
+            index=self.indexes[ticker]
+        )
+
+
+# === Primitif rolling/EWM (sumbu 1 = waktu) ===
+
+def rolling_mean(x, window):
+    """Setara Series.rolling(window).mean(): NaN bila jendela memuat NaN"""
+    n, length = x.shape
+    out = np.full((n, length), np.nan)
+    if length < window:
+        return out
+    valid = ~np.isnan(x)
+    # Geser tiap baris ke nilai pertamanya agar cumsum tidak kehilangan presisi
+    first = np.argmax(valid, axis=1)
+    offset = np.where(valid.any(axis=1), x[np.arange(n), first], 0.0)
+    filled = np.where(valid, x - offset[:, None], 0.0)
+    sums = np.concatenate([np.zeros((n, 1)), np.cumsum(filled, axis=1)], axis=1)
+    counts = np.concatenate([np.zeros((n, 1), dtype=np.int64), np.cumsum(valid, axis=1)], axis=1)
+    window_sum = sums[:, window:] - sums[:, :-window]
+    window_count = counts[:, window:] - counts[:, :-window]
+    out[:, window - 1:] = np.where(window_count == window, window_sum / window + offset[:, None], np.nan)
+    return out
+
+
+def _rolling_reduce(x, window, reduce):
+    n, length = x.shape
+    out = np.full((n, length), np.nan)
+    if length < window:
+        return out
+    block = max(1, _BLOCK_ELEMENTS // max(1, length * window))
+    for start in range(0, n, block):
+        view = sliding_window_view(x[start:start + block], window, axis=1)
+        out[start:start + block, window - 1:] = reduce(view)
+    return out
+
+
+def rolling_max(x, window):
+    return _rolling_reduce(x, window, lambda view: view.max(axis=-1))
+
+
+def rolling_min(x, window):
+    return _rolling_reduce(x, window, lambda view: view.min(axis=-1))
+
+
+def rolling_std(x, window, ddof=1):
+    """Setara Series.rolling(window).std() (ddof=1)"""
+    return _rolling_reduce(x, window, lambda view: view.std(axis=-1, ddof=ddof))
+
+
+def ewm_mean(x, span):
+    """
+    Setara Series.ewm(span=span, adjust=False).mean() termasuk perlakuan NaN
+
+    Rekurensi dijalankan sepanjang waktu, tervektorisasi antar ticker: NaN
+    di awal tetap NaN, NaN di tengah mengulang nilai sebelumnya dan bobot
+    lama meluruh seperti implementasi pandas (ignore_na=False).
+    """
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    n, length = x.shape
+    out = np.empty((n, length))
+    if length == 0:
+        return out
+    observed = ~np.isnan(x)
+    weighted = x[:, 0].copy()
+    old_wt = np.ones(n)
+    out[:, 0] = weighted
+    for t in range(1, length):
+        cur = x[:, t]
+        is_obs = observed[:, t]
+        started = ~np.isnan(weighted)
+        old_wt = np.where(started, old_wt * decay, old_wt)
+        update = started & is_obs
+        with np.errstate(invalid='ignore'):
+            blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        weighted = np.where(update, blended, weighted)
+        old_wt = np.where(update, 1.0, old_wt)
+        weighted = np.where(~started & is_obs, cur, weighted)
+        out[:, t] = weighted
+    return out
+
+
+def diff(x):
+    out = np.full_like(x, np.nan)
+    out[:, 1:] = x[:, 1:] - x[:, :-1]
+    return out
+
+
+def shift(x, periods=1):
+    out = np.full_like(x, np.nan)
+    out[:, periods:] = x[:, :-periods]
+    return out
+
+
+# === Indikator ===
+
+class _Context:
+    """Input panel dan hasil antara yang dipakai ulang antar indikator"""
+
+    def __init__(self, panel):
+        self.panel = panel
+        self._memo = {}
+
+    def get(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    def field(self, name):
+        return self.panel.field(name)
+
+
+def _sma(ctx, window, field='Close'):
+    return ctx.get(('sma', field, window), lambda: rolling_mean(ctx.field(field), window))
+
+
+def _rsi(ctx, window=14):
+    def compute():
+        delta = diff(ctx.field('Close'))
+        exists = ctx.panel.exists()
+        # delta.where(delta > 0, 0): NaN (bar pertama) menjadi 0, padding tetap NaN
+        with np.errstate(invalid='ignore'):
+            gain = np.where(exists, np.where(delta > 0, delta, 0.0), np.nan)
+            loss = np.where(exists, np.where(delta < 0, -delta, 0.0), np.nan)
+        avg_gain = rolling_mean(gain, window)
+        avg_loss = rolling_mean(loss, window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = avg_gain / avg_loss
+            return 100 - (100 / (1 + rs))
+    return ctx.get(('rsi', window), compute)
+
+
+def _ema(ctx, span, field='Close'):
+    return ctx.get(('ema', field, span), lambda: ewm_mean(ctx.field(field), span))
+
+
+def _macd(ctx, fast=12, slow=26):
+    return ctx.get(('macd', fast, slow), lambda: _ema(ctx, fast) - _ema(ctx, slow))
+
+
+def _macd_signal(ctx, fast=12, slow=26, signal=9):
+    return ctx.get(('signal', fast, slow, signal), lambda: ewm_mean(_macd(ctx, fast, slow), signal))
+
+
+def _bollinger_std(ctx, window):
+    return ctx.get(('std', window), lambda: rolling_std(ctx.field('Close'), window))
+
+
+def _bollinger(ctx, band, window=20, num_std=2):
+    middle = _sma(ctx, window)
+    if band == 'middle':
+        return middle
+    sign = 1 if band == 'upper' else -1
+    return middle + sign * num_std * _bollinger_std(ctx, window)
+
+
+def _atr(ctx, window=14):
+    def compute():
+        high, low = ctx.field('High'), ctx.field('Low')
+        prev_close = shift(ctx.field('Close'))
+        # Seperti concat([...]).max(axis=1): NaN dilewati, NaN hanya jika semuanya NaN
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return rolling_mean(true_range, window)
+    return ctx.get(('atr', window), compute)
+
+
+def _stochastic_k(ctx, window=14):
+    def compute():
+        lowest = rolling_min(ctx.field('Low'), window)
+        highest = rolling_max(ctx.field('High'), window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return 100 * (ctx.field('Close') - lowest) / (highest - lowest)
+    return ctx.get(('stoch_k', window), compute)
+
+
+def _stochastic_d(ctx, window=14, smooth=3):
+    return ctx.get(('stoch_d', window, smooth), lambda: rolling_mean(_stochastic_k(ctx, window), smooth))
+
+
+# Nama kolom -> fungsi(ctx); nama mengikuti kolom yang sudah dipakai view
+INDICATORS = {
+    'SMA_20': lambda ctx: _sma(ctx, 20),
+    'SMA_50': lambda ctx: _sma(ctx, 50),
+    'MA50': lambda ctx: _sma(ctx, 50),
+    'MA200': lambda ctx: _sma(ctx, 200),
+    'RSI': lambda ctx: _rsi(ctx, 14),
+    'MACD': lambda ctx: _macd(ctx),
+    'Signal': lambda ctx: _macd_signal(ctx),
+    'BB_Middle': lambda ctx: _bollinger(ctx, 'middle'),
+    'BB_Upper': lambda ctx: _bollinger(ctx, 'upper'),
+    'BB_Lower': lambda ctx: _bollinger(ctx, 'lower'),
+    'ATR': lambda ctx: _atr(ctx, 14),
+    'Stoch_K': lambda ctx: _stochastic_k(ctx, 14),
+    'Stoch_D': lambda ctx: _stochastic_d(ctx, 14, 3),
+}
+
+TECHNICAL_VIEW_INDICATORS = ('SMA_20', 'SMA_50', 'RSI', 'MACD', 'Signal')
+PORTFOLIO_INDICATORS = ('MA50', 'MA200', 'RSI', 'MACD', 'Signal')
+
+
+def compute_indicators(panel, names=None):
+    """
+    Hitung indikator untuk seluruh ticker di panel
+
+    Args:
+        panel: PricePanel
+        names: Nama indikator dari INDICATORS (default semua)
+
+    Returns:
+        Dict: nama indikator -> ndarray (n_ticker, n_bar)
+    """
+    names = list(INDICATORS) if names is None else list(names)
+    unknown = [name for name in names if name not in INDICATORS]
+    if unknown:
+        raise ValueError(f"Indikator tidak dikenal: {unknown}")
+    ctx = _Context(panel)
+    return {name: INDICATORS[name](ctx) for name in names}
+
+
+def add_indicators(df, names=TECHNICAL_VIEW_INDICATORS):
+    """
+    Salinan DataFrame OHLCV satu saham dengan kolom indikator ditambahkan
+
+    Input tidak pernah diubah. Indikator di-memo per isi harga dan nama
+    indikator, sehingga rerun Streamlit dengan data yang sama tidak menghitung ulang.
+    """
+    result = df.copy()
+    if df.empty:
+        return result
+    names = tuple(names)
+
+    def compute():
+        panel = PricePanel.from_frames({'_': df})
+        return pd.DataFrame(
+            {name: values[0] for name, values in compute_indicators(panel, names).items()},
+            index=df.index
+        )
+
+    indicators = memoize_derived('indicators', df, names, compute, columns=PRICE_FIELDS)
+    for name in names:
+        result[name] = indicators[name].to_numpy()
+    return result
+
+
+def indicator_frames(frames, names=TECHNICAL_VIEW_INDICATORS):
+    """
+    Indikator banyak saham dalam satu batch
+
+    Returns:
+        Dict: ticker -> DataFrame indikator (berindeks tanggal ticker tersebut)
+    """
+    panel = PricePanel.from_frames(frames)
+    results = compute_indicators(panel, names)
+    return {ticker: panel.to_frame(ticker, results) for ticker in panel.tickers}
+
+
+def latest_indicators(frames_or_panel, names=PORTFOLIO_INDICATORS):
+    """
+    Nilai indikator pada bar terakhir setiap ticker
+
+    Returns:
+        DataFrame: ticker x indikator
+    """
+    panel = frames_or_panel if isinstance(frames_or_panel, PricePanel) else PricePanel.from_frames(frames_or_panel)
+    if not panel.n_bars:
+        return pd.DataFrame(columns=list(names), index=panel.tickers, dtype=float)
+    results = compute_indicators(panel, names)
+    return pd.DataFrame({name: values[:, -1] for name, values in results.items()}, index=panel.tickers)
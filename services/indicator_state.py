@@ -0,0 +1,307 @@
+# services/indicator_state.py
+"""
+Indikator streaming dengan update O(1) per bar baru
+
+Setiap indikator menyimpan state minimal (jumlah bergulir, state EMA,
+state gain/loss RSI) sehingga bar baru cukup di-update tanpa menghitung
+ulang seluruh histori. State per ticker disimpan di samping cache harga
+(Config.CACHE_DIR/{ticker}_hist.indicators.pkl) sebagai checkpoint kecil
+pada bar final terakhir: state dan anchor (tanggal awal, tanggal dan harga
+bar checkpoint). Nilai indikator bar final ditambahkan ke file float64
+append-only ({ticker}_hist.indicators.f64) dan dibaca sekali per proses,
+sehingga I/O per refresh hanya sebanding jumlah bar baru. Beberapa bar
+terakhir (Config.REFRESH_OVERLAP_BARS) masih bisa direvisi upstream sehingga
+selalu di-update ulang dari checkpoint.
+"""
+import copy
+import math
+import os
+import uuid
+from collections import deque
+import numpy as np
+import pandas as pd
+from config import Config
+from services.analysis_services import memoize_derived
+from utils.file_lock import FileLock, atomic_path
+from utils.memory_cache import LRUCache
+
+STATE_VERSION = 2
+
+
+class RollingMean:
+    """Setara rolling(window).mean(): NaN sampai jendela penuh tanpa NaN"""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.nan_count = 0
+        self._updates = 0
+
+    def update(self, x):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if math.isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+        self.values.append(x)
+        if math.isnan(x):
+            self.nan_count += 1
+        else:
+            self.total += x
+        # Jumlah dihitung ulang tiap `window` update agar galat pembulatan tidak menumpuk
+        self._updates += 1
+        if self._updates >= self.window:
+            self._updates = 0
+            self.total = math.fsum(v for v in self.values if not math.isnan(v))
+        return self.value()
+
+    def value(self):
+        if len(self.values) < self.window or self.nan_count:
+            return math.nan
+        return self.total / self.window
+
+
+class EMA:
+    """
+    Setara ewm(span=span, adjust=False).mean() termasuk perlakuan NaN pandas
+
+    alpha bisa diberikan langsung (mis. 1/n untuk smoothing Wilder).
+    """
+
+    def __init__(self, span=None, alpha=None):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1.0)
+        self.weighted = math.nan
+        self.old_wt = 1.0
+
+    def update(self, x):
+        if not math.isnan(self.weighted):
+            self.old_wt *= 1.0 - self.alpha
+            if not math.isnan(x):
+                self.weighted = (self.old_wt * self.weighted + self.alpha * x) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        elif not math.isnan(x):
+            self.weighted = x
+        return self.weighted
+
+    def value(self):
+        return self.weighted
+
+
+class RSIState:
+    """
+    RSI dari state gain/loss
+
+    method='sma' mengikuti RSI yang dipakai aplikasi (rata-rata sederhana),
+    method='wilder' memakai smoothing Wilder (EMA alpha=1/window).
+    """
+
+    def __init__(self, window=14, method='sma'):
+        if method == 'sma':
+            self.gain, self.loss = RollingMean(window), RollingMean(window)
+        elif method == 'wilder':
+            self.gain, self.loss = EMA(alpha=1.0 / window), EMA(alpha=1.0 / window)
+        else:
+            raise ValueError(f"Metode RSI tidak dikenal: {method}")
+        self.prev_close = math.nan
+
+    def update(self, close):
+        delta = close - self.prev_close
+        self.prev_close = close
+        # delta.where(delta > 0, 0): delta NaN dianggap 0
+        avg_gain = self.gain.update(delta if delta > 0 else 0.0)
+        avg_loss = self.loss.update(-delta if delta < 0 else 0.0)
+        return self._rsi(avg_gain, avg_loss)
+
+    def value(self):
+        return self._rsi(self.gain.value(), self.loss.value())
+
+    @staticmethod
+    def _rsi(avg_gain, avg_loss):
+        if math.isnan(avg_gain) or math.isnan(avg_loss):
+            return math.nan
+        if avg_loss == 0:
+            return math.nan if avg_gain == 0 else 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+class MACDState:
+    """MACD (EMA cepat - EMA lambat) dan signal line"""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast, self.slow, self.signal = EMA(fast), EMA(slow), EMA(signal)
+
+    def update(self, close):
+        macd = self.fast.update(close) - self.slow.update(close)
+        return macd, self.signal.update(macd)
+
+
+class TechnicalState:
+    """State indikator view teknikal: SMA_20, SMA_50, RSI, MACD dan Signal"""
+
+    columns = ('SMA_20', 'SMA_50', 'RSI', 'MACD', 'Signal')
+
+    def __init__(self):
+        self.sma_20 = RollingMean(20)
+        self.sma_50 = RollingMean(50)
+        self.rsi = RSIState(14)
+        self.macd = MACDState()
+
+    def update(self, close):
+        """Masukkan satu harga penutupan, kembalikan tuple nilai sesuai `columns`"""
+        close = float(close)
+        macd, signal = self.macd.update(close)
+        return self.sma_20.update(close), self.sma_50.update(close), self.rsi.update(close), macd, signal
+
+    def run(self, closes):
+        """Update berurutan; Returns: ndarray (len(closes), len(columns))"""
+        return np.array([self.update(c) for c in closes], dtype=float).reshape(-1, len(self.columns))
+
+
+def _state_path(ticker):
+    return os.path.join(Config.CACHE_DIR, f"{ticker}_hist.indicators.pkl")
+
+
+def _values_path(ticker):
+    return os.path.join(Config.CACHE_DIR, f"{ticker}_hist.indicators.f64")
+
+
+# Nilai indikator bar final per (ticker, generasi checkpoint), dibaca dari disk sekali per proses
+_history_cache = LRUCache(
+    max_bytes=Config.INDICATOR_CACHE_MAX_MB * 1024 * 1024,
+    sizeof=lambda values: values.nbytes,
+    name="indicator_history"
+)
+
+
+def _load_checkpoint(ticker):
+    try:
+        checkpoint = pd.read_pickle(_state_path(ticker))
+    except Exception:
+        return None
+    if not isinstance(checkpoint, dict) or checkpoint.get('version') != STATE_VERSION:
+        return None
+    return checkpoint
+
+
+def _checkpoint_matches(checkpoint, hist):
+    """Checkpoint masih berlaku bila awal histori dan harga di titik checkpoint tidak berubah"""
+    position = checkpoint['length'] - 1
+    if position < 0 or position >= len(hist):
+        return False
+    if hist.index[0] != checkpoint['first_date'] or hist.index[position] != checkpoint['anchor_date']:
+        return False
+    # Penyesuaian aksi korporasi mengubah seluruh harga historis
+    return hist['Close'].iloc[position] == checkpoint['anchor_close'] or (
+        np.isnan(hist['Close'].iloc[position]) and np.isnan(checkpoint['anchor_close'])
+    )
+
+
+def _stored_values(ticker, checkpoint, width):
+    """
+    Nilai bar final hingga checkpoint: dari memori proses, atau sekali dibaca dari file
+
+    Returns:
+        ndarray (length, width) atau None bila file nilai tidak lengkap
+    """
+    key = (ticker, checkpoint['generation'])
+    length = checkpoint['length']
+    values = _history_cache.get(key)
+    if values is None or len(values) < length:
+        try:
+            values = np.fromfile(_values_path(ticker), dtype=np.float64, count=length * width)
+        except (OSError, ValueError):
+            return None
+        if len(values) < length * width:
+            return None
+        values = values.reshape(length, width)
+        _history_cache.put(key, values)
+    return values[:length]
+
+
+def _append_values(ticker, checkpoint, fresh):
+    """
+    Tambahkan nilai bar yang baru final ke file nilai lalu simpan checkpoint kecil
+
+    File dipotong ke panjang checkpoint sebelumnya lebih dulu, sehingga sisa
+    tulisan yang terputus tidak pernah terbaca. Checkpoint (state + anchor)
+    ditulis setelah nilai, jadi panjangnya tidak pernah melebihi isi file.
+    """
+    previous = checkpoint['length'] - len(fresh)
+    row_bytes = fresh.shape[1] * 8
+    try:
+        with FileLock(_state_path(ticker) + ".lock"):
+            with open(_values_path(ticker), 'ab') as f:
+                f.truncate(previous * row_bytes)
+                f.write(np.ascontiguousarray(fresh, dtype=np.float64).tobytes())
+            with atomic_path(_state_path(ticker)) as tmp_path:
+                pd.to_pickle(checkpoint, tmp_path)
+    except OSError as e:
+        print(f"Gagal menyimpan state indikator {ticker}: {e}")
+
+
+def technical_indicators(ticker, hist, overlap=None):
+    """
+    Kolom indikator view teknikal untuk histori harian lengkap satu ticker
+
+    Bar sebelum checkpoint diambil dari state tersimpan; hanya bar setelahnya
+    yang di-update, sehingga biaya refresh tidak bergantung panjang histori.
+    Checkpoint dibangun ulang bila histori berubah (backfill, aksi korporasi).
+
+    Args:
+        ticker: Kode saham
+        hist: DataFrame OHLCV harian lengkap (mis. DataFetcher.get_full_history)
+        overlap: Jumlah bar terakhir yang dianggap belum final
+
+    Returns:
+        DataFrame: SMA_20, SMA_50, RSI, MACD, Signal berindeks sama dengan hist
+    """
+    overlap = Config.REFRESH_OVERLAP_BARS if overlap is None else overlap
+    columns = list(TechnicalState.columns)
+    if hist.empty:
+        return pd.DataFrame(columns=columns, index=hist.index, dtype=float)
+    # Rerun dengan histori yang sama tidak membaca checkpoint sama sekali
+    return memoize_derived(
+        'technical_state', hist, (ticker, overlap),
+        lambda: _technical_indicators(ticker, hist, overlap, columns),
+        columns=['Close']
+    )
+
+
+def _technical_indicators(ticker, hist, overlap, columns):
+    """Hitung dari checkpoint tersimpan tanpa memo (lihat technical_indicators)"""
+    width = len(columns)
+    checkpoint = _load_checkpoint(ticker)
+    stored = None
+    if checkpoint is not None and _checkpoint_matches(checkpoint, hist):
+        stored = _stored_values(ticker, checkpoint, width)
+    if stored is None:
+        state, stored = TechnicalState(), np.empty((0, width))
+        checkpoint = {'version': STATE_VERSION, 'generation': uuid.uuid4().hex, 'length': 0}
+    else:
+        state = checkpoint['state']
+
+    closes = hist['Close'].to_numpy(dtype=float)
+    start = len(stored)
+    final_end = max(start, len(hist) - overlap)
+
+    # Bar yang sudah final memajukan checkpoint; hanya bar baru yang ditulis ke disk
+    final_values = state.run(closes[start:final_end])
+    if final_end > start:
+        stored = np.concatenate([stored, final_values])
+        checkpoint = {
+            'version': STATE_VERSION,
+            'generation': checkpoint['generation'],
+            'state': state,
+            'length': final_end,
+            'first_date': hist.index[0],
+            'anchor_date': hist.index[final_end - 1],
+            'anchor_close': closes[final_end - 1],
+        }
+        _append_values(ticker, checkpoint, final_values)
+        _history_cache.put((ticker, checkpoint['generation']), stored)
+
+    # Bar yang mungkin direvisi dihitung dari salinan state
+    tail_values = copy.deepcopy(state).run(closes[final_end:])
+    return pd.DataFrame(np.concatenate([stored, tail_values]), index=hist.index, columns=columns)
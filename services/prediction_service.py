@@ -1 +1,321 @@
+# services/prediction_service.py
+"""
+Prakomputasi forecast ARIMA dan Prophet untuk universe yang dikonfigurasi
 
+Setelah setiap refresh data (lihat prefetch_service), forecast setiap ticker
+yang datanya berubah dihitung di process pool dan disimpan ke
+PredictionStore: forecast beserta interval, hasil backtest dan metrik
+evaluasi. View prediksi membaca hasil itu seketika dan hanya melatih model
+secara live untuk ticker yang belum dihitung (atau datanya sudah berubah).
+
+Dari command line:
+    python -m services.prediction_service --tickers BBCA.JK,TLKM.JK --workers 2
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from config import Config
+from models.model_cache import data_fingerprint, train_cached
+from utils import metrics
+from utils.data_fetcher import DataFetcher
+from utils.file_lock import FileLock
+from utils.prediction_store import PredictionStore
+
+
+def _split(data):
+    split_point = int(len(data) * 0.8)
+    return data.iloc[:split_point], data.iloc[split_point:]
+
+
+def _naive_index(index):
+    index = pd.DatetimeIndex(index)
+    return index.tz_localize(None) if index.tz is not None else index
+
+
+def _result(ticker, model, data, horizon, refit_every=None):
+    return {
+        'ticker': ticker,
+        'model': model,
+        'params': model_params(model, refit_every),
+        'data_date': _naive_index(data.index)[-1],
+        'fingerprint': data_fingerprint(data[['Close']]),
+        'horizon': horizon,
+        'computed_at': time.time(),
+    }
+
+
+def model_params(model, refit_every=None):
+    """
+    Parameter (selain data) yang memengaruhi hasil, sebagai string key store
+
+    Sama seperti key models.model_cache: hyperparameter model baru ditambah
+    pengaturan Config yang memengaruhi evaluasi/forecast, sehingga perubahan
+    konfigurasi tidak menyajikan hasil lama.
+    """
+    if model == 'arima':
+        from models.arima_model import ARIMAModel
+
+        params = ARIMAModel().hyperparameters()
+        params['fast_backtest'] = Config.ARIMA_FAST_BACKTEST
+        params['refit_every'] = Config.ARIMA_REFIT_EVERY if refit_every is None else int(refit_every)
+    else:
+        from models.prophet_model import ProphetModel
+
+        prophet = ProphetModel()
+        params = prophet.hyperparameters()
+        params['fast'] = prophet.fast
+        params['uncertainty_samples'] = prophet.uncertainty_samples
+        if prophet.fast:
+            params['budget_seconds'] = Config.PROPHET_BUDGET_SECONDS
+            params['min_uncertainty_samples'] = Config.PROPHET_MIN_UNCERTAINTY_SAMPLES
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def forecast_arima(ticker, data, horizon=None, refit_every=None):
+    """
+    Latih ARIMA pada 80% data, backtest pada sisanya dan forecast ke depan
+
+    Returns:
+        Dict hasil: metrics, forecast (prediction, lower, upper), details
+        (search_report) beserta metadata data yang dipakai
+    """
+    from models.arima_model import ARIMAModel
+
+    horizon = horizon or Config.PREDICTION_HORIZON_DAYS
+    result = _result(ticker, 'arima', data, horizon, refit_every)
+    train, test = _split(data)
+    arima = train_cached(ARIMAModel(), ticker, train[['Close']])
+    result['metrics'] = arima.evaluate(test[['Close']], refit_every=refit_every)
+    result['forecast'] = arima.predict(horizon)
+    result['details'] = {'search_report': arima.search_report}
+    return result
+
+
+def forecast_prophet(ticker, data, horizon=None):
+    """
+    Latih Prophet pada 80% data; backtest dan forecast dalam satu predict
+
+    Returns:
+        Dict hasil: metrics, backtest (actual, prediction), forecast
+        (prediction, lower, upper), details (latency, fast, seasonalities)
+    """
+    from models.prophet_model import ProphetModel
+
+    horizon = horizon or Config.PREDICTION_HORIZON_DAYS
+    result = _result(ticker, 'prophet', data, horizon)
+    train, test = _split(data)
+    start = time.perf_counter()
+    prophet = train_cached(ProphetModel(), ticker, train[['Close']])
+    fit_seconds = time.perf_counter() - start
+
+    future_dates = pd.date_range(start=result['data_date'] + pd.Timedelta(days=1), periods=horizon)
+    test_dates = _naive_index(test.index)
+    forecast, latency = prophet.forecast(test_dates.append(future_dates), elapsed=fit_seconds)
+
+    actual = test['Close'].values
+    predicted = forecast.loc[test_dates, 'yhat'].values
+    result['metrics'] = prophet.evaluate(actual, predicted)
+    result['backtest'] = pd.DataFrame({'actual': actual, 'prediction': predicted}, index=test_dates)
+    result['forecast'] = forecast.loc[future_dates].rename(
+        columns={'yhat': 'prediction', 'yhat_lower': 'lower', 'yhat_upper': 'upper'}
+    )
+    result['details'] = {
+        'latency': latency,
+        'fast': prophet.fast,
+        'seasonalities': prophet.seasonalities(),
+    }
+    return result
+
+
+FORECASTERS = {
+    'arima': forecast_arima,
+    'prophet': forecast_prophet,
+}
+
+
+def get_forecast(model, ticker, data, days, refit_every=None, store=None):
+    """
+    Forecast dari store bila sudah dihitung untuk data yang sama, selain itu live
+
+    Hasil live ikut disimpan sehingga pembukaan berikutnya seketika.
+
+    Returns:
+        Dict hasil (lihat forecast_arima/forecast_prophet) dengan tambahan
+        source: 'precomputed' atau 'live'
+    """
+    store = store or PredictionStore.shared()
+    params = model_params(model, refit_every)
+    fingerprint = data_fingerprint(data[['Close']])
+    try:
+        result = store.get(ticker, model, params, fingerprint=fingerprint)
+    except Exception as e:
+        print(f"Gagal membaca store prediksi: {e}")
+        result = None
+    if result is not None and result['horizon'] >= days:
+        metrics.CACHE_REQUESTS.inc(cache="prediction_store", result="hit")
+        return dict(result, source='precomputed')
+
+    metrics.CACHE_REQUESTS.inc(cache="prediction_store", result="miss")
+    kwargs = {'refit_every': refit_every} if model == 'arima' else {}
+    result = FORECASTERS[model](ticker, data, horizon=max(days, Config.PREDICTION_HORIZON_DAYS), **kwargs)
+    try:
+        store.put(ticker, model, params, result)
+    except Exception as e:
+        print(f"Gagal menyimpan forecast {ticker} ({model}): {e}")
+    return dict(result, source='live')
+
+
+def _init_worker():
+    # Pencarian order ARIMA tidak membuka pool lagi di dalam worker
+    Config.ARIMA_SEARCH_WORKERS = 1
+
+
+def _compute(model, ticker, data):
+    """Dijalankan di worker; error dikembalikan agar satu ticker tidak menghentikan batch"""
+    try:
+        return FORECASTERS[model](ticker, data), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class PredictionService:
+    """Prakomputasi forecast untuk banyak ticker di process pool"""
+
+    def __init__(self, models=None, workers=None, store=None):
+        self.models = list(models or Config.PREDICTION_MODELS)
+        workers = Config.PREDICTION_WORKERS if workers is None else workers
+        # Fit model terikat CPU; proses lebih banyak dari core hanya menambah overhead
+        self.workers = max(1, min(workers, os.cpu_count() or 1))
+        self.store = store or PredictionStore.shared()
+        self.status = {'done': 0, 'total': 0, 'skipped': 0, 'errors': {}, 'last_duration': None}
+        self._lock = FileLock(os.path.join(Config.CACHE_DIR, "prediction.lock"))
+
+    def pending(self, tickers):
+        """Pekerjaan (model, ticker, data) yang hasilnya belum ada untuk data terkini"""
+        stored = {}
+        for model in self.models:
+            try:
+                stored[model] = self.store.fingerprints(model, model_params(model))
+            except ImportError:
+                # Library model tidak terpasang; error dicatat per ticker saat dihitung
+                stored[model] = {}
+        jobs = []
+        for ticker in tickers:
+            data = DataFetcher.get_stock_data(ticker)
+            if data is None or data.empty:
+                continue
+            fingerprint = data_fingerprint(data[['Close']])
+            for model in self.models:
+                if stored[model].get(ticker) != fingerprint:
+                    jobs.append((model, ticker, data))
+        return jobs
+
+    def run(self, tickers, progress=None):
+        """
+        Hitung forecast yang belum ada atau basi
+
+        Args:
+            tickers: Daftar ticker
+            progress: Callback opsional progress(done, total, label, error)
+
+        Returns:
+            Dict: Ringkasan status putaran ini
+        """
+        if not self._lock.acquire(blocking=False):
+            print("Prakomputasi prediksi dilewati: sedang dijalankan proses lain")
+            return self.status
+
+        try:
+            started = time.perf_counter()
+            tickers = list(tickers)
+            jobs = self.pending(tickers)
+            self.status.update(
+                done=0, total=len(jobs), skipped=len(tickers) * len(self.models) - len(jobs), errors={}
+            )
+            for model, ticker, result, error in self._execute(jobs):
+                label = f"{ticker} ({model})"
+                if error is None:
+                    try:
+                        self.store.put(ticker, model, result['params'], result)
+                    except Exception as e:
+                        error = f"{type(e).__name__}: {e}"
+                if error is not None:
+                    # Exception worker sudah berupa teks "Tipe: pesan"
+                    metrics.ERRORS.inc(component="prediction", type=error.split(":", 1)[0])
+                    self.status['errors'][label] = error
+                self.status['done'] += 1
+                if progress:
+                    progress(self.status['done'], len(jobs), label, error)
+
+            self.status['last_duration'] = time.perf_counter() - started
+            print(
+                f"Prakomputasi prediksi selesai: {len(jobs) - len(self.status['errors'])}/{len(jobs)} dihitung, "
+                f"{self.status['skipped']} masih terkini, {len(self.status['errors'])} gagal, "
+                f"{self.status['last_duration']:.1f}s"
+            )
+            return self.status
+        finally:
+            self._lock.release()
+
+    def _execute(self, jobs):
+        """Jalankan jobs serial atau di process pool; yield (model, ticker, result, error)"""
+        if not jobs:
+            return
+        pool = None
+        if self.workers > 1 and len(jobs) > 1:
+            try:
+                # spawn: worker tidak mewarisi thread, koneksi SQLite dan lock proses Streamlit
+                pool = ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(jobs)),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker
+                )
+            except (OSError, NotImplementedError) as e:
+                print(f"Process pool tidak tersedia, prakomputasi dijalankan serial: {e}")
+
+        if pool is None:
+            for model, ticker, data in jobs:
+                yield (model, ticker, *_compute(model, ticker, data))
+            return
+
+        with pool:
+            futures = {pool.submit(_compute, model, ticker, data): (model, ticker) for model, ticker, data in jobs}
+            for future in as_completed(futures):
+                model, ticker = futures[future]
+                try:
+                    result, error = future.result()
+                except Exception as e:
+                    # Worker mati (mis. kehabisan memori)
+                    result, error = None, f"{type(e).__name__}: {e}"
+                yield model, ticker, result, error
+
+
+def _print_progress(done, total, label, error):
+    print(f"[{done}/{total}] {label}: {error or 'ok'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prakomputasi forecast ARIMA/Prophet")
+    parser.add_argument('--tickers', help="Daftar ticker dipisah koma (default DEFAULT_TICKERS + watchlist)")
+    parser.add_argument('--models', help="Model dipisah koma (default Config.PREDICTION_MODELS)")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    Config.setup()
+    if args.tickers:
+        tickers = [t.strip().upper() for t in args.tickers.split(",")]
+    else:
+        from services.prefetch_service import prefetch_tickers
+        tickers = prefetch_tickers()
+    models = [m.strip() for m in args.models.split(",")] if args.models else None
+    status = PredictionService(models=models, workers=args.workers).run(tickers, progress=_print_progress)
+    for label, error in status['errors'].items():
+        print(f"Gagal: {label}: {error}")
+
+
+if __name__ == "__main__":
+    main()
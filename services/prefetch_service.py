@@ -0,0 +1,252 @@
+# services/prefetch_service.py
+"""
+Prewarm cache harga terjadwal untuk DEFAULT_TICKERS dan watchlist
+
+Scheduler berjalan di thread latar belakang: sekali setelah bursa tutup,
+sekali sebelum bursa buka (Config.PREFETCH_TIMES) dan berkala selama sesi,
+sehingga request interaktif hampir selalu menemukan cache yang hangat.
+Setelah setiap putaran, index screener dan forecast prakomputasi ikut
+diperbarui untuk ticker yang berubah.
+
+Bisa juga dijalankan terpisah (mis. dari cron):
+    python -m services.prefetch_service --once
+    python -m services.prefetch_service --daemon
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from config import Config
+from services.prediction_service import PredictionService
+from services.screener_service import SignalIndex
+from utils import market_hours, metrics
+from utils.data_fetcher import DataFetcher
+from utils.file_lock import FileLock
+
+
+def load_watchlists():
+    """Watchlist dari Config.WATCHLISTS ditambah file JSON opsional"""
+    watchlists = {name: list(tickers) for name, tickers in Config.WATCHLISTS.items()}
+    if Config.WATCHLIST_FILE and os.path.exists(Config.WATCHLIST_FILE):
+        try:
+            with open(Config.WATCHLIST_FILE, encoding='utf-8') as f:
+                for name, tickers in json.load(f).items():
+                    watchlists.setdefault(name, []).extend(tickers)
+        except (OSError, ValueError) as e:
+            print(f"Gagal membaca watchlist {Config.WATCHLIST_FILE}: {e}")
+    return watchlists
+
+
+def prefetch_tickers():
+    """DEFAULT_TICKERS + seluruh watchlist, tanpa duplikat"""
+    tickers = list(Config.DEFAULT_TICKERS)
+    for watchlist in load_watchlists().values():
+        tickers.extend(t.strip().upper() for t in watchlist if t.strip())
+    return list(dict.fromkeys(tickers))
+
+
+class PrefetchScheduler:
+    """Thread latar belakang yang memperbarui cache sesuai jadwal"""
+
+    def __init__(self, tickers=None, period=None, max_workers=None):
+        self._tickers = tickers
+        self.period = period or Config.PREFETCH_PERIOD
+        self.max_workers = max_workers or Config.PREFETCH_MAX_WORKERS
+        self.status = {
+            'running': False,
+            'done': 0,
+            'total': 0,
+            'refreshed': 0,
+            'errors': {},
+            'last_run': None,
+            'last_duration': None,
+            'next_run': None,
+        }
+        self._stop = threading.Event()
+        self._thread = None
+        # Hanya satu proses (worker Streamlit/cron) yang melakukan prefetch pada satu waktu
+        self._lock = FileLock(os.path.join(Config.CACHE_DIR, "prefetch.lock"))
+
+    def tickers(self):
+        return list(self._tickers) if self._tickers is not None else prefetch_tickers()
+
+    def stale_before(self, at=None):
+        """
+        Batas waktu tulis cache yang dianggap basi
+
+        Di luar sesi: cache yang ditulis sebelum penutupan terakhir. Selama
+        sesi: cache yang akan kedaluwarsa sebelum putaran prefetch berikutnya.
+        """
+        at = at or market_hours.now()
+        if not market_hours.is_open(at):
+            return market_hours.last_close(at)
+        margin = timedelta(minutes=Config.PREFETCH_SESSION_INTERVAL_MINUTES)
+        return at - (timedelta(hours=Config.CACHE_TTL_HOURS) - margin)
+
+    def run_once(self, progress=None, precompute=True):
+        """
+        Perbarui cache ticker yang basi dengan konkurensi terbatas
+
+        Args:
+            progress: Callback opsional progress(done, total, ticker, error)
+            precompute: Hitung ulang forecast prediksi setelah refresh
+
+        Returns:
+            Dict: Ringkasan status putaran ini
+        """
+        if not self._lock.acquire(blocking=False):
+            print("Prefetch dilewati: sedang dijalankan proses lain")
+            return self.status
+
+        try:
+            started = time.perf_counter()
+            threshold = self.stale_before()
+            stale = []
+            for ticker in self.tickers():
+                modified = DataFetcher.cache_modified(ticker)
+                if modified is None or modified < threshold:
+                    stale.append(ticker)
+
+            self.status.update(running=True, done=0, total=len(stale), refreshed=0, errors={})
+            if stale:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stale))) as pool:
+                    futures = {pool.submit(DataFetcher.refresh, t, self.period): t for t in stale}
+                    for future in as_completed(futures):
+                        ticker = futures[future]
+                        error = None
+                        try:
+                            future.result()
+                            self.status['refreshed'] += 1
+                        except Exception as e:
+                            metrics.record_error("prefetch", e)
+                            error = f"{type(e).__name__}: {e}"
+                            self.status['errors'][ticker] = error
+                        self.status['done'] += 1
+                        if progress:
+                            progress(self.status['done'], len(stale), ticker, error)
+
+            if self.status['refreshed'] and Config.UNIVERSE_STORE_ENABLED:
+                self._sync_screener()
+            if precompute and self.status['refreshed'] and Config.PREDICTION_PRECOMPUTE_ENABLED:
+                self._precompute_predictions()
+
+            self.status.update(
+                running=False,
+                last_run=market_hours.now(),
+                last_duration=time.perf_counter() - started
+            )
+            print(
+                f"Prefetch selesai: {self.status['refreshed']}/{len(stale)} diperbarui, "
+                f"{len(self.status['errors'])} gagal, {self.status['last_duration']:.1f}s"
+            )
+            return self.status
+        finally:
+            self.status['running'] = False
+            self._lock.release()
+
+    @staticmethod
+    def _sync_screener():
+        """Perbarui index screener untuk ticker yang baru di-refresh"""
+        try:
+            SignalIndex.shared().sync(force=True)
+        except Exception as e:
+            metrics.record_error("screener", e)
+            print(f"Gagal memperbarui index screener: {e}")
+
+    def _precompute_predictions(self):
+        """Hitung ulang forecast ticker yang datanya berubah (lihat prediction_service)"""
+        try:
+            PredictionService().run(self.tickers())
+        except Exception as e:
+            metrics.record_error("prediction", e)
+            print(f"Gagal prakomputasi prediksi: {e}")
+
+    def next_run(self, at=None):
+        """Jadwal berikutnya: jam tetap Config.PREFETCH_TIMES atau interval selama sesi"""
+        at = at or market_hours.now()
+        candidates = [market_hours.next_time(Config.PREFETCH_TIMES, at)]
+        interval = Config.PREFETCH_SESSION_INTERVAL_MINUTES
+        if interval:
+            session_times = []
+            slot = market_hours.parse_time(Config.MARKET_OPEN)
+            close = market_hours.parse_time(Config.MARKET_CLOSE)
+            minutes = slot.hour * 60 + slot.minute
+            while minutes < close.hour * 60 + close.minute:
+                session_times.append(f"{minutes // 60:02d}:{minutes % 60:02d}")
+                minutes += interval
+            candidates.append(market_hours.next_time(session_times, at))
+        candidates = [c for c in candidates if c is not None]
+        return min(candidates) if candidates else None
+
+    def start(self, run_now=False):
+        """Jalankan scheduler di thread daemon (idempoten)"""
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._loop, args=(run_now,), name="prefetch-scheduler", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _loop(self, run_now):
+        if run_now:
+            # Putaran saat server baru start hanya menghangatkan cache harga;
+            # prakomputasi prediksi menunggu putaran terjadwal berikutnya
+            self._safe_run(precompute=False)
+        while not self._stop.is_set():
+            next_run = self.next_run()
+            self.status['next_run'] = next_run
+            if next_run is None:
+                return
+            wait = (next_run - market_hours.now()).total_seconds()
+            if self._stop.wait(max(wait, 0)):
+                return
+            self._safe_run()
+
+    def _safe_run(self, precompute=True):
+        try:
+            self.run_once(precompute=precompute)
+        except Exception as e:
+            print(f"Prefetch gagal: {e}")
+
+
+def _print_progress(done, total, ticker, error):
+    print(f"[{done}/{total}] {ticker}: {error or 'ok'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prewarm cache harga saham")
+    parser.add_argument('--once', action='store_true', help="Jalankan satu putaran lalu keluar")
+    parser.add_argument('--daemon', action='store_true', help="Jalankan terus sesuai jadwal")
+    parser.add_argument('--tickers', help="Daftar ticker dipisah koma (default DEFAULT_TICKERS + watchlist)")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    Config.setup()
+    tickers = [t.strip().upper() for t in args.tickers.split(",")] if args.tickers else None
+    scheduler = PrefetchScheduler(tickers=tickers, max_workers=args.workers)
+
+    if args.daemon:
+        scheduler.start(run_now=True)
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            scheduler.stop()
+    else:
+        status = scheduler.run_once(progress=_print_progress)
+        for ticker, error in status['errors'].items():
+            print(f"Gagal: {ticker}: {error}")
+
+
+if __name__ == "__main__":
+    main()
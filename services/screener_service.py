@@ -0,0 +1,484 @@
+# services/screener_service.py
+"""
+Screener teknikal untuk seluruh universe saham
+
+Index sinyal menyimpan Config.SCREENER_LOOKBACK_BARS bar terakhir setiap
+indikator (definisi dari analysis_services.INDICATORS) untuk setiap ticker di
+universe store, dalam array (n_ticker, n_bar). Query dievaluasi vektor di atas
+array kecil itu sehingga ratusan ticker selesai dalam hitungan milidetik.
+
+Index diperbarui inkremental: hanya ticker yang bar terakhir, harga
+penutupan terakhir atau jumlah barnya berubah di universe store yang
+dihitung ulang. Index disimpan di Config.CACHE_DIR agar proses baru tidak
+membangun ulang dari nol.
+
+Contoh query:
+    RSI(14) < 30 and SMA_20 crossed above SMA_50 in the last 3 days
+    Close > MA200 dan (MACD crossed above Signal within 5 atau RSI > 70)
+
+Dari command line:
+    python -m services.screener_service "RSI < 30"
+"""
+import argparse
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from config import Config
+from services.analysis_services import INDICATORS, PRICE_FIELDS, PricePanel, compute_indicators
+from utils.file_lock import atomic_path
+from utils.universe_store import UniverseStore
+
+INDEX_VERSION = 1
+
+# Nama dengan parameter -> kolom index, mis. RSI(14) -> RSI
+CALL_ALIASES = {
+    ('RSI', (14,)): 'RSI',
+    ('SMA', (20,)): 'SMA_20',
+    ('SMA', (50,)): 'SMA_50',
+    ('SMA', (200,)): 'MA200',
+    ('MA', (20,)): 'SMA_20',
+    ('MA', (50,)): 'MA50',
+    ('MA', (200,)): 'MA200',
+    ('MACD', (12, 26)): 'MACD',
+    ('SIGNAL', (12, 26, 9)): 'Signal',
+    ('ATR', (14,)): 'ATR',
+    ('STOCH_K', (14,)): 'Stoch_K',
+    ('STOCH_D', (14, 3)): 'Stoch_D',
+}
+NAME_ALIASES = {'PRICE': 'Close', 'HARGA': 'Close'}
+KEYWORDS = {
+    'and': 'and', 'dan': 'and',
+    'or': 'or', 'atau': 'or',
+    'not': 'not', 'bukan': 'not',
+}
+COMPARATORS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '==': np.equal,
+    '!=': np.not_equal,
+}
+_TOKEN = re.compile(r"\s*(?:(\d+(?:\.\d+)?)|([A-Za-z_][A-Za-z0-9_]*)|(<=|>=|==|!=|<|>|\(|\)|,))")
+
+
+def index_columns():
+    """Kolom yang tersedia untuk query: OHLCV dan seluruh INDICATORS"""
+    return list(PRICE_FIELDS) + list(INDICATORS)
+
+
+def _tokenize(text):
+    tokens, pos = [], 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Karakter tidak dikenal pada posisi {pos}: {text[pos:pos + 10]!r}")
+        number, name, symbol = match.groups()
+        if number is not None:
+            tokens.append(('num', float(number)))
+        elif name is not None:
+            tokens.append(('name', name))
+        else:
+            tokens.append(('sym', symbol))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    Parser recursive descent untuk bahasa query screener
+
+        expr   := term (or term)*
+        term   := factor (and factor)*
+        factor := not factor | '(' expr ')' | value (CMP value | crossed above|below value [window])
+        window := in [the] last N [days|bars] | within N [days|bars] | dalam N [hari]
+        value  := NUMBER | NAME | NAME '(' NUMBER (',' NUMBER)* ')'
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.columns = []
+
+    def parse(self):
+        if not self.tokens:
+            raise ValueError("Query kosong")
+        node = self._expr()
+        if self.pos < len(self.tokens):
+            raise ValueError(f"Token tidak terduga: {self.tokens[self.pos][1]!r}")
+        return node
+
+    def _peek(self, offset=0):
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def _keyword(self, *words):
+        """Konsumsi keyword (tanpa beda huruf besar/kecil) bila cocok"""
+        kind, value = self._peek()
+        if kind == 'name' and value.lower() in words:
+            self.pos += 1
+            return value.lower()
+        return None
+
+    def _expect_symbol(self, symbol):
+        if self._peek() != ('sym', symbol):
+            raise ValueError(f"Diharapkan {symbol!r} dalam query: {self.text!r}")
+        self.pos += 1
+
+    def _expr(self):
+        node = self._term()
+        while self._boolean('or'):
+            node = ('or', node, self._term())
+        return node
+
+    def _term(self):
+        node = self._factor()
+        while self._boolean('and'):
+            node = ('and', node, self._factor())
+        return node
+
+    def _boolean(self, op):
+        kind, value = self._peek()
+        if kind == 'name' and KEYWORDS.get(value.lower()) == op:
+            self.pos += 1
+            return True
+        return False
+
+    def _factor(self):
+        if self._boolean('not'):
+            return ('not', self._factor())
+        if self._peek() == ('sym', '('):
+            self.pos += 1
+            node = self._expr()
+            self._expect_symbol(')')
+            return node
+
+        left = self._value()
+        kind, value = self._peek()
+        if kind == 'sym' and value in COMPARATORS:
+            self.pos += 1
+            return ('cmp', value, left, self._value())
+        if self._keyword('crossed', 'crosses', 'cross'):
+            direction = self._keyword('above', 'below')
+            if direction is None:
+                raise ValueError("Gunakan 'crossed above' atau 'crossed below'")
+            right = self._value()
+            return ('cross', direction, left, right, self._window())
+        raise ValueError(f"Diharapkan pembanding atau 'crossed' setelah {left[1]!r}")
+
+    def _window(self):
+        """Jumlah bar terakhir tempat persilangan dicari (default 1 = bar terakhir)"""
+        if self._keyword('in'):
+            self._keyword('the')
+            if not self._keyword('last'):
+                raise ValueError("Diharapkan 'in the last N days'")
+        elif not self._keyword('within', 'dalam'):
+            return 1
+        kind, value = self._peek()
+        if kind != 'num' or value != int(value) or value < 1:
+            raise ValueError("Jendela persilangan harus bilangan bulat positif")
+        self.pos += 1
+        self._keyword('days', 'day', 'bars', 'bar', 'hari')
+        window = int(value)
+        if window >= Config.SCREENER_LOOKBACK_BARS:
+            raise ValueError(f"Jendela persilangan maksimal {Config.SCREENER_LOOKBACK_BARS - 1} bar")
+        return window
+
+    def _value(self):
+        kind, value = self._peek()
+        if kind == 'num':
+            self.pos += 1
+            return ('num', value)
+        if kind is None:
+            raise ValueError("Query berakhir sebelum indikator atau angka")
+        if kind != 'name' or value.lower() in KEYWORDS:
+            raise ValueError(f"Diharapkan indikator atau angka, bukan {value!r}")
+        self.pos += 1
+        if self._peek() == ('sym', '('):
+            self.pos += 1
+            params = []
+            while True:
+                param_kind, param = self._peek()
+                if param_kind != 'num':
+                    raise ValueError(f"Parameter {value}(...) harus berupa angka")
+                params.append(int(param) if param == int(param) else param)
+                self.pos += 1
+                if self._peek() == ('sym', ','):
+                    self.pos += 1
+                    continue
+                self._expect_symbol(')')
+                break
+            column = CALL_ALIASES.get((value.upper(), tuple(params)))
+            if column is None:
+                raise ValueError(f"Indikator tidak tersedia: {value}({', '.join(map(str, params))})")
+        else:
+            column = _resolve_name(value)
+        if column not in self.columns:
+            self.columns.append(column)
+        return ('col', column)
+
+
+def _resolve_name(name):
+    lookup = {column.upper(): column for column in index_columns()}
+    column = lookup.get(name.upper()) or NAME_ALIASES.get(name.upper())
+    if column is None:
+        raise ValueError(f"Indikator tidak dikenal: {name}")
+    return column
+
+
+class Query:
+    """Query yang sudah di-parse; evaluasi menghasilkan mask boolean per ticker"""
+
+    def __init__(self, text):
+        parser = _Parser(text)
+        self.text = text
+        self.tree = parser.parse()
+        self.columns = parser.columns
+
+    def evaluate(self, values, n_tickers):
+        """
+        Args:
+            values: Dict kolom -> ndarray (n_ticker, n_bar), bar terakhir di kolom -1
+            n_tickers: Jumlah ticker
+
+        Returns:
+            ndarray bool (n_ticker,)
+        """
+        return np.broadcast_to(self._eval(self.tree, values), (n_tickers,))
+
+    def _eval(self, node, values):
+        kind = node[0]
+        if kind == 'and':
+            return self._eval(node[1], values) & self._eval(node[2], values)
+        if kind == 'or':
+            return self._eval(node[1], values) | self._eval(node[2], values)
+        if kind == 'not':
+            return ~self._eval(node[1], values)
+        if kind == 'cmp':
+            _, op, left, right = node
+            # Perbandingan dengan NaN selalu False
+            return COMPARATORS[op](self._latest(left, values), self._latest(right, values))
+        _, direction, left, right, window = node
+        spread = self._series(left, values) - self._series(right, values)
+        if direction == 'below':
+            spread = -spread
+        # Persilangan pada bar t: di atas pada t, tidak di atas pada t-1 (keduanya bukan NaN)
+        now, before = spread[..., -window:], spread[..., -window - 1:-1]
+        return ((now > 0) & (before <= 0)).any(axis=-1)
+
+    @staticmethod
+    def _series(operand, values):
+        return values[operand[1]] if operand[0] == 'col' else np.full((1, 1), operand[1])
+
+    @staticmethod
+    def _latest(operand, values):
+        return values[operand[1]][:, -1] if operand[0] == 'col' else operand[1]
+
+
+@lru_cache(maxsize=256)
+def parse_query(text):
+    """Query ter-parse (di-cache per teks query)"""
+    return Query(text)
+
+
+class SignalIndex:
+    """Index state indikator terbaru per ticker dari universe store"""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, store=None, path=None):
+        self.store = store or UniverseStore.shared()
+        self.path = path or os.path.join(Config.CACHE_DIR, Config.SCREENER_INDEX_FILE)
+        self._lock = threading.Lock()
+        self._last_sync = None
+        self._snapshot = self._load() or self._empty()
+
+    @classmethod
+    def shared(cls):
+        """Instance bersama untuk seluruh proses"""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    @staticmethod
+    def _empty():
+        return {
+            'version': INDEX_VERSION,
+            'lookback': Config.SCREENER_LOOKBACK_BARS,
+            'tickers': [],
+            'values': {
+                column: np.empty((0, Config.SCREENER_LOOKBACK_BARS)) for column in index_columns()
+            },
+            'stamps': pd.DataFrame(columns=['date', 'close', 'bars']),
+        }
+
+    def _load(self):
+        try:
+            snapshot = pd.read_pickle(self.path)
+        except Exception:
+            return None
+        if (
+            not isinstance(snapshot, dict)
+            or snapshot.get('version') != INDEX_VERSION
+            or snapshot.get('lookback') != Config.SCREENER_LOOKBACK_BARS
+            or set(snapshot['values']) != set(index_columns())
+        ):
+            return None
+        return snapshot
+
+    def _save(self, snapshot):
+        try:
+            with atomic_path(self.path) as tmp_path:
+                pd.to_pickle(snapshot, tmp_path)
+        except OSError as e:
+            print(f"Gagal menyimpan index screener: {e}")
+
+    @property
+    def tickers(self):
+        return list(self._snapshot['tickers'])
+
+    def sync(self, force=False):
+        """
+        Hitung ulang ticker yang datanya berubah di universe store
+
+        Tanpa force, pengecekan dibatasi sekali per Config.SCREENER_SYNC_SECONDS.
+
+        Returns:
+            List: Ticker yang dihitung ulang
+        """
+        now = time.monotonic()
+        if not force and self._last_sync is not None and now - self._last_sync < Config.SCREENER_SYNC_SECONDS:
+            return []
+        with self._lock:
+            self._last_sync = now
+            old = self._snapshot
+            latest = self.store.latest_bars()
+            stamps = old['stamps'].reindex(latest.index)
+            same = (
+                (stamps['date'] == latest['date'])
+                & ((stamps['close'] == latest['close']) | (stamps['close'].isna() & latest['close'].isna()))
+                & (stamps['bars'] == latest['bars'])
+            )
+            changed = [ticker for ticker, unchanged in same.items() if not unchanged]
+            if not changed and len(latest) == len(old['tickers']):
+                return []
+
+            fresh = self._compute(changed)
+            snapshot = self._merge(old, latest, changed, fresh)
+            self._snapshot = snapshot
+            self._save(snapshot)
+            return changed
+
+    def rebuild(self):
+        """Buang index lama lalu hitung ulang seluruh ticker"""
+        with self._lock:
+            self._snapshot = self._empty()
+        return self.sync(force=True)
+
+    def _compute(self, tickers):
+        """Bar terakhir seluruh kolom index untuk ticker tertentu dari histori penuhnya"""
+        lookback = Config.SCREENER_LOOKBACK_BARS
+        if not tickers:
+            return {column: np.empty((0, lookback)) for column in index_columns()}
+        panel = PricePanel.from_frames(self.store.read_tickers(tickers))
+        results = dict(panel.fields)
+        results.update(compute_indicators(panel))
+        # Ticker tanpa bar (semua harga kosong) tetap mendapat baris NaN
+        rows = [panel.tickers.index(t) if t in panel.tickers else None for t in tickers]
+        values = {}
+        for column in index_columns():
+            array = np.full((len(tickers), lookback), np.nan)
+            tail = results[column][:, -lookback:]
+            for i, row in enumerate(rows):
+                if row is not None:
+                    array[i, lookback - tail.shape[1]:] = tail[row]
+            values[column] = array
+        return values
+
+    @staticmethod
+    def _merge(old, latest, changed, fresh):
+        tickers = list(latest.index)
+        position = {ticker: i for i, ticker in enumerate(tickers)}
+        old_position = {ticker: i for i, ticker in enumerate(old['tickers'])}
+        changed_set = set(changed)
+        kept = [t for t in tickers if t not in changed_set and t in old_position]
+        kept_new = [position[t] for t in kept]
+        kept_old = [old_position[t] for t in kept]
+        changed_new = [position[t] for t in changed]
+
+        values = {}
+        for column in index_columns():
+            array = np.full((len(tickers), Config.SCREENER_LOOKBACK_BARS), np.nan)
+            array[kept_new] = old['values'][column][kept_old]
+            array[changed_new] = fresh[column]
+            values[column] = array
+        return {**old, 'tickers': tickers, 'values': values, 'stamps': latest.copy()}
+
+    def screen(self, query, tickers=None, sync=True):
+        """
+        Jalankan query atas seluruh universe
+
+        Args:
+            query: Teks query atau Query
+            tickers: Batasi ke daftar ticker tertentu (opsional)
+            sync: Cek perubahan universe store terlebih dahulu
+
+        Returns:
+            DataFrame: Ticker yang lolos, dengan tanggal bar terakhir, Close
+                dan kolom yang dipakai query
+        """
+        query = parse_query(query) if isinstance(query, str) else query
+        if sync:
+            self.sync()
+        snapshot = self._snapshot
+        values, names = snapshot['values'], snapshot['tickers']
+        mask = query.evaluate(values, len(names)).copy()
+        if tickers is not None:
+            wanted = set(tickers)
+            mask &= np.array([t in wanted for t in names], dtype=bool)
+
+        rows = np.flatnonzero(mask)
+        columns = ['Close'] + [c for c in query.columns if c != 'Close']
+        result = pd.DataFrame(
+            {c: values[c][rows, -1] for c in columns},
+            index=pd.Index([names[i] for i in rows], name='Ticker')
+        )
+        result.insert(0, 'Date', snapshot['stamps']['date'].reindex(result.index).to_numpy())
+        return result
+
+
+def screen(query, tickers=None):
+    """Query screener atas index bersama; lihat SignalIndex.screen"""
+    return SignalIndex.shared().screen(query, tickers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screener teknikal seluruh universe")
+    parser.add_argument('query', help='mis. "RSI(14) < 30 and SMA_20 crossed above SMA_50 in the last 3 days"')
+    parser.add_argument('--rebuild', action='store_true', help="Bangun ulang index dari nol")
+    args = parser.parse_args()
+
+    Config.setup()
+    index = SignalIndex.shared()
+    start = time.perf_counter()
+    changed = index.rebuild() if args.rebuild else index.sync(force=True)
+    print(f"Index: {len(index.tickers)} ticker, {len(changed)} dihitung ulang ({time.perf_counter() - start:.2f}s)")
+
+    start = time.perf_counter()
+    result = index.screen(args.query, sync=False)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(result.to_string() if not result.empty else "Tidak ada saham yang memenuhi kriteria")
+    print(f"{len(result)} saham lolos dalam {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
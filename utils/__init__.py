@@ -2,9 +2,11 @@
 from .formatter import format_rupiah
 from .validator import StockValidator  # Impor kelasnya, bukan fungsi langsung
 from .data_fetcher import DataFetcher
+from .fundamentals_cache import FundamentalsCache
 
 __all__ = [
     'format_rupiah',
     'StockValidator',  # Tambahkan ke __all__
-    'DataFetcher'
+    'DataFetcher',
+    'FundamentalsCache'
 ]
@@ -0,0 +1,134 @@
+# utils/cache_backend.py
+import os
+import numpy as np
+import pandas as pd
+from config import Config
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsional, tanpa pyarrow cache kembali ke CSV
+    pa = None
+
+# Kolom yang aman diperkecil tipenya; harga tetap float64 agar indikator tidak bergeser
+COMPACT_DTYPES = {
+    'Volume': 'int32',
+    'Dividends': 'float32',
+    'Stock Splits': 'float32',
+}
+
+
+def _fits(values, dtype):
+    """Apakah semua nilai muat di tipe integer tujuan tanpa overflow/pembulatan"""
+    if not np.issubdtype(np.dtype(dtype), np.integer):
+        return True
+    limits = np.iinfo(dtype)
+    values = values.to_numpy(dtype=float)
+    return bool(
+        values.size == 0
+        or (values.min() >= limits.min and values.max() <= limits.max and np.all(values == np.floor(values)))
+    )
+
+
+def compact_dtypes(df):
+    """
+    Perkecil tipe data kolom non-harga sebelum disimpan
+
+    Volume menjadi int32 (4 byte per bar, bukan 8) bila semua nilainya muat;
+    saham dengan volume harian di atas ~2,1 miliar lembar tetap int64. Tipe
+    bertanda dipakai agar selisih volume (diff, OBV) tidak wrap-around.
+    """
+    df = df.copy()
+    for col, dtype in COMPACT_DTYPES.items():
+        if col in df.columns:
+            try:
+                values = df[col].fillna(0)
+                if _fits(values, dtype):
+                    df[col] = values.astype(dtype)
+            except (TypeError, ValueError):
+                continue
+    return df
+
+
+def _normalize_index(df):
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+    if df.index.tz is not None:
+        df.index = df.index.tz_localize(None)
+    df.index.name = df.index.name or 'Date'
+    return df
+
+
+class CsvBackend:
+    """Format cache lama: satu file CSV per ticker"""
+    name = "csv"
+    extension = ".csv"
+
+    def path_for(self, ticker, cache_dir=None):
+        return os.path.join(cache_dir or Config.CACHE_DIR, f"{ticker}_hist{self.extension}")
+
+    def read(self, path):
+        df = pd.read_csv(path, index_col=0, parse_dates=True)
+        return _normalize_index(df)
+
+    def write(self, df, path):
+        df.to_csv(path)
+
+
+class ParquetBackend(CsvBackend):
+    """Cache kolumnar Parquet, dibaca dengan memory map"""
+    name = "parquet"
+    extension = ".parquet"
+
+    def __init__(self, compression=None):
+        self.compression = compression or "none"
+
+    def read(self, path):
+        # ParquetFile melewati overhead dataset API dari pq.read_table
+        table = pq.ParquetFile(path, memory_map=True).read()
+        return _normalize_index(table.to_pandas())
+
+    def write(self, df, path):
+        table = pa.Table.from_pandas(compact_dtypes(df), preserve_index=True)
+        pq.write_table(table, path, compression=self.compression)
+
+
+class ArrowBackend(CsvBackend):
+    """Cache Arrow IPC (Feather v2); tanpa kompresi pembacaan bersifat zero-copy"""
+    name = "arrow"
+    extension = ".arrow"
+
+    def __init__(self, compression=None):
+        self.compression = compression or "uncompressed"
+
+    def read(self, path):
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        return _normalize_index(table.to_pandas())
+
+    def write(self, df, path):
+        table = pa.Table.from_pandas(compact_dtypes(df), preserve_index=True)
+        feather.write_feather(table, path, compression=self.compression)
+
+
+BACKENDS = {
+    'csv': CsvBackend,
+    'parquet': ParquetBackend,
+    'arrow': ArrowBackend,
+}
+
+
+def get_cache_backend(name=None, compression="default"):
+    """Buat backend cache sesuai Config.CACHE_FORMAT dan Config.CACHE_COMPRESSION"""
+    name = (name or Config.CACHE_FORMAT).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Format cache tidak dikenal: {name}")
+    if name == 'csv':
+        return CsvBackend()
+    if pa is None:
+        print(f"pyarrow tidak terpasang, cache '{name}' diganti ke CSV")
+        return CsvBackend()
+    if compression == "default":
+        compression = Config.CACHE_COMPRESSION
+    return BACKENDS[name](compression)
@@ -1,52 +1,472 @@
-import yfinance as yf
+import json
 import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from config import Config
+from utils.cache_backend import CsvBackend, get_cache_backend
+from utils.file_lock import FileLock, atomic_path
+from utils import intraday, market_hours, metrics
+from utils.fundamentals_cache import FundamentalsCache
+from utils.memory_cache import LRUCache
+from utils.providers import get_provider, period_start
+from utils.resample import DAILY_INTERVAL_RULES, INTRADAY_INTERVALS, resample_ohlcv
+from utils.universe_store import UniverseStore
+
+# Cache harga bersama untuk semua sesi Streamlit dalam satu proses
+_price_cache = LRUCache(
+    max_bytes=Config.MEMORY_CACHE_MAX_MB * 1024 * 1024,
+    ttl_seconds=Config.MEMORY_CACHE_TTL_SECONDS,
+    name="price_memory"
+)
 
 class DataFetcher:
     @staticmethod
-    def get_stock_data(ticker):
-        """Mengambil data saham dengan caching"""
-        cache_path = os.path.join(Config.CACHE_DIR, f"{ticker}_hist.csv")
+    def get_stock_data(ticker, period="1y", interval="1d"):
+        """
+        Mengambil data saham dengan caching
         
-        # Cek cache
-        if DataFetcher._is_cache_valid(cache_path):
-            try:
-                return DataFetcher._load_from_cache(cache_path)
-            except:
-                pass
+        Interval harian ke atas ('1d', '1wk', '1mo', '3mo') diturunkan dari
+        cache harian lewat resampling tanpa download ulang. Period yang lebih
+        panjang memperluas cache harian, bukan menggantinya.
         
-        # Ambil data baru
+        Args:
+            ticker: Kode saham, mis. 'BBCA.JK'
+            period: '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd' atau 'max'
+            interval: '1d', '1wk', '1mo', '3mo' atau interval intraday ('5m', ...)
+        """
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="1y", interval="1d")
-            if not hist.empty:
-                hist.index = hist.index.tz_localize(None)
-                hist.to_csv(cache_path)
-                return hist
+            hist = _price_cache.get_or_load(
+                DataFetcher._memory_key(ticker, period, interval),
+                lambda: DataFetcher._get_stock_data(ticker, period, interval),
+                ttl_seconds=DataFetcher._memory_ttl(interval)
+            )
+            # Salinan agar view yang menambah kolom tidak mengubah cache bersama
+            return hist.copy()
         except Exception as e:
+            metrics.record_error("data_fetcher", e)
             print(f"Error fetching data for {ticker}: {e}")
+            return pd.DataFrame()
+
+    @staticmethod
+    def get_many(tickers, period="1y", interval="1d", max_workers=None):
+        """
+        Mengambil data beberapa saham sekaligus
+        
+        Cache memori/disk yang masih valid langsung dikembalikan tanpa thread,
+        sisanya diambil paralel melalui thread pool terbatas.
+        
+        Args:
+            tickers: Daftar kode saham
+            period, interval: Sama seperti get_stock_data
+            max_workers: Batas fetch paralel (default Config.FETCH_MAX_WORKERS)
+            
+        Returns:
+            Tuple: (dict ticker -> DataFrame, dict ticker -> pesan error)
+        """
+        tickers = list(dict.fromkeys(tickers))
+        results, errors, misses = {}, {}, []
+        
+        for ticker in tickers:
+            key = DataFetcher._memory_key(ticker, period, interval)
+            # Lookup dicatat sekali: di sini untuk hit/jalur disk, di get_or_load untuk sisanya
+            hist = _price_cache.get(key, record=False)
+            if hist is not None:
+                metrics.CACHE_REQUESTS.inc(cache="price_memory", result="hit")
+                results[ticker] = hist.copy()
+                continue
+            if interval in INTRADAY_INTERVALS:
+                misses.append((ticker, lambda t=ticker: DataFetcher._fetch_intraday(t, period, interval)))
+                continue
+            start = period_start(period)
+            try:
+                cached, usable = DataFetcher._lookup_disk(ticker, start)
+            except Exception as e:
+                metrics.record_error("data_fetcher", e)
+                errors[ticker] = f"{type(e).__name__}: {e}"
+                continue
+            if usable:
+                metrics.CACHE_REQUESTS.inc(cache="price_memory", result="miss")
+                hist = DataFetcher._derive(cached, start, interval)
+                _price_cache.put(key, hist)
+                results[ticker] = hist.copy()
+            else:
+                # Cache yang sudah dibaca diteruskan agar disk tidak dibaca dan dicatat dua kali
+                misses.append((ticker, lambda t=ticker, c=cached, s=start: DataFetcher._load_from(t, c, s, interval)))
+        
+        if misses:
+            workers = min(max_workers or Config.FETCH_MAX_WORKERS, len(misses))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(
+                        _price_cache.get_or_load,
+                        DataFetcher._memory_key(ticker, period, interval),
+                        loader,
+                        DataFetcher._memory_ttl(interval)
+                    ): ticker
+                    for ticker, loader in misses
+                }
+                for future in as_completed(futures):
+                    ticker = futures[future]
+                    try:
+                        results[ticker] = future.result().copy()
+                    except Exception as e:
+                        metrics.record_error("data_fetcher", e)
+                        errors[ticker] = f"{type(e).__name__}: {e}"
+        
+        # Pertahankan urutan input
+        return {t: results[t] for t in tickers if t in results}, errors
+
+    @staticmethod
+    def get_intraday(ticker, interval="1m", tail=None):
+        """
+        Bar intraday terbaru dari ring buffer bersama
+        
+        Setiap panggilan hanya mengambil bar baru sejak poll terakhir
+        (paling sering sekali per Config.INTRADAY_POLL_SECONDS).
+        
+        Returns:
+            Tuple: (DataFrame bar di buffer, jumlah bar baru dari poll ini)
+        """
+        feed = intraday.get_feed(ticker, interval)
+        new_bars = feed.poll()
+        return feed.frame(tail), new_bars
+
+    @staticmethod
+    def get_full_history(ticker, period="1y"):
+        """
+        Seluruh bar harian di cache disk, minimal mencakup period
+        
+        Berbeda dengan get_stock_data, hasil tidak dipotong ke period sehingga
+        awal deret stabil antar hari (dipakai state indikator streaming).
+        """
+        start = period_start(period)
+        cached, usable = DataFetcher._lookup_disk(ticker, start)
+        if not usable:
+            cached = DataFetcher._refresh(ticker, cached, start)
+        return cached
+
+    @staticmethod
+    def refresh(ticker, period="1y"):
+        """
+        Perbarui cache harian ticker sekarang juga, meski belum kedaluwarsa
+        
+        Dipakai scheduler prefetch agar request interaktif menemukan cache hangat.
+        """
+        cached, _ = DataFetcher._read_cache(ticker)
+        hist = DataFetcher._refresh(ticker, cached, period_start(period), force=True)
+        # Semua period/interval harian ke atas diturunkan dari cache harian yang baru ditulis
+        _price_cache.invalidate_where(
+            lambda key: key[0] == ticker and key[2] not in INTRADAY_INTERVALS
+        )
+        return hist
+
+    @staticmethod
+    def cache_modified(ticker):
+        """Waktu terakhir cache harian ticker ditulis (WIB) atau None"""
+        cache_path = DataFetcher._cache_path(ticker, get_cache_backend())
+        if not os.path.exists(cache_path):
+            return None
+        return datetime.fromtimestamp(os.path.getmtime(cache_path), tz=market_hours.WIB)
+
+    @staticmethod
+    def get_universe_window(start=None, end=None, tickers=None, field='Close'):
+        """
+        Panel harga (tanggal x ticker) dari store gabungan
+        
+        Args:
+            start, end: Batas tanggal (inklusif)
+            tickers: Daftar ticker, None untuk seluruh saham yang pernah diambil
+            field: 'Open', 'High', 'Low', 'Close' atau 'Volume'
+        """
+        return UniverseStore.shared().read_window(start, end, tickers, field)
+
+    @staticmethod
+    def get_cross_section(date):
+        """OHLCV seluruh saham pada satu tanggal, diindeks ticker"""
+        return UniverseStore.shared().cross_section(date)
+
+    @staticmethod
+    def _write_universe(ticker, hist):
+        if not Config.UNIVERSE_STORE_ENABLED:
+            return
+        try:
+            UniverseStore.shared().upsert(ticker, hist)
+        except Exception as e:
+            print(f"Gagal menulis {ticker} ke universe store: {e}")
+
+    @staticmethod
+    def _memory_key(ticker, period="1y", interval="1d"):
+        return (ticker, period, interval)
+
+    @staticmethod
+    def _memory_ttl(interval):
+        if interval in INTRADAY_INTERVALS:
+            return Config.INTRADAY_TTL_SECONDS
+        return Config.MEMORY_CACHE_TTL_SECONDS
+
+    @staticmethod
+    def _get_stock_data(ticker, period="1y", interval="1d"):
+        if interval in INTRADAY_INTERVALS:
+            return DataFetcher._fetch_intraday(ticker, period, interval)
+        if interval not in DAILY_INTERVAL_RULES:
+            raise ValueError(f"Interval tidak dikenal: {interval}")
+        
+        start = period_start(period)
+        cached, usable = DataFetcher._lookup_disk(ticker, start)
+        if usable:
+            return DataFetcher._derive(cached, start, interval)
+        return DataFetcher._load_from(ticker, cached, start, interval)
+
+    @staticmethod
+    def _load_from(ticker, cached, start, interval):
+        """Perbarui cache yang sudah dibaca (basi/kosong) lalu turunkan ke interval"""
+        return DataFetcher._derive(DataFetcher._refresh(ticker, cached, start), start, interval)
+
+    @staticmethod
+    def _lookup_disk(ticker, start):
+        """
+        Baca cache disk dan catat hasilnya ke metrik
+        
+        Returns:
+            Tuple: (DataFrame cache atau None, apakah bisa langsung dipakai)
+        """
+        cached, is_valid = DataFetcher._read_cache(ticker)
+        usable = is_valid and DataFetcher._covers(ticker, cached, start)
+        result = "hit" if usable else ("miss" if cached is None else "expired")
+        metrics.CACHE_REQUESTS.inc(cache="price_disk", result=result)
+        return cached, usable
+
+    @staticmethod
+    def _derive(daily, start, interval):
+        """Potong cache harian ke period lalu resample ke interval"""
+        return resample_ohlcv(daily[daily.index >= start], interval)
+
+    @staticmethod
+    def _fetch_intraday(ticker, period, interval):
+        # Bar intraday tidak disimpan ke disk; cukup cache memori berumur pendek
+        hist = get_provider().history(ticker, period=period, interval=interval)
+        if hist.empty:
+            raise ValueError("Data kosong")
+        hist.index = hist.index.tz_localize(None)
+        return hist
+
+    @staticmethod
+    def _read_cache(ticker, cache_path=None):
+        """
+        Baca cache ticker
+        
+        Args:
+            cache_path: Path yang sudah di-resolve (dan dimigrasi) pemanggil;
+                wajib diisi bila pemanggil memegang lock cache ticker ini
+        
+        Returns:
+            Tuple: (DataFrame cache atau None, apakah cache masih valid)
+        """
+        backend = get_cache_backend()
+        if cache_path is None:
+            cache_path = DataFetcher._cache_path(ticker, backend)
+        if not os.path.exists(cache_path):
+            return None, False
+        try:
+            cached = DataFetcher._load_from_cache(cache_path, backend)
+        except Exception as e:
+            metrics.record_error("price_disk", e)
+            print(f"Cache {cache_path} rusak, mengambil ulang: {e}")
+            return None, False
+        return cached, DataFetcher._is_cache_valid(cache_path)
+
+    @staticmethod
+    def _refresh(ticker, cached=None, start=None, force=False):
+        """
+        Ambil data dari Yahoo lalu simpan ke cache
+        
+        Cache yang ada diperluas ke belakang bila belum mencakup start, lalu
+        diperbarui dengan bar terbaru (delta atau penuh).
+        
+        Hanya satu proses yang memperbarui entri yang sama. Proses lain
+        menyajikan salinan lama bila ada, atau menunggu sebentar lalu
+        membaca hasil proses yang memegang lock. force=True memperbarui
+        walaupun cache masih valid.
+        """
+        start = period_start("1y") if start is None else start
+        backend = get_cache_backend()
+        # Migrasi cache lama (yang juga memakai lock ini) selesai sebelum lock diambil
+        cache_path = DataFetcher._cache_path(ticker, backend)
+        lock = FileLock(cache_path + ".lock")
+        
+        if not lock.acquire(blocking=False):
+            if DataFetcher._covers(ticker, cached, start):
+                metrics.STALE_SERVES.inc(cache="price_disk")
+                return cached
+            if not lock.acquire(timeout=Config.CACHE_LOCK_TIMEOUT_SECONDS):
+                raise TimeoutError(f"Cache {ticker} sedang diperbarui proses lain")
+        
+        try:
+            # Proses lain mungkin baru saja selesai memperbarui
+            latest, is_valid = DataFetcher._read_cache(ticker, cache_path)
+            if latest is not None:
+                cached = latest
+            if is_valid and not force and DataFetcher._covers(ticker, cached, start):
+                return cached
+            
+            if cached is None or cached.empty:
+                hist = DataFetcher._fetch_full(ticker, start)
+                covered_from = start
+            else:
+                covered_from = DataFetcher._read_coverage(ticker, cached)
+                hist = cached
+                if covered_from > start:
+                    hist = DataFetcher._backfill(ticker, hist, start)
+                    covered_from = start
+                if Config.INCREMENTAL_REFRESH:
+                    hist = DataFetcher._refresh_incremental(ticker, hist, covered_from)
+                else:
+                    hist = DataFetcher._fetch_full(ticker, covered_from)
+            
+            if hist.empty:
+                raise ValueError("Data kosong")
+            if hist is cached:
+                # Tidak ada bar baru (mis. hari libur bursa); perpanjang umur cache saja
+                os.utime(cache_path)
+            else:
+                with atomic_path(cache_path) as tmp_path:
+                    backend.write(hist, tmp_path)
+                    metrics.CACHE_BYTES.inc(os.path.getsize(tmp_path), cache="price_disk", direction="written")
+                DataFetcher._write_universe(ticker, hist)
+            DataFetcher._write_coverage(ticker, covered_from)
+            return hist
+        finally:
+            lock.release()
+
+    @staticmethod
+    def _fetch_full(ticker, start):
+        if start == pd.Timestamp.min:
+            hist = get_provider().history(ticker, period="max", interval="1d")
+        else:
+            hist = get_provider().history(ticker, start=start.strftime('%Y-%m-%d'), interval="1d")
+        if not hist.empty:
+            hist.index = hist.index.tz_localize(None)
+        return hist
+
+    @staticmethod
+    def _backfill(ticker, cached, start):
+        """Tambahkan bar yang lebih lama dari awal cache (period lebih panjang)"""
+        older = DataFetcher._fetch_full(ticker, start)
+        older = older[older.index < cached.index[0]]
+        if older.empty:
+            return cached
+        return pd.concat([older, cached])
+
+    @staticmethod
+    def _refresh_incremental(ticker, cached, covered_from):
+        """
+        Ambil hanya bar yang belum ada di cache lalu gabungkan
         
-        return pd.DataFrame()
+        Beberapa bar terakhir ikut diambil ulang untuk menangkap revisi
+        (mis. bar hari berjalan). Jika ada aksi korporasi baru, yfinance
+        menyesuaikan seluruh histori sehingga dilakukan fetch penuh.
+        """
+        overlap = min(Config.REFRESH_OVERLAP_BARS, len(cached))
+        start = cached.index[-overlap]
+        
+        fresh = get_provider().history(ticker, start=start.strftime('%Y-%m-%d'), interval="1d")
+        if fresh.empty:
+            return cached
+        fresh.index = fresh.index.tz_localize(None)
+        
+        if DataFetcher._has_new_corporate_action(cached, fresh):
+            return DataFetcher._fetch_full(ticker, covered_from)
+        
+        merged = pd.concat([cached[cached.index < fresh.index[0]], fresh])
+        return merged[~merged.index.duplicated(keep='last')].sort_index()
+
+    @staticmethod
+    def _covers(ticker, cached, start):
+        """Apakah cache harian sudah mencakup histori sejak start"""
+        if cached is None or cached.empty:
+            return False
+        return DataFetcher._read_coverage(ticker, cached) <= start
+
+    @staticmethod
+    def _coverage_path(ticker):
+        return os.path.join(Config.CACHE_DIR, f"{ticker}_hist.meta.json")
+
+    @staticmethod
+    def _read_coverage(ticker, cached):
+        """Tanggal awal yang pernah diminta untuk cache ini (bukan bar pertama)"""
+        try:
+            with open(DataFetcher._coverage_path(ticker), encoding='utf-8') as f:
+                return pd.Timestamp(json.load(f)['covered_from'])
+        except (OSError, ValueError, KeyError):
+            # Cache lama tanpa metadata: anggap mulai dari bar pertamanya
+            return cached.index[0]
+
+    @staticmethod
+    def _write_coverage(ticker, covered_from):
+        with atomic_path(DataFetcher._coverage_path(ticker)) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'covered_from': covered_from.isoformat()}, f)
+
+    @staticmethod
+    def _has_new_corporate_action(cached, fresh):
+        action_cols = [col for col in ['Dividends', 'Stock Splits'] if col in fresh.columns]
+        if not action_cols:
+            return False
+        actions = fresh[action_cols].fillna(0).ne(0).any(axis=1)
+        known = cached.reindex(fresh.index)[action_cols].fillna(0).ne(0).any(axis=1)
+        return bool((actions & ~known).any())
+
+    @staticmethod
+    def _cache_path(ticker, backend):
+        """Path cache untuk backend aktif, memigrasikan cache CSV lama bila ada"""
+        cache_path = backend.path_for(ticker)
+        legacy_path = CsvBackend().path_for(ticker)
+        if cache_path != legacy_path and not os.path.exists(cache_path) and os.path.exists(legacy_path):
+            with FileLock(cache_path + ".lock"):
+                if not os.path.exists(cache_path) and os.path.exists(legacy_path):
+                    DataFetcher._migrate_legacy_cache(legacy_path, cache_path, backend)
+        return cache_path
+
+    @staticmethod
+    def _migrate_legacy_cache(legacy_path, cache_path, backend):
+        try:
+            df = CsvBackend().read(legacy_path)
+            # Pertahankan waktu modifikasi agar TTL tetap dihitung dari fetch terakhir
+            mtime = os.path.getmtime(legacy_path)
+            with atomic_path(cache_path) as tmp_path:
+                backend.write(df, tmp_path)
+                os.utime(tmp_path, (mtime, mtime))
+            os.remove(legacy_path)
+        except (OSError, ValueError) as e:
+            print(f"Gagal migrasi cache {legacy_path}: {e}")
+            # Karantina agar migrasi tidak dicoba ulang di setiap pemanggilan
+            try:
+                os.replace(legacy_path, legacy_path + ".bad")
+            except OSError:
+                pass
 
     @staticmethod
     def _is_cache_valid(cache_path):
         if not os.path.exists(cache_path):
             return False
-        file_time = datetime.fromtimestamp(os.path.getmtime(cache_path))
-        return (datetime.now() - file_time) < timedelta(hours=Config.CACHE_TTL_HOURS)
+        file_time = datetime.fromtimestamp(os.path.getmtime(cache_path), tz=market_hours.WIB)
+        now = market_hours.now()
+        # Di luar sesi bar harian tidak berubah: cache yang ditulis setelah penutupan tetap valid
+        if not market_hours.is_open(now):
+            return file_time >= market_hours.last_close(now)
+        return (now - file_time) < timedelta(hours=Config.CACHE_TTL_HOURS)
 
     @staticmethod
-    def _load_from_cache(cache_path):
-        df = pd.read_csv(cache_path, index_col=0, parse_dates=True)
-        df.index = df.index.tz_localize(None)
+    def _load_from_cache(cache_path, backend=None):
+        df = (backend or get_cache_backend()).read(cache_path)
+        metrics.CACHE_BYTES.inc(os.path.getsize(cache_path), cache="price_disk", direction="read")
         return df
 
 def get_fundamental_data(ticker):
     try:
         # Ganti dengan API/data source yang Anda gunakan
-        data = yf.Ticker(ticker).balance_sheet
+        data = FundamentalsCache.get_statement(ticker, 'balance_sheet')
         
         # Debugging - tampilkan kolom yang tersedia
         print("Kolom yang tersedia:", data.columns.tolist())
@@ -0,0 +1,137 @@
+# utils/downsample.py
+"""
+Downsampling deret waktu untuk chart
+
+LTTB (Largest-Triangle-Three-Buckets) memilih titik yang mempertahankan
+bentuk garis (puncak dan lembah tetap ada), sedangkan bar OHLC digabung per
+kelompok bar berurutan sehingga high/low ekstrem tidak hilang.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _as_float(x):
+    """Sumbu x sebagai float (tanggal -> detik relatif) untuk perhitungan luas"""
+    x = np.asarray(x)
+    if x.dtype == object and len(x) and isinstance(x[0], pd.Timestamp):
+        # Tanggal ber-timezone menjadi array Timestamp object; asi8 = nanodetik UTC
+        x = pd.DatetimeIndex(x).asi8
+        return (x - x[0]) / 1e9
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').astype(np.int64)
+        return (x - x[0]) / 1e9
+    return x.astype(float)
+
+
+def lttb_indices(x, y, max_points):
+    """
+    Indeks titik terpilih LTTB
+
+    Args:
+        x: Sumbu x urut naik (angka atau datetime64)
+        y: Nilai tanpa NaN, panjang sama dengan x
+        max_points: Jumlah titik keluaran (termasuk titik pertama dan terakhir)
+
+    Returns:
+        ndarray indeks urut naik
+    """
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    x = _as_float(x)
+    y = np.asarray(y, dtype=float)
+
+    # Batas bucket: titik pertama dan terakhir masing-masing satu bucket sendiri
+    edges = np.floor(np.arange(max_points - 1) * (n - 2) / (max_points - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    # Rata-rata bucket berikutnya; bucket terakhir dibandingkan dengan titik terakhir
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        # Dua kali luas segitiga (titik terpilih sebelumnya, kandidat, rata-rata bucket berikutnya)
+        area = np.abs(
+            (x[a] - next_x[i]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y[i] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_line(x, y, max_points):
+    """
+    Downsample satu garis dengan LTTB
+
+    NaN dipertahankan sebagai pemisah garis: LTTB berjalan per segmen tanpa
+    NaN dan setiap celah diwakili satu titik NaN, dengan anggaran titik dibagi
+    proporsional panjang segmen.
+
+    Returns:
+        Tuple (x, y) hasil downsample dengan tipe yang sama seperti input
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    valid = ~np.isnan(y)
+    if valid.all():
+        keep = lttb_indices(x, y, max_points)
+        return x[keep], y[keep]
+
+    # Segmen [start, end) berisi nilai valid, dipisah oleh run NaN
+    change = np.flatnonzero(np.diff(np.r_[False, valid, False].astype(np.int8)))
+    starts, ends = change[::2], change[1::2]
+    n_valid = int(valid.sum())
+    keep = []
+    for start, end in zip(starts, ends):
+        if start > 0:
+            keep.append(np.array([start - 1]))  # Penanda celah
+        budget = max(3, int(round(max_points * (end - start) / max(n_valid, 1))))
+        keep.append(start + lttb_indices(x[start:end], y[start:end], budget))
+    if len(ends) and ends[-1] < n:
+        keep.append(np.array([ends[-1]]))
+    if not keep:
+        # Seluruh nilai NaN: cukup kedua ujung
+        keep = [np.array([0, n - 1])]
+    keep = np.concatenate(keep)
+    return x[keep], y[keep]
+
+
+def downsample_ohlc(df, max_bars):
+    """
+    Gabungkan bar OHLC berurutan sehingga jumlahnya <= max_bars
+
+    Setiap kelompok memakai tanggal bar pertamanya (seperti resample_ohlcv):
+    Open pertama, High maksimum, Low minimum, Close terakhir, Volume dijumlah.
+    """
+    n = len(df)
+    if n <= max_bars or max_bars < 1:
+        return df
+    size = -(-n // max_bars)
+    starts = np.arange(0, n, size)
+    result = {}
+    for col in df.columns:
+        values = df[col].to_numpy(dtype=float)
+        if col == 'Open':
+            result[col] = values[starts]
+        elif col == 'Close':
+            result[col] = values[np.minimum(starts + size, n) - 1]
+        elif col == 'High':
+            result[col] = np.fmax.reduceat(values, starts)
+        elif col == 'Low':
+            result[col] = np.fmin.reduceat(values, starts)
+        elif col == 'Volume':
+            result[col] = np.add.reduceat(np.nan_to_num(values), starts)
+        else:
+            result[col] = values[np.minimum(starts + size, n) - 1]
+    return pd.DataFrame(result, index=df.index[starts])
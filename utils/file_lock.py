@@ -0,0 +1,109 @@
+# utils/file_lock.py
+"""
+Koordinasi cache antar-proses: lock berbasis file dan penulisan atomik
+
+Beberapa server Streamlit bisa berbagi Config.CACHE_DIR yang sama. FileLock
+memastikan hanya satu proses yang memperbarui entri cache, dan atomic_path
+memastikan pembaca tidak pernah melihat file yang baru setengah ditulis.
+"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    Lock eksklusif antar-proses (dan antar-thread) pada file {path}
+
+    File lock tidak pernah dihapus agar semua proses selalu mengunci inode
+    yang sama.
+    """
+
+    def __init__(self, path, poll_interval=0.05):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def acquire(self, blocking=True, timeout=None):
+        """
+        Ambil lock
+
+        Returns:
+            bool: True jika lock didapat, False jika non-blocking/timeout gagal
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self._try_lock(fd):
+                self._fd = fd
+                return True
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                os.close(fd)
+                return False
+            time.sleep(self.poll_interval)
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    @property
+    def locked(self):
+        return self._fd is not None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    @staticmethod
+    def _try_lock(fd):
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+
+@contextmanager
+def atomic_path(path):
+    """
+    Tulis ke file sementara di direktori yang sama lalu rename ke path
+
+    Contoh:
+        with atomic_path(cache_path) as tmp_path:
+            df.to_csv(tmp_path)
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
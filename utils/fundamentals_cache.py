@@ -0,0 +1,84 @@
+# utils/fundamentals_cache.py
+import os
+import time
+import pandas as pd
+from config import Config
+from utils import metrics
+from utils.file_lock import atomic_path
+from utils.memory_cache import LRUCache
+from utils.providers import STATEMENT_KINDS, get_provider
+
+# Info dan dividen dibagi bersama semua sesi dalam satu proses
+_fundamentals_cache = LRUCache(max_bytes=Config.FUNDAMENTALS_CACHE_MAX_MB * 1024 * 1024, name="fundamentals_memory")
+
+
+class FundamentalsCache:
+    """
+    Cache info, laporan keuangan dan dividen dengan TTL per artefak
+
+    Setiap artefak diambil sekali lalu dipakai bersama oleh semua view dan
+    sesi: memori lebih dulu, lalu disk (Config.CACHE_DIR/fundamentals),
+    baru kemudian provider. TTL diatur di Config.FUNDAMENTALS_TTL_HOURS.
+    """
+
+    @staticmethod
+    def get_info(ticker):
+        info = FundamentalsCache._get(ticker, 'info', lambda: get_provider().info(ticker))
+        return dict(info or {})
+
+    @staticmethod
+    def get_statement(ticker, kind):
+        if kind not in STATEMENT_KINDS:
+            raise ValueError(f"Jenis laporan tidak dikenal: {kind}")
+        data = FundamentalsCache._get(ticker, kind, lambda: get_provider().statement(ticker, kind))
+        return data.copy()
+
+    @staticmethod
+    def get_dividends(ticker):
+        data = FundamentalsCache._get(ticker, 'dividends', lambda: get_provider().dividends(ticker))
+        return data.copy()
+
+    @staticmethod
+    def invalidate(ticker):
+        for artifact in Config.FUNDAMENTALS_TTL_HOURS:
+            _fundamentals_cache.invalidate((ticker, artifact))
+            path = FundamentalsCache._path(ticker, artifact)
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def _get(ticker, artifact, fetch):
+        ttl_seconds = Config.FUNDAMENTALS_TTL_HOURS[artifact] * 3600
+        # Salinan di memori berumur pendek; salinan disk yang menentukan kapan fetch ulang
+        return _fundamentals_cache.get_or_load(
+            (ticker, artifact),
+            lambda: FundamentalsCache._load(ticker, artifact, fetch, ttl_seconds),
+            ttl_seconds=min(ttl_seconds, Config.MEMORY_CACHE_TTL_SECONDS)
+        )
+
+    @staticmethod
+    def _load(ticker, artifact, fetch, ttl_seconds):
+        path = FundamentalsCache._path(ticker, artifact)
+        result = "miss"
+        if os.path.exists(path):
+            result = "expired"
+            if time.time() - os.path.getmtime(path) < ttl_seconds:
+                try:
+                    data = pd.read_pickle(path)
+                    metrics.CACHE_REQUESTS.inc(cache="fundamentals_disk", result="hit")
+                    metrics.CACHE_BYTES.inc(os.path.getsize(path), cache="fundamentals_disk", direction="read")
+                    return data
+                except Exception as e:
+                    metrics.record_error("fundamentals_disk", e)
+                    print(f"Cache fundamental {path} rusak, mengambil ulang: {e}")
+        metrics.CACHE_REQUESTS.inc(cache="fundamentals_disk", result=result)
+
+        data = fetch()
+        with atomic_path(path) as tmp_path:
+            pd.to_pickle(data, tmp_path)
+            metrics.CACHE_BYTES.inc(os.path.getsize(tmp_path), cache="fundamentals_disk", direction="written")
+        return data
+
+    @staticmethod
+    def _path(ticker, artifact):
+        return os.path.join(Config.CACHE_DIR, "fundamentals", f"{ticker}_{artifact}.pkl")
@@ -0,0 +1,202 @@
+# utils/intraday.py
+"""
+Ingestion bar intraday (1m/5m) dengan ring buffer berukuran tetap
+
+Setiap (ticker, interval) punya satu IntradayFeed per proses. Feed menyimpan
+N bar terakhir di array NumPy dan setiap poll hanya menambahkan bar baru
+(bar terakhir yang masih terbentuk ditimpa), sehingga biaya refresh tidak
+bergantung pada panjang histori.
+"""
+import threading
+import time
+import numpy as np
+import pandas as pd
+from config import Config
+from utils.providers import get_provider, RecordStore
+
+FIELDS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class RingBuffer:
+    """Buffer bar OHLCV berkapasitas tetap berbasis array NumPy"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._values = np.full((capacity, len(FIELDS)), np.nan)
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def last_timestamp(self):
+        """Timestamp bar terakhir (pd.Timestamp) atau None jika kosong"""
+        with self._lock:
+            if not self._size:
+                return None
+            return pd.Timestamp(self._timestamps[(self._start + self._size - 1) % self.capacity])
+
+    def extend(self, bars):
+        """
+        Tambahkan bar dari DataFrame OHLCV berindeks waktu
+
+        Bar yang lebih lama dari bar terakhir diabaikan; bar dengan timestamp
+        sama dengan bar terakhir menimpanya (bar yang masih terbentuk).
+
+        Returns:
+            int: Jumlah bar yang ditambahkan atau diperbarui
+        """
+        if bars is None or bars.empty:
+            return 0
+        timestamps = pd.DatetimeIndex(bars.index).as_unit('ns').asi8
+        values = bars.reindex(columns=list(FIELDS)).to_numpy(dtype=float)
+
+        with self._lock:
+            if self._size:
+                last_pos = (self._start + self._size - 1) % self.capacity
+                last_ts = self._timestamps[last_pos]
+                keep = timestamps >= last_ts
+                timestamps, values = timestamps[keep], values[keep]
+                if len(timestamps) and timestamps[0] == last_ts:
+                    self._values[last_pos] = values[0]
+                    self._write(timestamps[1:], values[1:])
+                    return len(timestamps)
+            self._write(timestamps, values)
+            return len(timestamps)
+
+    def to_frame(self, tail=None):
+        """Bar dalam urutan waktu sebagai DataFrame (opsional hanya `tail` terakhir)"""
+        with self._lock:
+            count = self._size if tail is None else min(tail, self._size)
+            positions = (self._start + np.arange(self._size - count, self._size)) % self.capacity
+            timestamps = self._timestamps[positions].copy()
+            values = self._values[positions].copy()
+        index = pd.DatetimeIndex(timestamps.astype('datetime64[ns]'), name='Datetime')
+        return pd.DataFrame(values, index=index, columns=list(FIELDS))
+
+    def since(self, timestamp):
+        """Bar dengan waktu >= timestamp (termasuk bar terakhir yang mungkin direvisi)"""
+        frame = self.to_frame()
+        if timestamp is None:
+            return frame
+        return frame[frame.index >= timestamp]
+
+    def _write(self, timestamps, values):
+        count = len(timestamps)
+        if not count:
+            return
+        if count >= self.capacity:
+            timestamps, values = timestamps[-self.capacity:], values[-self.capacity:]
+            self._timestamps[:] = timestamps
+            self._values[:] = values
+            self._start, self._size = 0, self.capacity
+            return
+        end = (self._start + self._size) % self.capacity
+        positions = (end + np.arange(count)) % self.capacity
+        self._timestamps[positions] = timestamps
+        self._values[positions] = values
+        overflow = max(0, self._size + count - self.capacity)
+        self._start = (self._start + overflow) % self.capacity
+        self._size = min(self.capacity, self._size + count)
+
+
+class PollingSource:
+    """Ambil bar intraday terbaru dari provider aktif"""
+
+    def __init__(self, interval):
+        self.interval = interval
+
+    def fetch(self, ticker, since):
+        # Tanpa bar sebelumnya ambil beberapa hari agar chart langsung terisi
+        hist = get_provider().history(ticker, period="1d" if since is not None else "5d", interval=self.interval)
+        if hist.empty:
+            return hist
+        hist.index = hist.index.tz_localize(None)
+        return hist if since is None else hist[hist.index >= since]
+
+
+class ReplaySource:
+    """
+    Feed lokal untuk pengujian: memutar bar rekaman sedikit demi sedikit
+
+    Bar diambil dari rekaman provider (Config.REPLAY_DIR/{ticker}/history_{interval}.pkl)
+    atau dari DataFrame yang diberikan langsung.
+    """
+
+    def __init__(self, interval, bars_per_poll=1, frames=None, warmup_bars=60):
+        self.interval = interval
+        self.bars_per_poll = bars_per_poll
+        self.warmup_bars = warmup_bars
+        self._frames = dict(frames or {})
+        self._cursor = {}
+
+    def fetch(self, ticker, since):
+        frame = self._frame(ticker)
+        cursor = self._cursor.get(ticker, min(self.warmup_bars, len(frame)))
+        if since is not None:
+            cursor = min(cursor + self.bars_per_poll, len(frame))
+        self._cursor[ticker] = cursor
+        revealed = frame.iloc[:cursor]
+        return revealed if since is None else revealed[revealed.index >= since]
+
+    def _frame(self, ticker):
+        if ticker not in self._frames:
+            frame = RecordStore(Config.REPLAY_DIR).load_frame(ticker, f"history_{self.interval}")
+            if frame.index.tz is not None:
+                frame.index = frame.index.tz_localize(None)
+            self._frames[ticker] = frame
+        return self._frames[ticker]
+
+
+class IntradayFeed:
+    """Ring buffer satu ticker yang diisi dari sumber polling"""
+
+    def __init__(self, ticker, interval, source, capacity=None, poll_seconds=None):
+        self.ticker = ticker
+        self.interval = interval
+        self.source = source
+        self.buffer = RingBuffer(capacity or Config.INTRADAY_BUFFER_BARS)
+        self.poll_seconds = Config.INTRADAY_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self._last_poll = 0.0
+        self._lock = threading.Lock()
+
+    def poll(self, force=False):
+        """
+        Ambil bar baru bila sudah waktunya
+
+        Returns:
+            int: Jumlah bar baru/diperbarui
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._last_poll and now - self._last_poll < self.poll_seconds:
+                return 0
+            self._last_poll = now
+            bars = self.source.fetch(self.ticker, self.buffer.last_timestamp())
+            return self.buffer.extend(bars)
+
+    def frame(self, tail=None):
+        return self.buffer.to_frame(tail)
+
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def create_source(interval):
+    """Sumber bar sesuai Config.INTRADAY_SOURCE ('poll' atau 'replay')"""
+    if Config.INTRADAY_SOURCE == "replay":
+        return ReplaySource(interval)
+    return PollingSource(interval)
+
+
+def get_feed(ticker, interval="1m"):
+    """Feed bersama untuk seluruh sesi dalam satu proses"""
+    key = (ticker, interval)
+    with _feeds_lock:
+        feed = _feeds.get(key)
+        if feed is None:
+            feed = _feeds[key] = IntradayFeed(ticker, interval, create_source(interval))
+    return feed
@@ -0,0 +1,115 @@
+# utils/key_statistics.py
+"""
+Scraping halaman key-statistics Yahoo Finance untuk asisten portofolio
+
+HTML diambil lewat provider data (utils.providers) sehingga ikut direkam dan
+diputar ulang tanpa jaringan; YFinanceProvider memakai satu requests.Session
+dengan pool koneksi keep-alive. Halaman diambil paralel dengan batas thread,
+lalu hasilnya di-cache per (ticker, hari) di memori dan disk.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import numpy as np
+from bs4 import BeautifulSoup, SoupStrainer
+from config import Config
+from utils import metrics
+from utils.file_lock import atomic_path
+from utils.memory_cache import LRUCache
+from utils.providers import get_provider
+
+# Hanya sel <td> dengan data-test ini yang dibangun parser
+FIELD_IDS = {
+    'PER': "PE_RATIO-value",
+    'PBV': "PB_RATIO-value",
+    'Dividend Yield': "DIVIDEND_AND_YIELD-value",
+}
+_strainer = SoupStrainer("td", attrs={"data-test": list(FIELD_IDS.values())})
+
+try:
+    import lxml  # noqa: F401
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+_results = LRUCache(max_bytes=16 * 1024 * 1024, max_entries=5000, name="key_statistics_memory")
+
+
+def empty_statistics():
+    return {field: np.nan for field in FIELD_IDS}
+
+
+def parse_key_statistics(html):
+    """Ambil PER, PBV dan Dividend Yield dari HTML key-statistics"""
+    soup = BeautifulSoup(html, _PARSER, parse_only=_strainer)
+    values = {}
+    for field, data_test_id in FIELD_IDS.items():
+        element = soup.find("td", {"data-test": data_test_id})
+        text = element.text.strip() if element else None
+        values[field] = text if text and text != 'N/A' else None
+
+    pe_text, pb_text, dy_text = values['PER'], values['PBV'], values['Dividend Yield']
+    return {
+        'PER': float(pe_text.replace(',', '')) if pe_text else np.nan,
+        'PBV': float(pb_text.replace(',', '')) if pb_text else np.nan,
+        'Dividend Yield': (
+            float(dy_text.split('(')[1].split('%')[0]) / 100
+            if dy_text and '(' in dy_text else np.nan
+        ),
+    }
+
+
+def fetch_key_statistics(ticker):
+    """Key statistics satu ticker (dengan akhiran bursa, mis. BBCA.JK)"""
+    day = datetime.now().strftime('%Y-%m-%d')
+    return dict(_results.get_or_load((ticker, day), lambda: _load(ticker, day)))
+
+
+def fetch_many(tickers, max_workers=None):
+    """
+    Key statistics banyak ticker secara paralel
+
+    Returns:
+        Tuple: (dict ticker -> statistik, dict ticker -> pesan error)
+    """
+    tickers = list(dict.fromkeys(tickers))
+    results, errors = {}, {}
+    if not tickers:
+        return results, errors
+
+    workers = min(max_workers or Config.SCRAPE_MAX_WORKERS, len(tickers))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(fetch_key_statistics, t): t for t in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                results[ticker] = future.result()
+            except Exception as e:
+                metrics.record_error("key_statistics", e)
+                errors[ticker] = f"{type(e).__name__}: {e}"
+    return results, errors
+
+
+def _load(ticker, day):
+    path = os.path.join(Config.CACHE_DIR, "key_statistics", day, f"{ticker}.json")
+    if os.path.exists(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                stats = {k: np.nan if v is None else v for k, v in json.load(f).items()}
+            metrics.CACHE_REQUESTS.inc(cache="key_statistics_disk", result="hit")
+            metrics.CACHE_BYTES.inc(os.path.getsize(path), cache="key_statistics_disk", direction="read")
+            return stats
+        except (OSError, ValueError) as e:
+            metrics.record_error("key_statistics_disk", e)
+            print(f"Cache key statistics {path} rusak, mengambil ulang: {e}")
+    metrics.CACHE_REQUESTS.inc(cache="key_statistics_disk", result="miss")
+
+    # Lewat provider: direkam/diputar ulang seperti data harga dan latensinya dicatat
+    stats = parse_key_statistics(get_provider().key_statistics_page(ticker))
+
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({k: None if np.isnan(v) else v for k, v in stats.items()}, f)
+        metrics.CACHE_BYTES.inc(os.path.getsize(tmp_path), cache="key_statistics_disk", direction="written")
+    return stats
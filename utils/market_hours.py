@@ -0,0 +1,77 @@
+# utils/market_hours.py
+"""
+Jam perdagangan Bursa Efek Indonesia (WIB, Senin-Jumat)
+
+Hari libur bursa tidak dimodelkan; pada hari libur bursa dianggap buka
+sehingga cache kembali memakai TTL biasa.
+"""
+from datetime import datetime, time, timedelta, timezone
+from config import Config
+
+# WIB tidak mengenal daylight saving, offset tetap cukup
+WIB = timezone(timedelta(hours=Config.MARKET_UTC_OFFSET_HOURS))
+
+
+def parse_time(value):
+    """'HH:MM' -> datetime.time"""
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+
+def now():
+    return datetime.now(WIB)
+
+
+def _to_wib(at):
+    if at is None:
+        return now()
+    if at.tzinfo is None:
+        # Waktu naive dianggap waktu lokal mesin
+        at = at.astimezone()
+    return at.astimezone(WIB)
+
+
+def is_trading_day(day):
+    return day.weekday() < 5
+
+
+def is_open(at=None):
+    """Apakah sesi perdagangan sedang berlangsung"""
+    at = _to_wib(at)
+    return (
+        is_trading_day(at.date())
+        and parse_time(Config.MARKET_OPEN) <= at.time() < parse_time(Config.MARKET_CLOSE)
+    )
+
+
+def last_close(at=None):
+    """Waktu penutupan bursa terakhir pada atau sebelum `at`"""
+    at = _to_wib(at)
+    close = parse_time(Config.MARKET_CLOSE)
+    day = at.date()
+    if not (is_trading_day(day) and at.time() >= close):
+        day -= timedelta(days=1)
+        while not is_trading_day(day):
+            day -= timedelta(days=1)
+    return datetime.combine(day, close, tzinfo=WIB)
+
+
+def next_time(times, at=None):
+    """
+    Waktu terdekat setelah `at` dari daftar jam 'HH:MM' pada hari bursa
+
+    Args:
+        times: Daftar jam, mis. ['16:30', '08:30']
+    """
+    at = _to_wib(at)
+    day = at.date()
+    for _ in range(8):
+        if is_trading_day(day):
+            candidates = [
+                datetime.combine(day, parse_time(t), tzinfo=WIB) for t in times
+            ]
+            upcoming = [c for c in candidates if c > at]
+            if upcoming:
+                return min(upcoming)
+        day += timedelta(days=1)
+    return None
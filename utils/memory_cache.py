@@ -0,0 +1,164 @@
+# utils/memory_cache.py
+import sys
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+from utils import metrics
+
+
+def estimate_size(value):
+    """Perkiraan ukuran objek di memori (byte)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        size = value.memory_usage(deep=True)
+        return int(size.sum()) if isinstance(value, pd.DataFrame) else int(size)
+    return sys.getsizeof(value)
+
+
+class _Flight:
+    """Satu fetch upstream yang sedang berjalan untuk sebuah key"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class LRUCache:
+    """
+    Cache LRU thread-safe untuk satu proses, dibatasi memori dan TTL
+
+    Miss bersamaan untuk key yang sama digabung (single-flight): hanya satu
+    thread menjalankan loader, thread lain menunggu dan menerima hasil yang sama.
+    Cache bernama mencatat hit/miss ke utils.metrics dengan label cache=name.
+    """
+
+    def __init__(self, max_bytes, ttl_seconds=None, max_entries=None, sizeof=estimate_size, name=None):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.sizeof = sizeof
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._inflight = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, record=True):
+        """
+        Ambil nilai yang belum kedaluwarsa, None jika tidak ada
+
+        record=False untuk pengecekan awal yang dilanjutkan get_or_load,
+        agar satu lookup tidak tercatat dua kali.
+        """
+        with self._lock:
+            value, result = self._lookup_locked(key)
+        if record:
+            self._record(result)
+        return value
+
+    def put(self, key, value, ttl_seconds=None):
+        """Simpan nilai; entri yang lebih besar dari anggaran tidak disimpan"""
+        size = self.sizeof(value)
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._pop_locked(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            self._evict_locked()
+
+    def get_or_load(self, key, loader, ttl_seconds=None):
+        """
+        Ambil dari cache atau jalankan loader sekali untuk semua pemanggil
+
+        Exception dari loader diteruskan ke semua thread yang menunggu.
+        """
+        with self._lock:
+            value, result = self._lookup_locked(key)
+            if value is None:
+                flight = self._inflight.get(key)
+                is_leader = flight is None
+                if is_leader:
+                    flight = self._inflight[key] = _Flight()
+                else:
+                    result = "coalesced"
+        self._record(result)
+        if value is not None:
+            return value
+
+        if not is_leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = loader()
+            self.put(key, flight.result, ttl_seconds)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._pop_locked(key)
+
+    def invalidate_where(self, predicate):
+        """Hapus semua entri yang key-nya memenuhi predicate(key); kembalikan jumlahnya"""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._pop_locked(key)
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Ringkasan isi cache"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'inflight': len(self._inflight),
+            }
+
+    def _lookup_locked(self, key):
+        """Returns: (nilai atau None, 'hit' / 'miss' / 'expired')"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, "miss"
+        value, _, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._pop_locked(key)
+            return None, "expired"
+        self._entries.move_to_end(key)
+        return value, "hit"
+
+    def _record(self, result):
+        if self.name is not None:
+            metrics.CACHE_REQUESTS.inc(cache=self.name, result=result)
+
+    def _pop_locked(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def _evict_locked(self):
+        while self._entries and (
+            self._bytes > self.max_bytes
+            or (self.max_entries is not None and len(self._entries) > self.max_entries)
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
@@ -0,0 +1,238 @@
+# utils/metrics.py
+"""
+Metrik ringan untuk lapisan data (counter dan histogram) per proses
+
+Format ekspor mengikuti Prometheus text exposition format sehingga bisa
+di-scrape langsung (Config.METRICS_PORT) atau dilihat di halaman admin.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Batas bucket latensi (detik): cache lokal sampai request Yahoo yang lambat
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labels):
+            raise ValueError(f"Label {self.name} harus {self.labels}, bukan {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Nilai kumulatif yang hanya bertambah"""
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def items(self):
+        """List (dict label, nilai)"""
+        with self._lock:
+            return [(dict(zip(self.labels, key)), value) for key, value in self._values.items()]
+
+    def _render_samples(self, items):
+        for key, value in items:
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Distribusi observasi dalam bucket kumulatif"""
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            state['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Ukur durasi blok `with` (termasuk bila melempar exception)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def items(self):
+        """List (dict label, ringkasan) dengan count, sum dan perkiraan p50/p95"""
+        with self._lock:
+            states = [(dict(zip(self.labels, key)), dict(state, counts=list(state['counts'])))
+                      for key, state in self._values.items()]
+        return [
+            (labels, {
+                'count': state['count'],
+                'sum': state['sum'],
+                'p50': self._quantile(state, 0.5),
+                'p95': self._quantile(state, 0.95),
+            })
+            for labels, state in states
+        ]
+
+    def _quantile(self, state, q):
+        """Batas atas bucket yang memuat kuantil q (seperti histogram_quantile tanpa interpolasi)"""
+        if not state['count']:
+            return None
+        target = q * state['count']
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), state['counts']):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+    def _render_samples(self, items):
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state['counts']):
+                cumulative += count
+                labels = _format_labels(self.labels, key, [('le', _format_value(bound))])
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, key)
+            yield f"{self.name}_sum{labels} {_format_value(state['sum'])}"
+            yield f"{self.name}_count{labels} {state['count']}"
+
+
+class Registry:
+    """Kumpulan metrik yang diekspor bersama"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metrik sudah terdaftar: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labels=()):
+        return self.register(Counter(name, documentation, labels))
+
+    def histogram(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self):
+        """Seluruh metrik dalam Prometheus text format"""
+        return "\n".join(metric.render() for metric in self.metrics()) + "\n"
+
+    def reset(self):
+        for metric in self.metrics():
+            metric.clear()
+
+
+REGISTRY = Registry()
+
+# Metrik lapisan data
+CACHE_REQUESTS = REGISTRY.counter(
+    "stock_cache_requests_total",
+    "Lookup cache per lapisan; result = hit, miss, expired atau coalesced",
+    ("cache", "result")
+)
+STALE_SERVES = REGISTRY.counter(
+    "stock_cache_stale_serves_total",
+    "Data kedaluwarsa yang disajikan karena proses lain sedang memperbarui",
+    ("cache",)
+)
+UPSTREAM_LATENCY = REGISTRY.histogram(
+    "stock_upstream_latency_seconds",
+    "Latensi request ke sumber data per endpoint",
+    ("provider", "endpoint")
+)
+CACHE_BYTES = REGISTRY.counter(
+    "stock_cache_bytes_total",
+    "Byte yang dibaca/ditulis cache disk",
+    ("cache", "direction")
+)
+ERRORS = REGISTRY.counter(
+    "stock_errors_total",
+    "Error per komponen dan tipe exception",
+    ("component", "type")
+)
+
+
+def record_error(component, error):
+    ERRORS.inc(component=component, type=type(error).__name__)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """Sajikan /metrics di thread daemon untuk di-scrape Prometheus"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-exporter", daemon=True).start()
+    return server
@@ -0,0 +1,110 @@
+# utils/prediction_store.py
+"""
+Store hasil forecast (ARIMA/Prophet) per ticker dalam satu database SQLite
+
+Satu baris per (ticker, model, parameter): tanggal bar terakhir dan
+fingerprint data yang dipakai, waktu komputasi, serta payload berisi
+forecast, interval, hasil backtest dan metrik evaluasi (pickle). View
+prediksi membaca baris ini tanpa melatih model selama datanya masih sama.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+import pandas as pd
+from config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    ticker TEXT NOT NULL,
+    model TEXT NOT NULL,
+    params TEXT NOT NULL,
+    data_date TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    computed_at REAL NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (ticker, model, params)
+) WITHOUT ROWID;
+"""
+
+
+class PredictionStore:
+    """Akses baca/tulis ke store hasil forecast"""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(Config.CACHE_DIR, Config.PREDICTION_STORE_FILE)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def shared(cls):
+        """Instance bersama untuk seluruh proses"""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def put(self, ticker, model, params, result):
+        """Simpan/timpa hasil forecast (dict dengan data_date dan fingerprint)"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO forecasts "
+                "(ticker, model, params, data_date, fingerprint, computed_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    ticker, model, params,
+                    pd.Timestamp(result['data_date']).isoformat(),
+                    result['fingerprint'],
+                    result.get('computed_at', time.time()),
+                    pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL),
+                )
+            )
+
+    def get(self, ticker, model, params, fingerprint=None):
+        """
+        Hasil forecast tersimpan atau None
+
+        Args:
+            fingerprint: Bila diisi, hanya hasil dari data yang sama yang dikembalikan
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT fingerprint, payload FROM forecasts WHERE ticker = ? AND model = ? AND params = ?",
+                (ticker, model, params)
+            ).fetchone()
+        if row is None or (fingerprint is not None and row[0] != fingerprint):
+            return None
+        try:
+            return pickle.loads(row[1])
+        except Exception as e:
+            print(f"Gagal membaca forecast {ticker} ({model}): {e}")
+            return None
+
+    def fingerprints(self, model, params):
+        """Fingerprint data tersimpan per ticker untuk satu model dan parameter"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT ticker, fingerprint FROM forecasts WHERE model = ? AND params = ?",
+                (model, params)
+            ).fetchall()
+        return dict(rows)
+
+    @contextmanager
+    def _connect(self):
+        """Koneksi per thread (dipakai ulang) dengan commit/rollback otomatis"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=Config.CACHE_LOCK_TIMEOUT_SECONDS)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
@@ -0,0 +1,334 @@
+# utils/providers.py
+"""
+Sumber data pasar yang bisa diganti
+
+Semua akses ke Yahoo Finance melewati get_provider() sehingga aplikasi bisa
+dijalankan dengan data rekaman (tanpa jaringan) untuk profiling dan benchmark:
+
+    STOCK_DATA_PROVIDER=record streamlit run main.py   # rekam respons yfinance
+    STOCK_DATA_PROVIDER=replay streamlit run main.py   # putar ulang dari disk
+"""
+import json
+import os
+import threading
+import time
+import pandas as pd
+from config import Config
+from utils import metrics
+
+STATEMENT_KINDS = ('financials', 'balance_sheet', 'cashflow')
+
+KEY_STATISTICS_URL = "https://finance.yahoo.com/quote/{ticker}/key-statistics"
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+
+def period_start(period, end=None):
+    """Tanggal awal untuk period gaya yfinance ('1y', 'ytd', 'max', ...)"""
+    end = pd.Timestamp.now().normalize() if end is None else pd.Timestamp(end).normalize()
+    if period == 'max':
+        return pd.Timestamp.min
+    if period == 'ytd':
+        return end.replace(month=1, day=1)
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"Period tidak dikenal: {period}")
+    return end - PERIOD_OFFSETS[period]
+
+
+class MarketDataProvider:
+    """Antarmuka sumber data: histori harga, info, laporan keuangan, dividen dan key statistics"""
+    name = "base"
+
+    def history(self, ticker, period=None, interval="1d", start=None, end=None):
+        raise NotImplementedError
+
+    def info(self, ticker):
+        raise NotImplementedError
+
+    def statement(self, ticker, kind):
+        """Laporan keuangan: 'financials', 'balance_sheet' atau 'cashflow'"""
+        raise NotImplementedError
+
+    def dividends(self, ticker):
+        raise NotImplementedError
+
+    def key_statistics_page(self, ticker):
+        """HTML halaman key-statistics Yahoo Finance (di-parse oleh utils.key_statistics)"""
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Data langsung dari Yahoo Finance melalui yfinance (dan scraping halaman web)"""
+    name = "yfinance"
+
+    _session = None
+    _session_lock = threading.Lock()
+
+    @classmethod
+    def session(cls):
+        """Session HTTP bersama dengan pool koneksi keep-alive dan retry ringan"""
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from urllib3.util.retry import Retry
+
+                    session = requests.Session()
+                    session.headers.update(HEADERS)
+                    adapter = HTTPAdapter(
+                        pool_connections=Config.SCRAPE_MAX_WORKERS,
+                        pool_maxsize=Config.SCRAPE_MAX_WORKERS,
+                        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    cls._session = session
+        return cls._session
+
+    def history(self, ticker, period=None, interval="1d", start=None, end=None):
+        import yfinance as yf
+        kwargs = {'interval': interval}
+        if start is not None:
+            kwargs['start'] = start
+            if end is not None:
+                kwargs['end'] = end
+        else:
+            kwargs['period'] = period or "1y"
+        return yf.Ticker(ticker).history(**kwargs)
+
+    def info(self, ticker):
+        import yfinance as yf
+        return yf.Ticker(ticker).info
+
+    def statement(self, ticker, kind):
+        import yfinance as yf
+        if kind not in STATEMENT_KINDS:
+            raise ValueError(f"Jenis laporan tidak dikenal: {kind}")
+        return getattr(yf.Ticker(ticker), kind)
+
+    def dividends(self, ticker):
+        import yfinance as yf
+        return yf.Ticker(ticker).dividends
+
+    def key_statistics_page(self, ticker):
+        response = self.session().get(
+            KEY_STATISTICS_URL.format(ticker=ticker),
+            timeout=Config.SCRAPE_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+        return response.text
+
+
+class RecordStore:
+    """Tata letak file rekaman: {root}/{ticker}/{artefak}"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, ticker, name):
+        return os.path.join(self.root, ticker, name)
+
+    def save_frame(self, ticker, name, data):
+        path = self.path(ticker, f"{name}.pkl")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pd.to_pickle(data, path)
+
+    def load_frame(self, ticker, name):
+        path = self.path(ticker, f"{name}.pkl")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Rekaman tidak ditemukan: {path}")
+        return pd.read_pickle(path)
+
+    def save_info(self, ticker, info):
+        path = self.path(ticker, "info.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(info, f, default=str)
+
+    def load_info(self, ticker):
+        path = self.path(ticker, "info.json")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Rekaman tidak ditemukan: {path}")
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_text(self, ticker, name, text):
+        path = self.path(ticker, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def load_text(self, ticker, name):
+        path = self.path(ticker, name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Rekaman tidak ditemukan: {path}")
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+
+class RecordingProvider(MarketDataProvider):
+    """Meneruskan ke provider lain sambil merekam setiap respons ke disk"""
+    name = "record"
+
+    def __init__(self, inner, root):
+        self.inner = inner
+        self.store = RecordStore(root)
+
+    def history(self, ticker, period=None, interval="1d", start=None, end=None):
+        hist = self.inner.history(ticker, period=period, interval=interval, start=start, end=end)
+        name = f"history_{interval}"
+        # Gabungkan dengan rekaman sebelumnya agar fetch delta tidak menimpa histori panjang
+        try:
+            previous = self.store.load_frame(ticker, name)
+            merged = pd.concat([previous, hist])
+            hist_to_save = merged[~merged.index.duplicated(keep='last')].sort_index()
+        except FileNotFoundError:
+            hist_to_save = hist
+        self.store.save_frame(ticker, name, hist_to_save)
+        return hist
+
+    def info(self, ticker):
+        info = self.inner.info(ticker)
+        self.store.save_info(ticker, info)
+        return info
+
+    def statement(self, ticker, kind):
+        data = self.inner.statement(ticker, kind)
+        self.store.save_frame(ticker, kind, data)
+        return data
+
+    def dividends(self, ticker):
+        data = self.inner.dividends(ticker)
+        self.store.save_frame(ticker, "dividends", data)
+        return data
+
+    def key_statistics_page(self, ticker):
+        html = self.inner.key_statistics_page(ticker)
+        self.store.save_text(ticker, "key_statistics.html", html)
+        return html
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Memutar ulang respons rekaman dari disk tanpa jaringan
+
+    latency_ms menyuntikkan jeda tetap per panggilan untuk mensimulasikan
+    latensi upstream secara deterministik.
+    """
+    name = "replay"
+
+    def __init__(self, root, latency_ms=0):
+        self.store = RecordStore(root)
+        self.latency_ms = latency_ms
+
+    def history(self, ticker, period=None, interval="1d", start=None, end=None):
+        self._sleep()
+        hist = self.store.load_frame(ticker, f"history_{interval}")
+        if hist.empty:
+            return hist
+        naive_index = hist.index.tz_localize(None) if hist.index.tz is not None else hist.index
+        if start is not None:
+            mask = naive_index >= pd.Timestamp(start)
+            if end is not None:
+                mask &= naive_index < pd.Timestamp(end)
+        else:
+            mask = naive_index >= period_start(period or "1y")
+        return hist[mask]
+
+    def info(self, ticker):
+        self._sleep()
+        return self.store.load_info(ticker)
+
+    def statement(self, ticker, kind):
+        self._sleep()
+        return self.store.load_frame(ticker, kind)
+
+    def dividends(self, ticker):
+        self._sleep()
+        return self.store.load_frame(ticker, "dividends")
+
+    def key_statistics_page(self, ticker):
+        self._sleep()
+        return self.store.load_text(ticker, "key_statistics.html")
+
+    def _sleep(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+
+class InstrumentedProvider(MarketDataProvider):
+    """Mencatat latensi dan error setiap panggilan provider ke utils.metrics"""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.name = inner.name
+
+    def history(self, ticker, period=None, interval="1d", start=None, end=None):
+        return self._call("history", self.inner.history, ticker, period=period, interval=interval, start=start, end=end)
+
+    def info(self, ticker):
+        return self._call("info", self.inner.info, ticker)
+
+    def statement(self, ticker, kind):
+        return self._call(kind, self.inner.statement, ticker, kind)
+
+    def dividends(self, ticker):
+        return self._call("dividends", self.inner.dividends, ticker)
+
+    def key_statistics_page(self, ticker):
+        return self._call("key_statistics", self.inner.key_statistics_page, ticker)
+
+    def _call(self, endpoint, method, *args, **kwargs):
+        try:
+            with metrics.UPSTREAM_LATENCY.time(provider=self.name, endpoint=endpoint):
+                return method(*args, **kwargs)
+        except Exception as e:
+            metrics.record_error("provider", e)
+            raise
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def create_provider(name=None):
+    """Buat provider sesuai Config.DATA_PROVIDER"""
+    name = (name or Config.DATA_PROVIDER).lower()
+    if name == "yfinance":
+        return YFinanceProvider()
+    if name == "record":
+        return RecordingProvider(YFinanceProvider(), Config.REPLAY_DIR)
+    if name == "replay":
+        return ReplayProvider(Config.REPLAY_DIR, Config.REPLAY_LATENCY_MS)
+    raise ValueError(f"Provider data tidak dikenal: {name}")
+
+
+def get_provider():
+    """Provider bersama untuk seluruh proses"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = InstrumentedProvider(create_provider())
+    return _provider
+
+
+def set_provider(provider):
+    """Ganti provider aktif (mis. ReplayProvider untuk benchmark)"""
+    global _provider
+    if not isinstance(provider, InstrumentedProvider):
+        provider = InstrumentedProvider(provider)
+    with _provider_lock:
+        _provider = provider
@@ -0,0 +1,44 @@
+# utils/resample.py
+
+# Interval yang bisa diturunkan dari bar harian; label mengikuti yfinance (awal periode)
+DAILY_INTERVAL_RULES = {
+    '1d': None,
+    '1wk': 'W-MON',
+    '1mo': 'MS',
+    '3mo': 'QS',
+}
+
+INTRADAY_INTERVALS = ('1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h')
+
+OHLCV_AGGREGATION = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+    'Dividends': 'sum',
+    'Stock Splits': 'max',
+}
+
+
+def resample_ohlcv(df, interval):
+    """
+    Turunkan bar OHLCV yang lebih kasar dari bar harian
+
+    Args:
+        df: DataFrame OHLCV harian dengan DatetimeIndex
+        interval: '1d', '1wk', '1mo' atau '3mo'
+    """
+    if interval not in DAILY_INTERVAL_RULES:
+        raise ValueError(f"Interval tidak bisa diturunkan dari data harian: {interval}")
+    rule = DAILY_INTERVAL_RULES[interval]
+    if rule is None or df.empty:
+        return df
+
+    aggregation = {col: how for col, how in OHLCV_AGGREGATION.items() if col in df.columns}
+    if rule.startswith('W-'):
+        resampled = df.resample(rule, label='left', closed='left').agg(aggregation)
+    else:
+        resampled = df.resample(rule).agg(aggregation)
+    # Periode tanpa transaksi (mis. libur panjang) dibuang
+    return resampled.dropna(subset=['Close'])
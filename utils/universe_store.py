@@ -0,0 +1,212 @@
+# utils/universe_store.py
+"""
+Store OHLCV harian seluruh saham IDX dalam satu database SQLite
+
+Tabel daily_bars dikelompokkan per ticker (primary key (ticker, date) tanpa
+rowid) dan punya index (date, ticker), sehingga query rentang per saham
+maupun cross-section per tanggal cukup membaca halaman yang relevan saja.
+Tanggal disimpan sebagai jumlah hari sejak epoch agar perbandingan murah.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from config import Config
+
+COLUMNS = {
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_bars (
+    ticker TEXT NOT NULL,
+    date INTEGER NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    PRIMARY KEY (ticker, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_daily_bars_date ON daily_bars (date, ticker);
+"""
+
+
+def _to_days(dates):
+    values = pd.DatetimeIndex(pd.to_datetime(dates)).tz_localize(None)
+    return values.values.astype('datetime64[D]').astype(np.int64)
+
+
+def _from_days(days):
+    return pd.DatetimeIndex(np.asarray(days, dtype=np.int64).astype('datetime64[D]'))
+
+
+def _day(date):
+    return int(_to_days([date])[0])
+
+
+class UniverseStore:
+    """Akses baca/tulis ke store harga gabungan"""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(Config.CACHE_DIR, Config.UNIVERSE_STORE_FILE)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @classmethod
+    def shared(cls):
+        """Instance bersama untuk seluruh proses"""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def upsert(self, ticker, df):
+        """Simpan/timpa bar harian satu ticker"""
+        if df is None or df.empty:
+            return 0
+        prices = [
+            df[col].to_numpy(dtype=float).tolist() if col in df.columns else [None] * len(df)
+            for col in ['Open', 'High', 'Low', 'Close']
+        ]
+        volume = df['Volume'].fillna(0).to_numpy(dtype=np.int64).tolist() if 'Volume' in df.columns else [0] * len(df)
+        # SQLite menyimpan NaN sebagai NULL
+        rows = zip([ticker] * len(df), _to_days(df.index).tolist(), *prices, volume)
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO daily_bars (ticker, date, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(df)
+
+    def tickers(self):
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT ticker FROM daily_bars ORDER BY ticker")]
+
+    def latest_bars(self):
+        """
+        Ringkasan per ticker untuk mendeteksi perubahan data
+
+        Returns:
+            DataFrame: date (bar terakhir), close (pada bar itu) dan bars
+                (jumlah bar), diindeks ticker
+        """
+        # Kolom close ikut baris MAX(date) (perilaku agregat MAX SQLite)
+        df = self._query(
+            "SELECT ticker, MAX(date) AS date, close, COUNT(*) AS bars FROM daily_bars GROUP BY ticker",
+            []
+        )
+        df['date'] = _from_days(df['date'])
+        return df.set_index('ticker')
+
+    def read_ticker(self, ticker, start=None, end=None):
+        """Histori OHLCV satu ticker pada rentang [start, end]"""
+        sql = "SELECT date, open, high, low, close, volume FROM daily_bars WHERE ticker = ?"
+        params = [ticker]
+        sql, params = self._add_range(sql, params, start, end)
+        df = self._query(sql + " ORDER BY date", params)
+        df.index = _from_days(df.pop('date'))
+        df.index.name = 'Date'
+        return df.rename(columns={v: k for k, v in COLUMNS.items()})
+
+    def read_tickers(self, tickers=None):
+        """
+        Histori OHLCV lengkap banyak ticker dengan sedikit query
+
+        Returns:
+            Dict: ticker -> DataFrame (seperti read_ticker)
+        """
+        sql = "SELECT ticker, date, open, high, low, close, volume FROM daily_bars"
+        if tickers is None:
+            chunks = [[]]
+        else:
+            tickers = list(tickers)
+            # Batas jumlah parameter SQLite
+            chunks = [tickers[i:i + 500] for i in range(0, len(tickers), 500)]
+        frames = {}
+        for chunk in chunks:
+            where = f" WHERE ticker IN ({','.join('?' * len(chunk))})" if chunk else ""
+            df = self._query(sql + where + " ORDER BY ticker, date", chunk)
+            names = df.pop('ticker').to_numpy()
+            index = _from_days(df.pop('date'))
+            index.name = 'Date'
+            df = df.rename(columns={v: k for k, v in COLUMNS.items()})
+            bounds = np.flatnonzero(names[1:] != names[:-1]) + 1
+            for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(df)]):
+                if end > start:
+                    frame = df.iloc[start:end]
+                    frame.index = index[start:end]
+                    frames[names[start]] = frame
+        return frames
+
+    def read_window(self, start=None, end=None, tickers=None, field='Close'):
+        """
+        Panel satu kolom (tanggal x ticker) untuk rentang tanggal
+
+        Args:
+            start, end: Batas tanggal (inklusif)
+            tickers: Daftar ticker, None untuk seluruh universe
+            field: Kolom OHLCV yang diambil
+        """
+        column = COLUMNS[field]
+        sql = f"SELECT date, ticker, {column} AS value FROM daily_bars WHERE 1 = 1"
+        params = []
+        sql, params = self._add_range(sql, params, start, end)
+        if tickers:
+            sql += f" AND ticker IN ({','.join('?' * len(tickers))})"
+            params.extend(tickers)
+        long = self._query(sql, params)
+        panel = long.pivot(index='date', columns='ticker', values='value').sort_index()
+        panel.index = _from_days(panel.index)
+        panel.index.name = 'Date'
+        panel.columns.name = None
+        return panel
+
+    def cross_section(self, date):
+        """OHLCV seluruh ticker pada satu tanggal, diindeks ticker"""
+        df = self._query(
+            "SELECT ticker, open, high, low, close, volume FROM daily_bars WHERE date = ? ORDER BY ticker",
+            [_day(date)]
+        )
+        return df.set_index('ticker').rename(columns={v: k for k, v in COLUMNS.items()})
+
+    def _add_range(self, sql, params, start, end):
+        if start is not None:
+            sql += " AND date >= ?"
+            params.append(_day(start))
+        if end is not None:
+            sql += " AND date <= ?"
+            params.append(_day(end))
+        return sql, params
+
+    def _query(self, sql, params):
+        with self._connect() as conn:
+            cursor = conn.execute(sql, params)
+            columns = [d[0] for d in cursor.description]
+            return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    @contextmanager
+    def _connect(self):
+        """Koneksi per thread (dipakai ulang) dengan commit/rollback otomatis"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=Config.CACHE_LOCK_TIMEOUT_SECONDS)
+            # Dengan WAL, NORMAL tetap aman dari korupsi dan menghindari fsync per commit
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        with conn:
+            yield conn
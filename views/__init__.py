@@ -1,18 +1,62 @@
 # views/__init__.py
-from .dashboard_view import show_dashboard
-from .fundamental_view import show_fundamental_analysis
-from .technical_view import show_technical_analysis
-from .prediction_view import show_price_prediction
-from .portfolio_view import portfolio_simulation
-from .comparison_view import compare_stocks
-from .news_sentiment import get_news_sentiment
-
-__all__ = [
-    'show_dashboard',
-    'show_fundamental_analysis',
-    'show_technical_analysis',
-    'show_price_prediction',
-    'portfolio_simulation',
-    'compare_stocks',
-    'get_news_sentiment'
-]
+"""
+Registry view yang dimuat secara lazy
+
+Setiap view baru diimpor saat pertama kali dipakai, sehingga dependensi berat
+(Prophet/cmdstanpy, statsmodels, TextBlob) tidak ikut dimuat
+pada cold start untuk halaman yang tidak membutuhkannya.
+"""
+from importlib import import_module
+from config import Config
+
+# Nama fungsi -> modul yang mendefinisikannya
+_EXPORTS = {
+    'show_dashboard': 'dashboard_view',
+    'show_fundamental_analysis': 'fundamental_view',
+    'show_technical_analysis': 'technical_view',
+    'show_price_prediction': 'prediction_view',
+    'portfolio_simulation': 'portfolio_view',
+    'compare_stocks': 'comparison_view',
+    'get_news_sentiment': 'news_sentiment',
+    'show_admin_metrics': 'admin_view',
+    'show_screener': 'screener_view',
+}
+
+# Menu sidebar -> fungsi view (urutan = urutan menu)
+VIEW_REGISTRY = {
+    "Dashboard Utama": 'show_dashboard',
+    "Analisis Fundamental": 'show_fundamental_analysis',
+    "Analisis Teknikal": 'show_technical_analysis',
+    "Prediksi Harga": 'show_price_prediction',
+    "Simulasi Portofolio": 'portfolio_simulation',
+    "Perbandingan Saham": 'compare_stocks',
+    "Screener Teknikal": 'show_screener',
+}
+
+# Halaman tanpa ticker, hanya tampil bila diaktifkan
+ADMIN_VIEW = "Admin: Metrik"
+if Config.ADMIN_PAGE_ENABLED:
+    VIEW_REGISTRY[ADMIN_VIEW] = 'show_admin_metrics'
+
+# Halaman yang dipanggil tanpa argumen ticker
+TICKERLESS_VIEWS = {"Screener Teknikal", ADMIN_VIEW}
+
+
+def get_view(name):
+    """Fungsi view untuk nama menu atau nama fungsi; modulnya diimpor saat ini juga"""
+    attr = VIEW_REGISTRY.get(name, name)
+    if attr not in _EXPORTS:
+        raise KeyError(f"View tidak dikenal: {name}")
+    module = import_module(f".{_EXPORTS[attr]}", __name__)
+    return getattr(module, attr)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        view = get_view(name)
+        globals()[name] = view
+        return view
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = list(_EXPORTS) + ['VIEW_REGISTRY', 'ADMIN_VIEW', 'TICKERLESS_VIEWS', 'get_view']
@@ -0,0 +1,80 @@
+# views/admin_view.py
+import streamlit as st
+import pandas as pd
+from utils import metrics
+from utils.data_fetcher import _price_cache
+from utils.fundamentals_cache import _fundamentals_cache
+from services.analysis_services import _derived_cache
+from views.figure_cache import _figure_cache
+from models.model_cache import _memory as _model_cache
+
+
+def _cache_table():
+    """Hit ratio per lapisan cache dari counter stock_cache_requests_total"""
+    rows = {}
+    for labels, value in metrics.CACHE_REQUESTS.items():
+        rows.setdefault(labels['cache'], {})[labels['result']] = value
+    stale = {labels['cache']: value for labels, value in metrics.STALE_SERVES.items()}
+    table = pd.DataFrame.from_dict(rows, orient='index').fillna(0).astype(int)
+    for col in ['hit', 'miss', 'expired', 'coalesced']:
+        if col not in table.columns:
+            table[col] = 0
+    table['stale'] = [stale.get(cache, 0) for cache in table.index]
+    total = table[['hit', 'miss', 'expired', 'coalesced']].sum(axis=1)
+    table['hit ratio'] = (table['hit'] + table['coalesced']) / total.where(total > 0)
+    return table.sort_index()
+
+
+def show_admin_metrics():
+    """Halaman admin: metrik cache, latensi upstream dan error per proses"""
+    st.subheader("🛠️ Metrik Lapisan Data")
+    st.caption("Metrik dihitung per proses Streamlit sejak proses dimulai")
+
+    if st.button("Reset metrik"):
+        metrics.REGISTRY.reset()
+
+    st.markdown("**Cache**")
+    cache_table = _cache_table()
+    if cache_table.empty:
+        st.info("Belum ada lookup cache")
+    else:
+        st.dataframe(cache_table.style.format({'hit ratio': '{:.1%}'}), use_container_width=True)
+
+    caches = [("Harga", _price_cache), ("Fundamental", _fundamentals_cache), ("Indikator", _derived_cache), ("Figure", _figure_cache), ("Model", _model_cache)]
+    for col, (name, cache) in zip(st.columns(len(caches)), caches):
+        stats = cache.stats()
+        col.metric(
+            f"Cache memori {name}",
+            f"{stats['bytes'] / 1024 / 1024:.1f} / {stats['max_bytes'] / 1024 / 1024:.0f} MB",
+            f"{stats['entries']} entri"
+        )
+
+    st.markdown("**Latensi Upstream**")
+    latency = [
+        {**labels, 'request': summary['count'], 'rata-rata (ms)': summary['sum'] / summary['count'] * 1000,
+         'p50 ≤ (s)': summary['p50'], 'p95 ≤ (s)': summary['p95']}
+        for labels, summary in metrics.UPSTREAM_LATENCY.items() if summary['count']
+    ]
+    if latency:
+        st.dataframe(pd.DataFrame(latency).sort_values('request', ascending=False), use_container_width=True)
+    else:
+        st.info("Belum ada request ke sumber data")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Byte Cache Disk**")
+        io = [{**labels, 'MB': value / 1024 / 1024} for labels, value in metrics.CACHE_BYTES.items()]
+        if io:
+            st.dataframe(pd.DataFrame(io), use_container_width=True)
+    with col2:
+        st.markdown("**Error**")
+        errors = [{**labels, 'jumlah': value} for labels, value in metrics.ERRORS.items()]
+        if errors:
+            st.dataframe(pd.DataFrame(errors), use_container_width=True)
+        else:
+            st.success("Tidak ada error")
+
+    exposition = metrics.REGISTRY.render()
+    with st.expander("Prometheus text format"):
+        st.code(exposition, language="text")
+    st.download_button("Unduh metrics.txt", exposition, file_name="metrics.txt", mime="text/plain")
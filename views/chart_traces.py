@@ -0,0 +1,45 @@
+# views/chart_traces.py
+import plotly.graph_objects as go
+from config import Config
+from utils.downsample import downsample_line, downsample_ohlc
+
+
+def line_trace(x, y, max_points=None, webgl=None, **kwargs):
+    """
+    Trace garis Plotly dengan downsampling LTTB di sisi server
+
+    Args:
+        x, y: Data garis (Series/array/list)
+        max_points: Anggaran titik (default Config.CHART_MAX_POINTS, 0 = tanpa downsampling)
+        webgl: Paksa Scattergl (True) atau SVG (False); default otomatis bila
+            jumlah titik > Config.CHART_WEBGL_THRESHOLD
+        **kwargs: Atribut trace lain (name, line, fill, ...)
+    """
+    max_points = Config.CHART_MAX_POINTS if max_points is None else max_points
+    if max_points:
+        x, y = downsample_line(x, y, max_points)
+    if webgl is None:
+        webgl = len(y) > Config.CHART_WEBGL_THRESHOLD
+    return (go.Scattergl if webgl else go.Scatter)(x=x, y=y, **kwargs)
+
+
+def candlestick_trace(data, max_bars=None, **kwargs):
+    """
+    Trace candlestick dengan bar digabung bila melebihi anggaran
+
+    Args:
+        data: DataFrame dengan kolom Open, High, Low, Close
+        max_bars: Anggaran bar (default Config.CHART_MAX_CANDLES, 0 = tanpa penggabungan)
+    """
+    max_bars = Config.CHART_MAX_CANDLES if max_bars is None else max_bars
+    bars = data[['Open', 'High', 'Low', 'Close']]
+    if max_bars:
+        bars = downsample_ohlc(bars, max_bars)
+    return go.Candlestick(
+        x=bars.index,
+        open=bars['Open'],
+        high=bars['High'],
+        low=bars['Low'],
+        close=bars['Close'],
+        **kwargs
+    )
@@ -4,6 +4,8 @@ import numpy as np
 import plotly.graph_objects as go
 from utils.data_fetcher import DataFetcher
 from utils.validator import StockValidator
+from views.chart_traces import line_trace
+from views.figure_cache import cached_figure
 
 def compare_stocks(tickers):
     try:
@@ -32,13 +34,10 @@ def compare_stocks(tickers):
             return
             
         # Ambil data untuk semua ticker
-        data = {}
-        for ticker in valid_tickers:
-            df = DataFetcher.get_stock_data(ticker)
-            if not df.empty:
-                data[ticker] = df['Close']
-            else:
-                st.warning(f"Data untuk {ticker} tidak tersedia")
+        frames, errors = DataFetcher.get_many(valid_tickers)
+        data = {ticker: df['Close'] for ticker, df in frames.items()}
+        for ticker, error in errors.items():
+            st.warning(f"Data untuk {ticker} tidak tersedia ({error})")
         
         if len(data) < 2:
             st.error("Tidak cukup data saham yang valid untuk perbandingan")
@@ -54,33 +53,38 @@ def compare_stocks(tickers):
         
         # Plot perbandingan
         st.subheader("📈 Perbandingan Kinerja")
-        fig = go.Figure()
-        
-        colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']  # Warna berbeda
-        
-        for i, ticker in enumerate(comparison_df.columns):
-            fig.add_trace(go.Scatter(
-                x=comparison_df.index,
-                y=comparison_df[ticker],
-                name=ticker,
-                mode='lines',
-                line=dict(color=colors[i % len(colors)], width=2),
-                hovertemplate=f"{ticker}: %{{y:.2f}}%"
-            ))
-        
-        fig.update_layout(
-            title="Perbandingan Kinerja Saham (Normalisasi 100 pada awal periode)",
-            xaxis_title="Tanggal",
-            yaxis_title="Kinerja (%)",
-            hovermode="x unified",
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
+        def build_performance():
+            fig = go.Figure()
+        
+            colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']  # Warna berbeda
+        
+            for i, ticker in enumerate(comparison_df.columns):
+                fig.add_trace(line_trace(
+                    x=comparison_df.index,
+                    y=comparison_df[ticker],
+                    name=ticker,
+                    mode='lines',
+                    line=dict(color=colors[i % len(colors)], width=2),
+                    hovertemplate=f"{ticker}: %{{y:.2f}}%"
+                ))
+        
+            fig.update_layout(
+                title="Perbandingan Kinerja Saham (Normalisasi 100 pada awal periode)",
+                xaxis_title="Tanggal",
+                yaxis_title="Kinerja (%)",
+                hovermode="x unified",
+                legend=dict(
+                    orientation="h",
+                    yanchor="bottom",
+                    y=1.02,
+                    xanchor="right",
+                    x=1
+                )
             )
-        )
+            return fig
+        
+        # Figure dipakai ulang selama data tidak berubah (lihat views.figure_cache)
+        fig = cached_figure('comparison_performance', tuple(comparison_df.columns), comparison_df, None, build_performance)
         st.plotly_chart(fig, use_container_width=True)
         
         # Analisis performa relatif
@@ -115,22 +119,26 @@ def compare_stocks(tickers):
         returns_df = comparison_df.pct_change().dropna()
         correlation_matrix = returns_df.corr()
         
-        fig2 = go.Figure(data=go.Heatmap(
-            z=correlation_matrix,
-            x=correlation_matrix.columns,
-            y=correlation_matrix.columns,
-            colorscale='RdBu',
-            zmin=-1,
-            zmax=1,
-            hoverongaps=False,
-            text=correlation_matrix.round(2),
-            texttemplate="%{text}"
-        ))
-        fig2.update_layout(
-            title="Korelasi Return Harian",
-            xaxis_title="Saham",
-            yaxis_title="Saham"
-        )
+        def build_correlation():
+            fig2 = go.Figure(data=go.Heatmap(
+                z=correlation_matrix,
+                x=correlation_matrix.columns,
+                y=correlation_matrix.columns,
+                colorscale='RdBu',
+                zmin=-1,
+                zmax=1,
+                hoverongaps=False,
+                text=correlation_matrix.round(2),
+                texttemplate="%{text}"
+            ))
+            fig2.update_layout(
+                title="Korelasi Return Harian",
+                xaxis_title="Saham",
+                yaxis_title="Saham"
+            )
+            return fig2
+        
+        fig2 = cached_figure('comparison_correlation', tuple(correlation_matrix.columns), correlation_matrix, None, build_correlation)
         st.plotly_chart(fig2, use_container_width=True)
         
         st.caption(f"Periode analisis: {start_date} hingga {end_date}")
@@ -1,10 +1,28 @@
 # views/dashboard_view.py
 import streamlit as st
-from plotly.graph_objects import Figure, Scatter
+from plotly.graph_objects import Figure
 from utils.data_fetcher import DataFetcher
 from utils.formatter import format_rupiah
-from views.fundamental_view import show_fundamental_analysis
-from views.news_sentiment import get_news_sentiment
+from views.chart_traces import line_trace
+from views.figure_cache import cached_figure
+from views.intraday_chart import show_intraday_chart
+
+def _price_figure(data, ticker):
+    """Grafik harga penutupan"""
+    fig = Figure()
+    fig.add_trace(line_trace(
+        x=data.index, 
+        y=data['Close'], 
+        name='Harga Penutupan',
+        line=dict(color='#1f77b4')
+    ))
+    fig.update_layout(
+        title=f"Performa Saham {ticker}",
+        xaxis_title="Tanggal",
+        yaxis_title="Harga (Rp)",
+        hovermode="x unified"
+    )
+    return fig
 
 def show_dashboard(ticker):
     """Menampilkan dashboard utama untuk satu saham"""
@@ -24,22 +42,13 @@ def show_dashboard(ticker):
         st.warning("Data historis tidak cukup")
         return
 
-    # Visualisasi Plotly
-    fig = Figure()
-    fig.add_trace(Scatter(
-        x=data.index, 
-        y=data['Close'], 
-        name='Harga Penutupan',
-        line=dict(color='#1f77b4')
-    ))
-    fig.update_layout(
-        title=f"Performa Saham {ticker}",
-        xaxis_title="Tanggal",
-        yaxis_title="Harga (Rp)",
-        hovermode="x unified"
-    )
+    # Visualisasi Plotly; figure dipakai ulang selama data tidak berubah
+    fig = cached_figure('dashboard_price', ticker, data, None, lambda: _price_figure(data, ticker), columns=['Close'])
     st.plotly_chart(fig, use_container_width=True)
     
+    if st.toggle("Mode Intraday (1 menit)", key="dashboard_intraday"):
+        show_intraday_chart(ticker, key="dashboard")
+    
     # Statistik utama
     col1, col2, col3 = st.columns(3)
     last_close = data['Close'].iloc[-1]
@@ -60,6 +69,8 @@ def show_dashboard(ticker):
         vol = int(data['Volume'].iloc[-1]/1000)
         st.metric("Volume", f"{vol:,}K".replace(",", "."))
     
-    # Komponen tambahan
+    # Komponen tambahan; diimpor setelah chart tampil karena memuat TextBlob
+    from views.fundamental_view import show_fundamental_analysis
+    from views.news_sentiment import get_news_sentiment
     show_fundamental_analysis(ticker)
     get_news_sentiment(ticker)
@@ -0,0 +1,55 @@
+# views/figure_cache.py
+"""
+Cache figure Plotly per (view, ticker, fingerprint data, parameter)
+
+Membangun figure (downsampling, validasi trace Plotly) jauh lebih mahal
+daripada mengirim figure yang sudah jadi: rerun Streamlit dengan data yang
+sama cukup memakai ulang objek figure dari cache. Figure disimpan sebagai
+objek go.Figure karena spec dict akan divalidasi ulang oleh st.plotly_chart
+pada setiap rerun; ukurannya dihitung dari spec JSON-nya.
+
+Figure dari cache dibagi semua sesi dalam satu proses, jadi tidak boleh
+diubah setelah dibangun (update_layout dsb. dilakukan di dalam fungsi build).
+"""
+import pandas as pd
+from config import Config
+from services.analysis_services import frame_fingerprint
+from utils.memory_cache import LRUCache
+
+
+def _figure_size(fig):
+    return len(fig.to_json(validate=False))
+
+
+_figure_cache = LRUCache(
+    max_bytes=Config.FIGURE_CACHE_MAX_MB * 1024 * 1024,
+    sizeof=_figure_size,
+    name="figure_memory"
+)
+
+
+def data_fingerprint(data, columns=None):
+    """Fingerprint DataFrame/Series (atau tuple keduanya) untuk key cache figure"""
+    if data is None:
+        return None
+    if isinstance(data, tuple):
+        return tuple(data_fingerprint(item, columns) for item in data)
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    return frame_fingerprint(data, columns)
+
+
+def cached_figure(view, ticker, data, params, build, columns=None):
+    """
+    Figure dari cache atau hasil build() bila belum ada
+
+    Args:
+        view: Nama view/chart, mis. 'technical_rsi'
+        ticker: Ticker (atau tuple ticker) yang ditampilkan
+        data: DataFrame/Series (atau tuple) yang menjadi input figure
+        params: Parameter hashable lain yang memengaruhi figure
+        build: Fungsi tanpa argumen yang mengembalikan go.Figure
+        columns: Kolom data yang dipakai (default semua)
+    """
+    key = (view, ticker, data_fingerprint(data, columns), params)
+    return _figure_cache.get_or_load(key, build)
@@ -1,16 +1,38 @@
 import streamlit as st
-import yfinance as yf
-import matplotlib.pyplot as plt
+import plotly.graph_objects as go
 from utils.formatter import format_rupiah
 from utils.validator import StockValidator
+from utils.fundamentals_cache import FundamentalsCache
+from views.figure_cache import cached_figure
+
+def _period_label(period):
+    return period.strftime('%Y-%m-%d') if hasattr(period, 'strftime') else str(period)
+
+def show_statement_chart(ticker, kind, statement, rows, title):
+    """Bar chart berkelompok pos laporan keuangan per periode (figure di-cache)"""
+    selected = statement.loc[rows]
+
+    def build():
+        fig = go.Figure()
+        periods = [_period_label(p) for p in selected.columns]
+        for row in rows:
+            fig.add_trace(go.Bar(x=periods, y=selected.loc[row].to_numpy(dtype=float), name=row))
+        fig.update_layout(
+            title=title,
+            barmode='group',
+            xaxis_title="Periode",
+            yaxis_title="Nilai (Rp)",
+            height=400
+        )
+        return fig
+
+    st.plotly_chart(cached_figure('fundamental', ticker, selected, kind, build), use_container_width=True)
 
 def show_fundamental_analysis(ticker):
     try:
-        # 1. JANGAN gunakan custom session - biarkan yfinance mengatur sesinya sendiri
-        stock = yf.Ticker(ticker)
-        
+        # 1. Info dan laporan keuangan diambil dari cache bersama (sekali per TTL)
         # 2. Cek ketersediaan data dengan timeout yang lebih baik
-        info = stock.info
+        info = FundamentalsCache.get_info(ticker)
         if not info:
             st.error("Data tidak tersedia untuk saham ini")
             return
@@ -48,14 +70,12 @@ def show_fundamental_analysis(ticker):
         
         with tab1:
             try:
-                financials = stock.financials
+                financials = FundamentalsCache.get_statement(ticker, 'financials')
                 if not financials.empty:
                     available_cols = [col for col in ['Total Revenue', 'Net Income'] 
                                     if col in financials.index]
                     if available_cols:
-                        fig, ax = plt.subplots(figsize=(10, 4))
-                        financials.loc[available_cols].T.plot(kind='bar', ax=ax)
-                        st.pyplot(fig)
+                        show_statement_chart(ticker, 'financials', financials, available_cols, "Income Statement")
                     else:
                         st.warning("Kolom income statement tidak tersedia")
             except Exception as e:
@@ -63,14 +83,12 @@ def show_fundamental_analysis(ticker):
         
         with tab2:
             try:
-                balance_sheet = stock.balance_sheet
+                balance_sheet = FundamentalsCache.get_statement(ticker, 'balance_sheet')
                 if not balance_sheet.empty:
                     available_cols = [col for col in ['Total Assets', 'Total Liab', 'Total Stockholder Equity'] 
                                     if col in balance_sheet.index]
                     if available_cols:
-                        fig, ax = plt.subplots(figsize=(10, 4))
-                        balance_sheet.loc[available_cols].T.plot(kind='bar', ax=ax)
-                        st.pyplot(fig)
+                        show_statement_chart(ticker, 'balance_sheet', balance_sheet, available_cols, "Balance Sheet")
                     else:
                         st.warning("Kolom balance sheet tidak tersedia")
                         st.info(f"Kolom yang ada: {balance_sheet.index.tolist()}")
@@ -79,14 +97,12 @@ def show_fundamental_analysis(ticker):
         
         with tab3:
             try:
-                cashflow = stock.cashflow
+                cashflow = FundamentalsCache.get_statement(ticker, 'cashflow')
                 if not cashflow.empty:
                     available_cols = [col for col in ['Operating Cashflow', 'Investing Cashflow', 'Financing Cashflow'] 
                                     if col in cashflow.index]
                     if available_cols:
-                        fig, ax = plt.subplots(figsize=(10, 4))
-                        cashflow.loc[available_cols].T.plot(kind='bar', ax=ax)
-                        st.pyplot(fig)
+                        show_statement_chart(ticker, 'cashflow', cashflow, available_cols, "Cash Flow")
                     else:
                         st.warning("Kolom cash flow tidak tersedia")
             except Exception as e:
@@ -0,0 +1,97 @@
+# views/intraday_chart.py
+import streamlit as st
+import plotly.graph_objects as go
+from config import Config
+from utils import intraday
+from views.chart_traces import line_trace
+
+
+def _build_figure(bars, ticker, candles):
+    fig = go.Figure()
+    if candles:
+        fig.add_trace(go.Candlestick(
+            x=list(bars.index),
+            open=list(bars['Open']),
+            high=list(bars['High']),
+            low=list(bars['Low']),
+            close=list(bars['Close']),
+            name='Harga'
+        ))
+    else:
+        # Tanpa downsampling: bar baru ditambahkan langsung ke trace (_append_tail);
+        # jenis trace mengikuti kapasitas buffer agar tidak berganti saat buffer terisi
+        fig.add_trace(line_trace(
+            list(bars.index),
+            list(bars['Close']),
+            max_points=0,
+            webgl=Config.INTRADAY_BUFFER_BARS > Config.CHART_WEBGL_THRESHOLD,
+            name='Harga',
+            line=dict(color='#1f77b4')
+        ))
+    fig.update_layout(
+        title=f"{ticker} - Intraday",
+        xaxis_title="Waktu",
+        yaxis_title="Harga (Rp)",
+        xaxis_rangeslider_visible=False,
+        hovermode="x unified"
+    )
+    return fig
+
+
+def _append_tail(fig, bars, last_ts, candles, max_points):
+    """Perbarui bar terakhir yang direvisi lalu tambahkan bar baru ke trace yang ada"""
+    trace = fig.data[0]
+    columns = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close'} if candles else {'y': 'Close'}
+    x = list(trace.x)
+    series = {attr: list(getattr(trace, attr)) for attr in columns}
+
+    if x and last_ts is not None and len(bars) and bars.index[0] == last_ts:
+        for attr, col in columns.items():
+            series[attr][-1] = bars[col].iloc[0]
+        bars = bars.iloc[1:]
+
+    x.extend(bars.index)
+    for attr, col in columns.items():
+        series[attr].extend(bars[col])
+
+    # Jendela chart mengikuti kapasitas ring buffer
+    x = x[-max_points:]
+    with fig.batch_update():
+        trace.x = x
+        for attr in columns:
+            setattr(trace, attr, series[attr][-max_points:])
+
+
+def show_intraday_chart(ticker, key, interval="1m", candles=False):
+    """
+    Chart intraday yang menyegarkan diri setiap Config.INTRADAY_POLL_SECONDS
+
+    Hanya fragment ini yang dijalankan ulang; setiap refresh hanya membaca
+    bar baru dari ring buffer dan menambahkannya ke figure yang tersimpan
+    di session state.
+    """
+    state_key = f"intraday_{key}_{ticker}_{interval}"
+
+    @st.fragment(run_every=Config.INTRADAY_POLL_SECONDS)
+    def _live_chart():
+        feed = intraday.get_feed(ticker, interval)
+        new_bars = feed.poll()
+        feed_state = st.session_state.get(state_key)
+
+        if feed_state is None:
+            bars = feed.frame()
+            if bars.empty:
+                st.info("Belum ada bar intraday (di luar jam bursa atau data belum tersedia)")
+                return
+            fig = _build_figure(bars, ticker, candles)
+            feed_state = st.session_state[state_key] = {'fig': fig, 'last_ts': bars.index[-1]}
+        else:
+            tail = feed.buffer.since(feed_state['last_ts'])
+            if len(tail):
+                _append_tail(feed_state['fig'], tail, feed_state['last_ts'], candles, feed.buffer.capacity)
+                feed_state['last_ts'] = tail.index[-1]
+
+        st.plotly_chart(feed_state['fig'], use_container_width=True)
+        st.caption(f"Bar terakhir: {feed_state['last_ts']:%H:%M} · {new_bars} bar baru pada refresh ini")
+
+    _live_chart()
@@ -1,8 +1,8 @@
 import streamlit as st
 import numpy as np
 from textblob import TextBlob
-import yfinance as yf
 from utils.formatter import format_rupiah
+from utils.fundamentals_cache import FundamentalsCache
 
 def get_news_sentiment(ticker):
     """Menampilkan analisis sentimen berita"""
@@ -10,9 +10,9 @@ def get_news_sentiment(ticker):
         st.subheader("📰 Analisis Sentimen Berita")
         
         # Dapatkan info perusahaan
-        stock = yf.Ticker(ticker)
-        company_name = stock.info.get('shortName', ticker.split('.')[0])
-        current_price = stock.info.get('currentPrice', 0)
+        info = FundamentalsCache.get_info(ticker)
+        company_name = info.get('shortName', ticker.split('.')[0])
+        current_price = info.get('currentPrice', 0)
         
         # Header dengan info singkat
         col1, col2 = st.columns([3, 1])
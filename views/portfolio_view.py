@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 from utils.data_fetcher import DataFetcher
 from utils.formatter import format_rupiah
 from utils.validator import StockValidator
+from views.chart_traces import line_trace
+from views.figure_cache import cached_figure
 
 def portfolio_simulation(ticker):
     """Menampilkan simulasi portofolio investasi"""
@@ -82,32 +84,36 @@ def portfolio_simulation(ticker):
         
         # Grafik kinerja
         st.subheader("📈 Kinerja Portofolio")
-        fig = go.Figure()
-        
-        # PERBAIKAN UTAMA: Format yang benar untuk add_trace
-        fig.add_trace(
-            go.Scatter(
-                x=data.index,
-                y=data['Close'] / start_price * initial_investment,
-                name='Nilai Portofolio',
-                line=dict(color='green')
+        def build_value():
+            fig = go.Figure()
+        
+            # PERBAIKAN UTAMA: Format yang benar untuk add_trace
+            fig.add_trace(
+                line_trace(
+                    x=data.index,
+                    y=data['Close'] / start_price * initial_investment,
+                    name='Nilai Portofolio',
+                    line=dict(color='green')
+                )
+            )  # Semua tanda kurung sekarang tertutup dengan benar
+        
+            # Garis vertikal untuk tanggal investasi
+            fig.update_xaxes(type='date')
+            fig.add_vline(
+                x=investment_date,
+                line_dash="dash",
+                line_color="red"
             )
-        )  # Semua tanda kurung sekarang tertutup dengan benar
-        
-        # Garis vertikal untuk tanggal investasi
-        fig.update_xaxes(type='date')
-        fig.add_vline(
-            x=investment_date,
-            line_dash="dash",
-            line_color="red"
-        )
         
-        fig.update_layout(
-            title="Perkembangan Nilai Portofolio",
-            xaxis_title="Tanggal",
-            yaxis_title="Nilai (Rp)",
-            hovermode="x unified"
-        )
+            fig.update_layout(
+                title="Perkembangan Nilai Portofolio",
+                xaxis_title="Tanggal",
+                yaxis_title="Nilai (Rp)",
+                hovermode="x unified"
+            )
+            return fig
+        
+        fig = cached_figure('portfolio_value', ticker, data['Close'], (initial_investment, investment_date), build_value)
         st.plotly_chart(fig, use_container_width=True)
         
         # Analisis tambahan
@@ -129,22 +135,26 @@ def portfolio_simulation(ticker):
             st.metric("Volatilitas Tahunan", f"{annualized_volatility:.2f}%")
         
         # Grafik drawdown
-        fig2 = go.Figure()
-        fig2.add_trace(
-            go.Scatter(
-                x=data.index,
-                y=drawdown,
-                name='Drawdown',
-                fill='tozeroy',
-                fillcolor='rgba(255,0,0,0.2)',
-                line=dict(color='red')
+        def build_drawdown():
+            fig2 = go.Figure()
+            fig2.add_trace(
+                line_trace(
+                    x=data.index,
+                    y=drawdown,
+                    name='Drawdown',
+                    fill='tozeroy',
+                    fillcolor='rgba(255,0,0,0.2)',
+                    line=dict(color='red')
+                )
             )
-        )
         
-        fig2.update_layout(
-            title="Drawdown Portofolio",
-            xaxis_title="Tanggal",
-            yaxis_title="Drawdown (%)",
-            yaxis_tickformat=".2f%"
-        )
+            fig2.update_layout(
+                title="Drawdown Portofolio",
+                xaxis_title="Tanggal",
+                yaxis_title="Drawdown (%)",
+                yaxis_tickformat=".2f%"
+            )
+            return fig2
+        
+        fig2 = cached_figure('portfolio_drawdown', ticker, drawdown, None, build_drawdown)
         st.plotly_chart(fig2, use_container_width=True)
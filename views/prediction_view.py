@@ -1,10 +1,13 @@
+from datetime import datetime
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from models.prophet_model import ProphetModel
-from models.arima_model import ARIMAModel
+from config import Config
+from services.prediction_service import get_forecast
+from utils import market_hours
 from utils.data_fetcher import DataFetcher
 from utils.formatter import format_rupiah
+from views.chart_traces import line_trace
 
 def show_prophet_prediction(ticker, days):
     """Menampilkan prediksi menggunakan Prophet"""
@@ -16,40 +19,35 @@ def show_prophet_prediction(ticker, days):
         st.warning("Data tidak tersedia untuk prediksi")
         return
     
-    # Pisahkan data train-test
-    split_point = int(len(data) * 0.8)
-    train = data.iloc[:split_point]
-    test = data.iloc[split_point:]
-    
-    # Latih model
-    prophet = ProphetModel()
-    prophet.train(train[['Close']])
-    
-    # Evaluasi
-    forecast = prophet.predict(len(test))
-    pred_test = forecast.iloc[split_point:]['yhat'].values
-    actual_test = test['Close'].values
-    metrics = prophet.evaluate(actual_test, pred_test)
+    # Hasil prakomputasi bila ada untuk data ini; selain itu model dilatih sekarang
+    result = get_forecast('prophet', ticker, data, days)
+    show_forecast_source(result)
+    metrics = result['metrics']
+    latency = result['details']['latency']
+    backtest = result['backtest']
+    future_forecast = result['forecast'].iloc[:days]
     
     # Tampilkan metrik
     st.subheader("📊 Evaluasi Model Prophet")
-    cols = st.columns(4)
+    cols = st.columns(5)
     cols[0].metric("MAE", f"{metrics['MAE']:.2f}")
     cols[1].metric("MSE", f"{metrics['MSE']:.2f}")
     cols[2].metric("RMSE", f"{metrics['RMSE']:.2f}")
     cols[3].metric("MAPE", f"{metrics['MAPE']:.2f}%")
+    cols[4].metric("Latensi", f"{latency['total']:.2f} dtk")
+    show_prophet_latency(result['details'])
     
     # Plot evaluasi
     fig_eval = go.Figure()
-    fig_eval.add_trace(go.Scatter(
-        x=test.index,
-        y=actual_test,
+    fig_eval.add_trace(line_trace(
+        x=backtest.index,
+        y=backtest['actual'],
         name='Aktual',
         line=dict(color='blue')
     ))
-    fig_eval.add_trace(go.Scatter(
-        x=test.index,
-        y=pred_test,
+    fig_eval.add_trace(line_trace(
+        x=backtest.index,
+        y=backtest['prediction'],
         name='Prediksi',
         line=dict(color='red', dash='dash')
     ))
@@ -60,26 +58,23 @@ def show_prophet_prediction(ticker, days):
     )
     st.plotly_chart(fig_eval, use_container_width=True)
     
-    # Prediksi masa depan
-    future_forecast = prophet.predict(days)
-    
     # Plot prediksi
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
+    fig.add_trace(line_trace(
         x=data.index,
         y=data['Close'],
         name='Data Historis',
         line=dict(color='blue')
     ))
-    fig.add_trace(go.Scatter(
+    fig.add_trace(line_trace(
         x=future_forecast.index,
-        y=future_forecast['yhat'],
+        y=future_forecast['prediction'],
         name='Prediksi',
         line=dict(color='green', dash='dash')
     ))
     fig.add_trace(go.Scatter(
         x=future_forecast.index.tolist() + future_forecast.index.tolist()[::-1],
-        y=future_forecast['yhat_upper'].tolist() + future_forecast['yhat_lower'].tolist()[::-1],
+        y=future_forecast['upper'].tolist() + future_forecast['lower'].tolist()[::-1],
         fill='toself',
         fillcolor='rgba(0,100,80,0.2)',
         line=dict(color='rgba(255,255,255,0)'),
@@ -94,15 +89,56 @@ def show_prophet_prediction(ticker, days):
     
     # Tabel prediksi
     st.subheader("📅 Detail Prediksi")
-    pred_df = future_forecast[['yhat', 'yhat_lower', 'yhat_upper']].rename(columns={
-        'yhat': 'Prediksi',
-        'yhat_lower': 'Batas Bawah',
-        'yhat_upper': 'Batas Atas'
+    pred_df = future_forecast[['prediction', 'lower', 'upper']].rename(columns={
+        'prediction': 'Prediksi',
+        'lower': 'Batas Bawah',
+        'upper': 'Batas Atas'
     })
     pred_df.index.name = 'Tanggal'
     st.dataframe(pred_df.style.format("{:.2f}"), use_container_width=True)
 
-def show_arima_prediction(ticker, days):
+def show_forecast_source(result):
+    """Asal hasil: prakomputasi (beserta waktunya) atau dilatih saat ini"""
+    if result['source'] == 'precomputed':
+        computed_at = datetime.fromtimestamp(result['computed_at'], market_hours.WIB)
+        st.caption(f"⚡ Hasil prakomputasi {computed_at:%d-%m-%Y %H:%M} untuk data s.d. {result['data_date']:%d-%m-%Y}")
+    else:
+        st.caption("Model dilatih saat ini (belum ada hasil prakomputasi untuk data terbaru)")
+
+def show_prophet_latency(details):
+    """Rincian waktu training/prediksi Prophet dan pengaturan mode cepat"""
+    latency = details['latency']
+    mode = "cepat" if details['fast'] else "penuh"
+    if latency['uncertainty_samples']:
+        interval = f"{latency['uncertainty_samples']} sampel ketidakpastian"
+    else:
+        interval = "interval dilewati karena batas waktu"
+    budget = ""
+    if latency['budget'] is not None:
+        budget = f" · batas {latency['budget']:g} dtk" + ("" if latency['within_budget'] else " (terlampaui)")
+    st.caption(
+        f"Mode {mode}: training {latency['fit']:.2f} dtk · prediksi {latency['predict']:.2f} dtk "
+        f"({latency['rows']} baris) · {interval}{budget} · "
+        f"musiman: {', '.join(details['seasonalities']) or 'tidak ada'}"
+    )
+
+def show_arima_search_report(report):
+    """Ringkasan pencarian order ARIMA: durasi setiap fit dan order yang gagal"""
+    if not report:
+        return
+    with st.expander(f"Pencarian order ARIMA ({report['method']}): {report['best_order']}"):
+        st.caption(
+            f"{len(report['fits'])} kandidat dalam {report['elapsed']:.1f} detik, "
+            f"{len(report['failed'])} gagal"
+            + (" · dihentikan batas waktu" if report['timed_out'] else "")
+        )
+        fits = pd.DataFrame([
+            {'Order': str(fit['order']), 'AIC': fit['aic'], 'Durasi (detik)': fit['seconds'], 'Error': fit['error'] or ''}
+            for fit in report['fits']
+        ]).sort_values('AIC', na_position='last')
+        st.dataframe(fits, use_container_width=True, hide_index=True)
+
+def show_arima_prediction(ticker, days, refit_every=None):
     """Menampilkan prediksi menggunakan ARIMA"""
     st.subheader("📉 Prediksi dengan ARIMA")
     
@@ -112,17 +148,11 @@ def show_arima_prediction(ticker, days):
         st.warning("Data tidak tersedia untuk prediksi")
         return
     
-    # Pisahkan data train-test
-    split_point = int(len(data) * 0.8)
-    train = data.iloc[:split_point]
-    test = data.iloc[split_point:]
-    
-    # Latih model
-    arima = ARIMAModel()
-    arima.train(train[['Close']])
-    
-    # Evaluasi
-    metrics = arima.evaluate(test[['Close']])
+    # Hasil prakomputasi bila ada untuk data dan pengaturan ini; selain itu model dilatih sekarang
+    result = get_forecast('arima', ticker, data, days, refit_every=refit_every)
+    show_forecast_source(result)
+    show_arima_search_report(result['details']['search_report'])
+    metrics = result['metrics']
     
     # Tampilkan metrik
     st.subheader("📊 Evaluasi Model ARIMA")
@@ -133,17 +163,17 @@ def show_arima_prediction(ticker, days):
     cols[3].metric("MAPE", f"{metrics['MAPE']:.2f}%")
     
     # Prediksi masa depan
-    predictions = arima.predict(days)
+    predictions = result['forecast'].iloc[:days]
     
     # Plot prediksi
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
+    fig.add_trace(line_trace(
         x=data.index[-60:],  # Tampilkan 60 hari terakhir
         y=data['Close'].values[-60:],
         name='Data Historis',
         line=dict(color='blue')
     ))
-    fig.add_trace(go.Scatter(
+    fig.add_trace(line_trace(
         x=predictions.index,
         y=predictions['prediction'],
         name='Prediksi',
@@ -218,5 +248,12 @@ def show_price_prediction(ticker):
             value=7,
             key="arima_days"
         )
+        refit_every = st.number_input(
+            "Fit ulang model setiap N hari saat backtest (0 = fit sekali, paling cepat):",
+            min_value=0,
+            max_value=60,
+            value=Config.ARIMA_REFIT_EVERY,
+            key="arima_refit_every"
+        )
         if st.button("Jalankan Prediksi ARIMA"):
-            show_arima_prediction(ticker, days)
+            show_arima_prediction(ticker, days, refit_every)
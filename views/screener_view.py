@@ -0,0 +1,57 @@
+# views/screener_view.py
+import time
+import streamlit as st
+from config import Config
+from services.screener_service import SignalIndex, index_columns
+
+EXAMPLE_QUERIES = [
+    "RSI(14) < 30 and SMA_20 crossed above SMA_50 in the last 3 days",
+    "Close > MA200 and MACD crossed above Signal within 5 days",
+    "RSI > 70 or Stoch_K > 80",
+    "Close < BB_Lower",
+]
+
+
+def show_screener():
+    """Screener teknikal seluruh saham di universe store"""
+    st.subheader("🔎 Screener Teknikal")
+    index = SignalIndex.shared()
+
+    example = st.selectbox("Contoh query", EXAMPLE_QUERIES)
+    query = st.text_input("Query", value=example)
+    with st.expander("Bantuan query"):
+        st.markdown(
+            "- Pembanding: `<`, `<=`, `>`, `>=`, `==`, `!=` terhadap indikator lain atau angka\n"
+            "- Persilangan: `A crossed above B in the last N days` / `A crossed below B within N` "
+            f"(N maksimal {Config.SCREENER_LOOKBACK_BARS - 1} bar)\n"
+            "- Gabungan: `and`/`dan`, `or`/`atau`, `not`, tanda kurung\n"
+            f"- Kolom: {', '.join(index_columns())}; juga `RSI(14)`, `SMA(20)`, `SMA(50)`, `MA(200)`"
+        )
+
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        if st.button("Bangun ulang index"):
+            with st.spinner("Menghitung indikator seluruh universe..."):
+                index.rebuild()
+
+    if not query.strip():
+        return
+    try:
+        start = time.perf_counter()
+        result = index.screen(query)
+        elapsed = (time.perf_counter() - start) * 1000
+    except ValueError as e:
+        st.error(f"Query tidak valid: {e}")
+        return
+
+    with col1:
+        st.caption(f"{len(result)} dari {len(index.tickers)} saham lolos ({elapsed:.1f} ms)")
+    if not index.tickers:
+        st.info("Universe store masih kosong; buka beberapa saham atau jalankan prefetch terlebih dahulu")
+    elif result.empty:
+        st.info("Tidak ada saham yang memenuhi kriteria")
+    else:
+        st.dataframe(
+            result.style.format({col: '{:,.2f}' for col in result.columns if col != 'Date'}),
+            use_container_width=True
+        )
@@ -1,123 +1,148 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
+from services.analysis_services import TECHNICAL_VIEW_INDICATORS, add_indicators
+from services.indicator_state import technical_indicators
 from utils.data_fetcher import DataFetcher
+from views.chart_traces import candlestick_trace, line_trace
+from views.figure_cache import cached_figure
+from views.intraday_chart import show_intraday_chart
 
 def add_technical_indicators(data):
     """Menambahkan indikator teknikal ke data saham"""
-    if data.empty:
-        return data
-    
-    # Simple Moving Averages
-    data['SMA_20'] = data['Close'].rolling(window=20).mean()
-    data['SMA_50'] = data['Close'].rolling(window=50).mean()
-    
-    # RSI
-    delta = data['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-    rs = gain / loss
-    data['RSI'] = 100 - (100 / (1 + rs))
-    
-    # MACD
-    exp12 = data['Close'].ewm(span=12, adjust=False).mean()
-    exp26 = data['Close'].ewm(span=26, adjust=False).mean()
-    data['MACD'] = exp12 - exp26
-    data['Signal'] = data['MACD'].ewm(span=9, adjust=False).mean()
-    
-    return data
+    # Dihitung oleh mesin indikator bersama (services.analysis_services)
+    return add_indicators(data, TECHNICAL_VIEW_INDICATORS)
 
-def plot_technical_indicators(data, ticker):
-    """Plot indikator teknikal"""
-    if data.empty:
-        st.warning("Data tidak tersedia untuk analisis teknikal")
-        return
-    
-    # Price with Moving Averages
-    st.subheader("📈 Moving Averages")
-    fig1 = go.Figure()
-    fig1.add_trace(go.Candlestick(
-        x=data.index,
-        open=data['Open'],
-        high=data['High'],
-        low=data['Low'],
-        close=data['Close'],
-        name='Harga'
-    ))
-    fig1.add_trace(go.Scatter(
+def _moving_average_figure(data, ticker):
+    """Candlestick dengan SMA 20 dan SMA 50"""
+    fig = go.Figure()
+    fig.add_trace(candlestick_trace(data, name='Harga'))
+    fig.add_trace(line_trace(
         x=data.index, 
         y=data['SMA_20'], 
         name='SMA 20',
         line=dict(color='orange', width=2)
     ))
-    fig1.add_trace(go.Scatter(
+    fig.add_trace(line_trace(
         x=data.index, 
         y=data['SMA_50'], 
         name='SMA 50',
         line=dict(color='blue', width=2)
     ))
-    fig1.update_layout(
+    fig.update_layout(
         title=f"{ticker} - Harga dan Moving Averages",
         xaxis_rangeslider_visible=False
     )
-    st.plotly_chart(fig1, use_container_width=True)
-    
-    # RSI
-    st.subheader("📊 RSI (Relative Strength Index)")
-    fig2 = go.Figure()
-    fig2.add_trace(go.Scatter(
+    return fig
+
+def _rsi_figure(data):
+    """RSI dengan batas 30/70"""
+    fig = go.Figure()
+    fig.add_trace(line_trace(
         x=data.index, 
         y=data['RSI'], 
         name='RSI',
         line=dict(color='purple', width=2)
     ))
-    fig2.add_hline(y=30, line_dash="dash", line_color="green")
-    fig2.add_hline(y=70, line_dash="dash", line_color="red")
-    fig2.update_layout(
+    fig.add_hline(y=30, line_dash="dash", line_color="green")
+    fig.add_hline(y=70, line_dash="dash", line_color="red")
+    fig.update_layout(
         yaxis_range=[0,100],
         title="RSI (14 hari) - Level 30-70 menunjukkan overbought/oversold"
     )
-    st.plotly_chart(fig2, use_container_width=True)
-    
-    # MACD
-    st.subheader("📉 MACD (Moving Average Convergence Divergence)")
-    fig3 = go.Figure()
-    fig3.add_trace(go.Scatter(
+    return fig
+
+def _macd_figure(data):
+    """MACD dan signal line"""
+    fig = go.Figure()
+    fig.add_trace(line_trace(
         x=data.index, 
         y=data['MACD'], 
         name='MACD',
         line=dict(color='blue', width=2)
     ))
-    fig3.add_trace(go.Scatter(
+    signal_trace = line_trace(
         x=data.index, 
         y=data['Signal'], 
         name='Signal Line',
         line=dict(color='orange', width=2)
-    ))
-    # Tambahkan area untuk sinyal beli/jual
-    fig3.add_trace(go.Scatter(
+    )
+    fig.add_trace(signal_trace)
+    # Tambahkan area untuk sinyal beli/jual (fill 'tonexty' butuh jenis trace yang sama)
+    fig.add_trace(line_trace(
         x=data.index,
         y=[0]*len(data),
+        webgl=isinstance(signal_trace, go.Scattergl),
         fill='tonexty',
         fillcolor='rgba(0,100,80,0.2)',
         line=dict(color='rgba(255,255,255,0)'),
         showlegend=False
     ))
-    fig3.update_layout(title="MACD - Sinyal beli ketika MACD melewati Signal Line dari bawah")
+    fig.update_layout(title="MACD - Sinyal beli ketika MACD melewati Signal Line dari bawah")
+    return fig
+
+def plot_technical_indicators(data, ticker):
+    """Plot indikator teknikal"""
+    if data.empty:
+        st.warning("Data tidak tersedia untuk analisis teknikal")
+        return
+    
+    # Figure dipakai ulang selama data tidak berubah (lihat views.figure_cache)
+    # Price with Moving Averages
+    st.subheader("📈 Moving Averages")
+    fig1 = cached_figure(
+        'technical_ma', ticker, data, None, lambda: _moving_average_figure(data, ticker),
+        columns=['Open', 'High', 'Low', 'Close', 'SMA_20', 'SMA_50']
+    )
+    st.plotly_chart(fig1, use_container_width=True)
+    
+    # RSI
+    st.subheader("📊 RSI (Relative Strength Index)")
+    fig2 = cached_figure('technical_rsi', ticker, data, None, lambda: _rsi_figure(data), columns=['RSI'])
+    st.plotly_chart(fig2, use_container_width=True)
+    
+    # MACD
+    st.subheader("📉 MACD (Moving Average Convergence Divergence)")
+    fig3 = cached_figure('technical_macd', ticker, data, None, lambda: _macd_figure(data), columns=['MACD', 'Signal'])
     st.plotly_chart(fig3, use_container_width=True)
 
 def show_technical_analysis(ticker):
     """Menampilkan analisis teknikal lengkap"""
     st.subheader("🔧 Analisis Teknikal")
     
+    # Pilihan rentang dan resolusi; mingguan/bulanan diturunkan dari cache harian
+    col1, col2 = st.columns(2)
+    with col1:
+        period = st.selectbox("Periode", ["6mo", "1y", "2y", "5y", "max"], index=1, key="technical_period")
+    with col2:
+        interval = st.selectbox(
+            "Interval", ["1d", "1wk", "1mo"],
+            format_func=lambda x: {"1d": "Harian", "1wk": "Mingguan", "1mo": "Bulanan"}[x],
+            key="technical_interval"
+        )
+    
+    # Candlestick intraday live; hanya fragment chart yang di-refresh
+    if st.toggle("Mode Intraday", key="technical_intraday"):
+        intraday_interval = st.radio("Resolusi intraday", ["1m", "5m"], horizontal=True, key="technical_intraday_interval")
+        show_intraday_chart(ticker, key="technical", interval=intraday_interval, candles=True)
+    
     # Ambil data
-    data = DataFetcher.get_stock_data(ticker)
+    data = DataFetcher.get_stock_data(ticker, period=period, interval=interval)
     if data.empty:
         st.warning("Data saham tidak tersedia")
         return
     
-    # Tambahkan indikator
-    data_with_indicators = add_technical_indicators(data)
+    # Tambahkan indikator; untuk data harian hanya bar baru yang dihitung dari state tersimpan
+    if interval == "1d":
+        try:
+            full_history = DataFetcher.get_full_history(ticker, period)
+            indicators = technical_indicators(ticker, full_history)
+            data_with_indicators = data.join(indicators.reindex(data.index))
+        except Exception as e:
+            print(f"State indikator {ticker} tidak tersedia, menghitung penuh: {e}")
+            data_with_indicators = add_technical_indicators(data)
+    else:
+        data_with_indicators = add_technical_indicators(data)
     
     # Tampilkan indikator
     plot_technical_indicators(data_with_indicators, ticker)